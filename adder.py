@@ -1,18 +1,27 @@
+import io
 import sys
 import math
+import inspect
 import argparse
 
 from amaranth import Elaboratable, Module, Signal, Const
-from amaranth.back import verilog
 
 from sky130hd.process import SKY130HDProcess
 from asap7.process import ASAP7Process
 from gf180mcu.process import GF180MCUProcess
 from none.process import NoneProcess
 
+from cache import VerilogCache
+from structural import write_verilog
+from qor import liberty_report, write_report
+from netlist import Netlist
+from sizing import size_netlist
+from pipeline import pipeline_netlist
+
 
 class AdderFramework(Elaboratable):
-    def __init__(self, bits=64, register_input=False, register_output=False, powered=False):
+    def __init__(self, bits=64, register_input=False, register_output=False, powered=False,
+                 register_levels=()):
         self.a = Signal(bits)
         self.b = Signal(bits)
         self.o = Signal(bits)
@@ -28,9 +37,27 @@ class AdderFramework(Elaboratable):
         self._register_input = register_input
         self._register_output = register_output
 
+        # Prefix levels to add a register stage after. Level 0 is the p and
+        # g of the half adders, and each prefix node is one level above its
+        # latest input. Ling and inverting adders build their own nodes,
+        # and sparse tree adders their own sums, so they can't be pipelined.
+        self._register_levels = sorted(set(register_levels or ()))
+        if self._register_levels:
+            if self._register_levels[0] < 0:
+                raise ValueError("Register levels can't be negative")
+            cls = type(self)
+            if cls._prefix_g is not AdderFramework._prefix_g or cls._prefix_p is not AdderFramework._prefix_p or \
+                    cls._calculate_sum is not AdderFramework._calculate_sum:
+                raise ValueError("Register levels need a prefix adder")
+
     def elaborate(self, platform):
         self.m = m = Module()
 
+        # The prefix level of each node by id(), and the registered copies
+        # of the nodes later stages read
+        self._level = {}
+        self._delayed = {}
+
         a = Signal(self._bits, reset_less=True)
         b = Signal(self._bits, reset_less=True)
         if self._register_input:
@@ -44,6 +71,8 @@ class AdderFramework(Elaboratable):
                 b.eq(self.b),
             ]
 
+        self._inputs = (a, b)
+
         # Use arrays of 1 bit signals to make it easy to create
         # trees of p and g updates.
         self._p = [Signal() for i in range(self._bits)]
@@ -59,16 +88,8 @@ class AdderFramework(Elaboratable):
 
         self._calculate_pg()
 
-        # g is the carry out signal. We need to shift it left one bit then
-        # xor it with the sum (ie p_tmp). Since we have a list of 1 bit
-        # signals, just insert a constant zero signal at the head of of the
-        # list to shift g.
-        self._g.insert(0, Const(0))
-
         o = Signal(self._bits)
-        for i in range(self._bits):
-            # This also flattens the list of bits when writing to o
-            self._generate_xor(p_tmp[i], self._g[i], o[i])
+        self._calculate_sum(p_tmp, o)
 
         o2 = Signal(self._bits, reset_less=True)
         if self._register_output:
@@ -79,6 +100,67 @@ class AdderFramework(Elaboratable):
         m.d.comb += self.o.eq(o2)
         return m
 
+    def _stage(self, level):
+        # The number of register stages before a prefix level
+        return sum(1 for k in self._register_levels if k < level)
+
+    def _delay(self, s, stage):
+        # s delayed to match a register stage. The registers are shared by
+        # every node that reads s.
+        cycles = stage - self._stage(self._level.get(id(s), 0))
+        if cycles == 0 or isinstance(s, Const):
+            return s
+        s, chain = self._delayed.setdefault(id(s), (s, [s]))
+        while len(chain) <= cycles:
+            r = Signal(reset_less=True, name="%s_stage%d" % (s.name, len(chain)))
+            self.m.d.sync += r.eq(chain[-1])
+            chain.append(r)
+        return chain[cycles]
+
+    def _retime(self, inputs, o):
+        # Record the prefix level of node o, and return its inputs delayed
+        # to the register stage it is in
+        if not self._register_levels:
+            return inputs
+        level = max(self._level.get(id(s), 0) for s in inputs) + 1
+        self._level[id(o)] = level
+        return [self._delay(s, self._stage(level)) for s in inputs]
+
+    def _prefix_g(self, p_hi, g_lo, g_hi, g_new):
+        # The g of a prefix node, g_hi | (p_hi & g_lo)
+        p_hi, g_lo, g_hi = self._retime((p_hi, g_lo, g_hi), g_new)
+        self._generate_ao21(p_hi, g_lo, g_hi, g_new)
+
+    def _prefix_p(self, p_lo, p_hi, p_new):
+        # The p of a prefix node
+        p_lo, p_hi = self._retime((p_lo, p_hi), p_new)
+        self._generate_and(p_lo, p_hi, p_new)
+
+    def _combine(self, bit_to, bit_from, start):
+        # Merge the group p and g ending at bit_from into bit_to. We don't
+        # need the group p once a group reaches bit 0.
+        g_new = Signal()
+        self._prefix_g(self._p[bit_to], self._g[bit_from], self._g[bit_to], g_new)
+        if start[bit_from] > 0:
+            p_new = Signal()
+            self._prefix_p(self._p[bit_from], self._p[bit_to], p_new)
+            self._p[bit_to] = p_new
+        self._g[bit_to] = g_new
+        start[bit_to] = start[bit_from]
+
+    def _calculate_sum(self, p, o):
+        # g is the carry out signal. We need to shift it left one bit then
+        # xor it with the sum (ie p). Since we have a list of 1 bit
+        # signals, just insert a constant zero signal at the head of of the
+        # list to shift g.
+        self._g.insert(0, Const(0))
+
+        # The sum is after the last register stage
+        stage = len(self._register_levels)
+        for i in range(self._bits):
+            # This also flattens the list of bits when writing to o
+            self._generate_xor(self._delay(p[i], stage), self._delay(self._g[i], stage), o[i])
+
 
 class BrentKung(AdderFramework):
     def _calculate_pg(self):
@@ -88,8 +170,8 @@ class BrentKung(AdderFramework):
                 bit_from = bit_to - 2**(level - 1)
                 p_new = Signal()
                 g_new = Signal()
-                self._generate_and(self._p[bit_to], self._p[bit_from], p_new)
-                self._generate_ao21(self._p[bit_to], self._g[bit_from], self._g[bit_to], g_new)
+                self._prefix_p(self._p[bit_from], self._p[bit_to], p_new)
+                self._prefix_g(self._p[bit_to], self._g[bit_from], self._g[bit_to], g_new)
                 self._p[bit_to] = p_new
                 self._g[bit_to] = g_new
 
@@ -98,22 +180,23 @@ class BrentKung(AdderFramework):
             for bit_to in range(2**level + 2**(level - 1) - 1, self._bits, 2**level):
                 bit_from = bit_to - 2**(level - 1)
                 g_new = Signal()
-                self._generate_ao21(self._p[bit_to], self._g[bit_from], self._g[bit_to], g_new)
+                self._prefix_g(self._p[bit_to], self._g[bit_from], self._g[bit_to], g_new)
                 self._g[bit_to] = g_new
 
 
 class KoggeStone(AdderFramework):
     def _calculate_pg(self):
-        # Calculate p and g
-        for level in range(0, int(math.log(self._bits, 2))):
+        # Calculate p and g, with enough levels to reach the top bit when
+        # bits isn't a power of two
+        for level in range(0, (self._bits - 1).bit_length()):
             # Iterate backwards, because we want p and g from the previous iteration
             # and we update them as we go in this loop
             for bit_from in range(self._bits - 2**level - 1, -1, -1):
                 bit_to = bit_from + 2**level
                 p_new = Signal()
                 g_new = Signal()
-                self._generate_and(self._p[bit_from], self._p[bit_to], p_new)
-                self._generate_ao21(self._p[bit_to], self._g[bit_from], self._g[bit_to], g_new)
+                self._prefix_p(self._p[bit_from], self._p[bit_to], p_new)
+                self._prefix_g(self._p[bit_to], self._g[bit_from], self._g[bit_to], g_new)
                 self._p[bit_to] = p_new
                 self._g[bit_to] = g_new
 
@@ -121,8 +204,9 @@ class KoggeStone(AdderFramework):
 # Han Carlson is Kogge Stone on odd bits, with a final stage to calculate the even bits
 class HanCarlson(AdderFramework):
     def _calculate_pg(self):
-        # Calculate p and g
-        for level in range(0, int(math.log(self._bits, 2))):
+        # Calculate p and g, with enough levels to reach the top bit when
+        # bits isn't a power of two
+        for level in range(0, (self._bits - 1).bit_length()):
             # Iterate backwards, because we want p and g from the previous iteration
             # and we update them as we go in this loop
             for bit_from in range(self._bits - 2**level - 1, -1, -1):
@@ -132,21 +216,450 @@ class HanCarlson(AdderFramework):
                     continue
                 p_new = Signal()
                 g_new = Signal()
-                self._generate_and(self._p[bit_from], self._p[bit_to], p_new)
-                self._generate_ao21(self._p[bit_to], self._g[bit_from], self._g[bit_to], g_new)
+                self._prefix_p(self._p[bit_from], self._p[bit_to], p_new)
+                self._prefix_g(self._p[bit_to], self._g[bit_from], self._g[bit_to], g_new)
                 self._p[bit_to] = p_new
                 self._g[bit_to] = g_new
 
-        # Now do the even bits, again working backwards
-        for bit_from in range(self._bits - 3, 0, -2):
-            bit_to = bit_from + 1
+        # Now do the even bits from the odd bit below, again working
+        # backwards. The top bit is even when bits is odd.
+        for bit_to in range(self._bits - 1, 1, -1):
+            if bit_to & 1:
+                continue
+            bit_from = bit_to - 1
             g_new = Signal()
-            self._generate_ao21(self._p[bit_to], self._g[bit_from], self._g[bit_to], g_new)
+            self._prefix_g(self._p[bit_to], self._g[bit_from], self._g[bit_to], g_new)
             self._g[bit_to] = g_new
 
 
+# The (l, f, t) taxonomy of prefix adders from Harris, "A Taxonomy of Parallel
+# Prefix Networks". For n = 2^L bits every adder with L + l logic levels is
+# described by l levels of sparsity, a fanout of 2^f + 1 and 2^t wiring tracks,
+# with l + f + t = L - 1:
+#
+# Sklansky (0, L-1, 0), Kogge-Stone (0, 0, L-1), Brent-Kung (L-1, 0, 0),
+# Ladner-Fischer (1, L-2, 0), Han-Carlson (1, 0, L-2), and in between the
+# Knowles adders (0, f, t) and their sparse versions.
+#
+# Sparsity is Brent-Kung: l levels combine bits into groups of 2^l, and l
+# levels at the end fill in the bits between the groups. The 2^(L-l)
+# groups go through t levels of Kogge-Stone, which leaves 2^t interleaved
+# prefix problems that are each finished off with a Sklansky tree.
+#
+# Any one of sparsity, fanout and tracks can be left as None, and it takes
+# whatever the width of the adder leaves. get_algorithm() makes subclasses
+# with the parameters filled in.
+class ParallelPrefix(AdderFramework):
+    _sparsity = 0
+    _fanout = None
+    _tracks = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Check the parameters suit the width up front
+        self._parameters()
+
+    @classmethod
+    def with_parameters(cls, sparsity=None, fanout=None, tracks=None):
+        return type(cls.__name__, (cls,), dict(_sparsity=sparsity, _fanout=fanout, _tracks=tracks))
+
+    def _parameters(self):
+        levels = max((self._bits - 1).bit_length(), 1)
+        lft = [self._sparsity, self._fanout, self._tracks]
+        if lft.count(None) > 1:
+            raise ValueError("Only one of sparsity, fanout and tracks can be left out")
+        if None in lft:
+            lft[lft.index(None)] = levels - 1 - sum(x for x in lft if x is not None)
+        if min(lft) < 0 or sum(lft) != levels - 1:
+            raise ValueError("A %d bit prefix adder needs sparsity + fanout + tracks = %d" %
+                             (self._bits, levels - 1))
+        return lft
+
+    def _calculate_pg(self):
+        sparsity, fanout, tracks = self._parameters()
+
+        # The lowest bit each group p and g currently covers
+        start = list(range(self._bits))
+
+        # Sparsity, the first half of Brent-Kung
+        for level in range(1, sparsity + 1):
+            for bit_to in range(2**level - 1, self._bits, 2**level):
+                self._combine(bit_to, bit_to - 2**(level - 1), start)
+
+        nodes = list(range(2**sparsity - 1, self._bits, 2**sparsity))
+
+        # Kogge-Stone across the groups. Iterate backwards, because we want
+        # p and g from the previous level
+        for level in range(tracks):
+            for i in range(len(nodes) - 1, 2**level - 1, -1):
+                self._combine(nodes[i], nodes[i - 2**level], start)
+
+        # Sklansky on each of the 2^tracks interleaved sets of groups
+        classes = 2**tracks
+        for level in range(fanout + 1):
+            for i in range(len(nodes) - 1, -1, -1):
+                row = i // classes
+                if row & (1 << level):
+                    row_from = ((row >> level) << level) - 1
+                    self._combine(nodes[i], nodes[row_from * classes + i % classes], start)
+
+        # Fill in the bits between the groups, the second half of Brent-Kung
+        for level in range(sparsity, 0, -1):
+            for bit_to in range(2**level + 2**(level - 1) - 1, self._bits, 2**level):
+                self._combine(bit_to, bit_to - 2**(level - 1), start)
+
+
+# A sparse tree adder only computes the carry into every _sparsity'th bit,
+# and each block of _sparsity bits calculates its sum both for a carry in
+# of 0 and of 1. The carry into the block then selects the right one, so
+# the sums are ready and waiting when the sparse carries arrive.
+#
+# Each block builds a Sklansky tree of its local p and g. The block p and g
+# go through a Kogge-Stone tree to give the carry into each block. With a
+# local carry c0 = G, the carry for a carry in of 1 is c1 = G | P.
+class SparseTree(AdderFramework):
+    _sparsity = 4
+
+    @classmethod
+    def with_sparsity(cls, sparsity):
+        return type(cls.__name__, (cls,), dict(_sparsity=sparsity))
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self._sparsity < 2 or self._sparsity & (self._sparsity - 1):
+            raise ValueError("Sparse tree adder sparsity must be a power of 2")
+
+    def _prefix(self, p_hi, g_hi, p_lo, g_lo, need_p=True):
+        g_new = Signal()
+        self._prefix_g(p_hi, g_lo, g_hi, g_new)
+        p_new = None
+        if need_p:
+            p_new = Signal()
+            self._prefix_p(p_lo, p_hi, p_new)
+        return p_new, g_new
+
+    def _calculate_pg(self):
+        bits = self._bits
+        s = self._sparsity
+        bases = list(range(0, bits, s))
+
+        # Sklansky inside each block, afterwards _p[i] and _g[i] cover from
+        # the bottom of the block to bit i
+        for level in range(int(math.log(s, 2))):
+            for base in bases:
+                for bit_to in range(min(base + s, bits) - 1, base - 1, -1):
+                    offset = bit_to - base
+                    if offset & (1 << level):
+                        bit_from = base + ((offset >> level) << level) - 1
+                        self._p[bit_to], self._g[bit_to] = self._prefix(self._p[bit_to], self._g[bit_to],
+                                                                        self._p[bit_from], self._g[bit_from])
+
+        # Kogge-Stone across the blocks, we don't need p once a block
+        # reaches bit 0
+        tops = [min(base + s, bits) - 1 for base in bases]
+        block_p = [self._p[i] for i in tops]
+        block_g = [self._g[i] for i in tops]
+        for level in range(int(math.ceil(math.log(max(len(bases), 1), 2)))):
+            for i in range(len(bases) - 1, 2**level - 1, -1):
+                j = i - 2**level
+                block_p[i], block_g[i] = self._prefix(block_p[i], block_g[i], block_p[j], block_g[j],
+                                                      need_p=j >= 2**level)
+
+        # The carry into each block
+        self._block_carry = [None] + block_g[:-1]
+
+    def _calculate_sum(self, p, o):
+        s = self._sparsity
+        for (block, base) in enumerate(range(0, self._bits, s)):
+            carry = self._block_carry[block]
+            if carry is not None:
+                carry_n = Signal()
+                self._generate_inv(carry, carry_n)
+
+            for i in range(base, min(base + s, self._bits)):
+                if i == base:
+                    c0, c1 = Const(0), Const(1)
+                else:
+                    c0 = self._g[i - 1]
+                    c1 = Signal()
+                    self._generate_or(self._g[i - 1], self._p[i - 1], c1)
+
+                if carry is None:
+                    self._generate_xor(p[i], c0, o[i])
+                    continue
+
+                # Conditional sums, selected by the carry into the block
+                s0 = Signal()
+                s1 = Signal()
+                self._generate_xor(p[i], c0, s0)
+                if i == base:
+                    self._generate_inv(p[i], s1)
+                else:
+                    self._generate_xor(p[i], c1, s1)
+                self._generate_ao22(carry, s1, carry_n, s0, o[i])
+
+
+# A prefix adder for inputs that don't all arrive at once, like the final
+# adder of a multiplier, whose low and high columns come out of the partial
+# product reduction well before the middle ones. arrival is the time each
+# bit of a and b arrives, in levels of cells.
+#
+# The low bits ripple, for as long as their carry is ready by the time the
+# latest bits arrive, and that carry is folded into the bottom of a
+# Kogge-Stone tree across the late middle bits. The high bits build their
+# own ripple or Sklansky tree, which one last level combines with the carry
+# out of the middle. We try every end of the middle, and the uniform
+# Kogge-Stone, Sklansky and Brent-Kung trees, and keep the fastest and then
+# smallest.
+class HybridAdder(AdderFramework):
+    def __init__(self, bits=64, arrival=None, **kwargs):
+        super().__init__(bits=bits, **kwargs)
+        if arrival is None:
+            arrival = [0] * bits
+        if len(arrival) != bits:
+            raise ValueError("A hybrid adder needs the arrival time of every bit")
+        # When the p and g of each bit are ready, after the half adders
+        self._ready = [t + 1 for t in arrival]
+        self._combines = self._plan()
+
+    @staticmethod
+    def _ripple(nodes):
+        return [(nodes[i], nodes[i - 1]) for i in range(1, len(nodes))]
+
+    @staticmethod
+    def _kogge_stone(nodes):
+        # Iterate backwards, because we want p and g from the previous level
+        combines = []
+        level = 0
+        while 2**level < len(nodes):
+            for i in range(len(nodes) - 1, 2**level - 1, -1):
+                combines.append((nodes[i], nodes[i - 2**level]))
+            level += 1
+        return combines
+
+    @staticmethod
+    def _sklansky(nodes):
+        combines = []
+        level = 0
+        while 2**level < len(nodes):
+            for i in range(len(nodes) - 1, -1, -1):
+                if i & (1 << level):
+                    combines.append((nodes[i], nodes[((i >> level) << level) - 1]))
+            level += 1
+        return combines
+
+    @staticmethod
+    def _brent_kung(nodes):
+        # Groups of 2, 4, 8, ... and then back down to fill in the bits in
+        # between
+        combines = []
+        level = 1
+        while 2**level <= len(nodes):
+            for i in range(2**level - 1, len(nodes), 2**level):
+                combines.append((nodes[i], nodes[i - 2**(level - 1)]))
+            level += 1
+        for level in range(level - 1, 0, -1):
+            for i in range(2**level + 2**(level - 1) - 1, len(nodes), 2**level):
+                combines.append((nodes[i], nodes[i - 2**(level - 1)]))
+        return combines
+
+    def _times(self, combines):
+        # When each group p and g is ready, if we build these (bit_to,
+        # bit_from) combines in order
+        times = list(self._ready)
+        for (bit_to, bit_from) in combines:
+            times[bit_to] = max(times[bit_to], times[bit_from]) + 1
+        return times
+
+    def _plan(self):
+        bits = self._bits
+        latest = max(self._ready)
+
+        # Ripple while the carry keeps up with the latest bits
+        low = 1
+        carry = self._ready[0]
+        while low < bits and max(carry, self._ready[low]) + 1 <= latest:
+            carry = max(carry, self._ready[low]) + 1
+            low += 1
+        combines = self._ripple(range(low))
+        if low == bits:
+            return combines
+
+        best = None
+        for plan in (self._kogge_stone(range(bits)), self._sklansky(range(bits)), self._brent_kung(range(bits))):
+            cost = (max(self._times(plan)), len(plan))
+            if best is None or cost < best[0]:
+                best = (cost, plan)
+
+        for high in range(low + 1, bits + 1):
+            middle = [(low, low - 1)] + self._kogge_stone(range(low, high))
+            for local in (self._ripple, self._sklansky):
+                plan = combines + middle + local(range(high, bits)) + [(i, high - 1) for i in range(high, bits)]
+                cost = (max(self._times(plan)), len(plan))
+                if best is None or cost < best[0]:
+                    best = (cost, plan)
+
+        return best[1]
+
+    def _calculate_pg(self):
+        # The lowest bit each group p and g currently covers
+        start = list(range(self._bits))
+        for (bit_to, bit_from) in self._combines:
+            self._combine(bit_to, bit_from, start)
+
+
+# Ling's pseudo carries, for any prefix adder that uses the default sum.
+# With the transmit t = a | b, the carry c[i] = t[i] & h[i], where the
+# pseudo carry h[i] = g[i] | c[i-1] goes through the same prefix tree as
+# g, with t[i-1] in place of p[i]. The first level of the tree then
+# simplifies to h = g[i] | g[i-1], one ao22 straight from the inputs
+# instead of a half adder and an ao21.
+#
+# Where the process has an ao32 or ao33, the and with t is folded into the
+# last node of each bit, which gives the carry directly:
+# c = (t & p_hi & g_lo) | (t & g_hi). The pseudo carry of that node is only
+# built if another node uses it.
+class Ling:
+    @classmethod
+    def with_topology(cls, topology):
+        if not issubclass(topology, AdderFramework) or topology._calculate_sum is not AdderFramework._calculate_sum:
+            raise ValueError("Ling needs a prefix adder")
+        return type(cls.__name__ + topology.__name__, (cls, topology), {})
+
+    def _calculate_pg(self):
+        a, b = self._inputs
+        self._t = [Signal() for i in range(self._bits)]
+        for i in range(self._bits):
+            self._generate_or(a[i], b[i], self._t[i])
+
+        # The bits each h covers, and the last nodes we haven't built yet
+        self._range = {id(g): (i, i) for (i, g) in enumerate(self._g)}
+        self._leaf = dict(self._range)
+        self._pending = {}
+        self._carry = list(self._g)
+
+        # Bit 0 has no carry in to transmit
+        self._p = [Const(0)] + self._t[:-1]
+
+        super()._calculate_pg()
+
+        self._g = self._carry
+
+    def _prefix_g(self, p_hi, g_lo, g_hi, g_new):
+        for g in (g_lo, g_hi):
+            if id(g) in self._pending:
+                self._pseudo_carry(*self._pending.pop(id(g)))
+
+        top = self._range[id(g_hi)][0]
+        bottom = self._range[id(g_lo)][1]
+        self._range[id(g_new)] = (top, bottom)
+
+        if bottom == 0:
+            self._pending[id(g_new)] = (p_hi, g_lo, g_hi, g_new)
+            # The carry out of the top bit isn't needed
+            if top < self._bits - 1:
+                t = self._t[top]
+                self._carry[top] = c = Signal()
+                if hasattr(self, "_generate_ao32"):
+                    self._generate_ao32(t, p_hi, g_lo, t, g_hi, c)
+                elif hasattr(self, "_generate_ao33"):
+                    self._generate_ao33(t, p_hi, g_lo, t, g_hi, g_hi, c)
+                else:
+                    # Fall back to an and after the pseudo carry
+                    self._pseudo_carry(*self._pending.pop(id(g_new)))
+                    self._generate_and(t, g_new, c)
+        else:
+            self._pseudo_carry(p_hi, g_lo, g_hi, g_new)
+
+    def _pseudo_carry(self, p_hi, g_lo, g_hi, g_new):
+        lo = self._leaf.get(id(g_lo))
+        hi = self._leaf.get(id(g_hi))
+        if lo is not None and hi is not None and hi[0] == lo[0] + 1:
+            a, b = self._inputs
+            self._generate_ao22(a[hi[0]], b[hi[0]], a[lo[0]], b[lo[0]], g_new)
+        else:
+            super()._prefix_g(p_hi, g_lo, g_hi, g_new)
+
+
+# Prefix nodes built from inverting cells. An ao21 is internally an aoi21
+# and an inverter, so every level of a prefix tree pays for two gate
+# delays. Instead, a level with p and g in true polarity uses an aoi21 and
+# a nand, which give ~g and ~p, and the next level takes those into an
+# oai21 and a nor, which give g and p again:
+#
+#   ~(g_hi | (p_hi & g_lo)) = aoi21(p_hi, g_lo, g_hi)
+#     g_hi | (p_hi & g_lo)  = oai21(~p_hi, ~g_lo, ~g_hi)
+#
+# The polarity and logic depth of each signal is tracked through the tree.
+# Where the inputs of a node disagree, it picks the polarity that keeps
+# inverters off its latest input, and each signal is inverted at most once.
+# If a carry ends up inverted, the sum uses an inverted p instead, which is
+# ready long before the carry.
+class Inverting:
+    @classmethod
+    def with_topology(cls, topology):
+        if not issubclass(topology, AdderFramework) or issubclass(topology, Ling) or \
+                topology._calculate_sum is not AdderFramework._calculate_sum:
+            raise ValueError("Inverting cells need a prefix adder")
+        return type(cls.__name__ + topology.__name__, (cls, topology), {})
+
+    def _calculate_pg(self):
+        self._inverted = set()
+        self._complement = {}
+        self._depth = {}
+        super()._calculate_pg()
+
+    def _polarity(self, s, inverted):
+        # s in the given polarity, adding an inverter if it isn't already
+        if (id(s) in self._inverted) == inverted:
+            return s
+        if id(s) not in self._complement:
+            o = Signal()
+            self._generate_inv(s, o)
+            if inverted:
+                self._inverted.add(id(o))
+            self._depth[id(o)] = self._depth.get(id(s), 0) + 1
+            self._complement[id(s)] = o
+        return self._complement[id(s)]
+
+    def _choose(self, inputs, o):
+        # The polarity that gets o out earliest, and then the one that
+        # needs the fewest inverters
+        def cost(inverted):
+            depth = max(self._depth.get(id(s), 0) + ((id(s) in self._inverted) != inverted) for s in inputs)
+            return depth, sum((id(s) in self._inverted) != inverted for s in inputs)
+        inverted = cost(True) < cost(False)
+        self._depth[id(o)] = cost(inverted)[0] + 1
+        if not inverted:
+            self._inverted.add(id(o))
+        return inverted, [self._polarity(s, inverted) for s in inputs]
+
+    def _prefix_g(self, p_hi, g_lo, g_hi, g_new):
+        inverted, (p_hi, g_lo, g_hi) = self._choose((p_hi, g_lo, g_hi), g_new)
+        if inverted:
+            self._generate_oai21(p_hi, g_lo, g_hi, g_new)
+        else:
+            self._generate_aoi21(p_hi, g_lo, g_hi, g_new)
+
+    def _prefix_p(self, p_lo, p_hi, p_new):
+        inverted, (p_lo, p_hi) = self._choose((p_lo, p_hi), p_new)
+        if inverted:
+            self._generate_nor(p_lo, p_hi, p_new)
+        else:
+            self._generate_nand(p_lo, p_hi, p_new)
+
+    def _calculate_sum(self, p, o):
+        self._g.insert(0, Const(0))
+        for i in range(self._bits):
+            self._generate_xor(self._polarity(p[i], id(self._g[i]) in self._inverted), self._g[i], o[i])
+
+
 class Inferred(Elaboratable):
-    def __init__(self, bits=64, register_input=False, register_output=False, powered=False):
+    def __init__(self, bits=64, register_input=False, register_output=False, powered=False,
+                 register_levels=()):
+        if register_levels:
+            raise ValueError("Register levels need a prefix adder")
+
         self.a = Signal(bits)
         self.b = Signal(bits)
         self.o = Signal(bits)
@@ -184,9 +697,137 @@ class Inferred(Elaboratable):
         return m
 
 
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description='Create Verilog Adder')
+def get_process(name=None):
+    if not name or name == 'none':
+        return NoneProcess
+    elif name == 'sky130hd':
+        return SKY130HDProcess
+    elif name == 'asap7':
+        return ASAP7Process
+    elif name == 'gf180mcu':
+        return GF180MCUProcess
+    raise ValueError("Unknown process")
+
+
+def get_algorithm(name=None):
+    if not name or name.lower() == 'brentkung':
+        return BrentKung
+    elif name.lower() == 'koggestone':
+        return KoggeStone
+    elif name.lower() == 'hancarlson':
+        return HanCarlson
+    elif name.lower() == 'inferred':
+        return Inferred
+    elif name.lower() == 'sklansky':
+        return ParallelPrefix.with_parameters(sparsity=0, tracks=0)
+    elif name.lower() == 'ladnerfischer':
+        return ParallelPrefix.with_parameters(sparsity=1, tracks=0)
+    elif name.lower() == 'knowles':
+        return ParallelPrefix.with_parameters(sparsity=0, fanout=1)
+    elif name.lower() == 'sparsetree':
+        return SparseTree
+    elif name.lower().startswith('sparsetree_'):
+        # sparsetree_<sparsity>
+        try:
+            sparsity = int(name.split('_')[1])
+        except (ValueError, IndexError):
+            raise ValueError("Unknown algorithm")
+        return SparseTree.with_sparsity(sparsity)
+    elif name.lower().startswith('ling_'):
+        # ling_<prefix adder>, eg ling_koggestone
+        return Ling.with_topology(get_algorithm(name[len('ling_'):]))
+    elif name.lower().startswith('inverting_'):
+        # inverting_<prefix adder>, eg inverting_koggestone
+        return Inverting.with_topology(get_algorithm(name[len('inverting_'):]))
+    elif name.lower().startswith('prefix_'):
+        # prefix_<l>_<f>_<t>, see ParallelPrefix
+        try:
+            sparsity, fanout, tracks = (int(x) for x in name.split('_')[1:])
+        except ValueError:
+            raise ValueError("Unknown algorithm")
+        return ParallelPrefix.with_parameters(sparsity, fanout, tracks)
+    raise ValueError("Unknown algorithm")
+
+
+def build_adder(bits=32, register_input=False, register_output=False, process=None,
+                algorithm=None, powered=False, register_levels=None):
+    # Compose the adder from its command line configuration. Returns the
+    # adder and its ports.
+    process = get_process(process)
+    algorithm = get_algorithm(algorithm)
+
+    class myadder(process, algorithm):
+        pass
+
+    adder = myadder(bits=bits, register_input=register_input,
+                    register_output=register_output, powered=powered,
+                    register_levels=register_levels)
+
+    ports = [adder.a, adder.b, adder.o]
+    if powered:
+        ports.extend([adder.VPWR, adder.VGND])
 
+    return adder, ports
+
+
+def transform_netlist(adder, stages=None, max_fanout=None):
+    # The netlist of an adder, pipelined into stages and then sized for
+    # max_fanout if we were asked to
+    netlist = Netlist.from_elaboratable(adder)
+    if stages is not None:
+        if adder._register_levels:
+            raise ValueError("Pipelining places its own registers, it can't be used with register levels")
+        pipeline_netlist(netlist, adder, [adder.o], stages)
+    if max_fanout:
+        size_netlist(netlist, adder, [adder.o], max_fanout)
+    return netlist
+
+
+def generate(config, f, cache=None):
+    # Write Verilog for a configuration of build_adder() arguments plus the
+    # backend to f, going through the cache if we have one
+    config = dict(config)
+    backend = config.pop('backend', None) or 'amaranth'
+    max_fanout = config.pop('max_fanout', None)
+
+    def build_and_write(f):
+        adder, ports = build_adder(**config)
+        design = adder
+        if max_fanout:
+            design = transform_netlist(adder, max_fanout=max_fanout)
+        write_verilog(f, design, ports, 'adder', backend)
+
+    if cache is None:
+        build_and_write(f)
+        return
+
+    def convert():
+        out = io.StringIO()
+        build_and_write(out)
+        return out.getvalue()
+
+    # Key the cache on every argument, so leaving out a default doesn't
+    # create a separate entry
+    arguments = inspect.signature(build_adder).bind(**config)
+    arguments.apply_defaults()
+    key = dict(arguments.arguments, generator='adder', backend=backend, max_fanout=max_fanout)
+    f.write(cache.get_or_generate(key, convert))
+
+
+def generate_report(config, liberty=None):
+    # Cell count, area, depth and fanout report of a configuration, see
+    # qor.design_report()
+    config = dict(config)
+    config.pop('backend', None)
+    max_fanout = config.pop('max_fanout', None)
+    adder, ports = build_adder(**config)
+    design = transform_netlist(adder, max_fanout=max_fanout)
+    return liberty_report(design, [adder.o], liberty, top='adder')
+
+
+def add_arguments(parser):
+    # Command line options for the configuration generate() and
+    # generate_report() take, shared with sta.py
     parser.add_argument('--bits', type=int,
                         help='Width in bits of adder', default=32)
 
@@ -196,56 +837,73 @@ if __name__ == "__main__":
     parser.add_argument('--register-output', action='store_true',
                         help='Add a register stage to the output')
 
+    parser.add_argument('--register-level', type=int, action='append', dest='register_levels',
+                        help='Add a register stage after this level of the prefix tree (may be given more than '
+                             'once, each adds a cycle of latency)')
+
     parser.add_argument('--process',
                         help='What process to build for, (none (default), sky130hd, asap7, gf180mcu)')
 
     parser.add_argument('--algorithm',
-                        help='Adder algorithm (brentkung (default), koggestone, hancarlson, inferred)')
+                        help='Adder algorithm (brentkung (default), koggestone, hancarlson, sklansky, ladnerfischer, '
+                             'knowles, prefix_<l>_<f>_<t>, sparsetree, sparsetree_<n>, ling_<adder>, '
+                             'inverting_<adder>, inferred)')
 
     parser.add_argument('--powered', action='store_true',
                         help='Add power pins (VPWR/VGND)')
 
+    parser.add_argument('--max-fanout', type=int,
+                        help='Size cells and insert buffers so no net drives more than this many inputs '
+                             '(structural and hierarchical backends only)')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Create Verilog Adder')
+
+    add_arguments(parser)
+
+    parser.add_argument('--backend',
+                        help='Verilog backend (amaranth (default), structural, hierarchical)')
+
     parser.add_argument('--output', type=argparse.FileType('w'), default=sys.stdout,
                         help='Write output to this file')
 
-    args = parser.parse_args()
+    parser.add_argument('--report', type=argparse.FileType('w'),
+                        help='Write a JSON report of cell counts, area, logic depth and fanout to this file')
 
-    process = NoneProcess
-    if args.process:
-        if args.process == 'none':
-            process = NoneProcess
-        elif args.process == 'sky130hd':
-            process = SKY130HDProcess
-        elif args.process == 'asap7':
-            process = ASAP7Process
-        elif args.process == 'gf180mcu':
-            process = GF180MCUProcess
-        else:
-            print("Unknown process")
-            exit(1)
-
-    algorithm = BrentKung
-    if args.algorithm:
-        if args.algorithm.lower() == 'brentkung':
-            algorithm = BrentKung
-        elif args.algorithm.lower() == 'koggestone':
-            algorithm = KoggeStone
-        elif args.algorithm.lower() == 'hancarlson':
-            algorithm = HanCarlson
-        elif args.algorithm.lower() == 'inferred':
-            algorithm = Inferred
-        else:
-            print("Unknown algorithm")
-            exit(1)
+    parser.add_argument('--liberty', action='append',
+                        help='Liberty file to take cell areas from for the report (may be given more than once)')
 
-    class myadder(process, algorithm):
-        pass
+    parser.add_argument('--cache-dir',
+                        help='Directory of the generated Verilog cache')
 
-    adder = myadder(bits=args.bits, register_input=args.register_input,
-                    register_output=args.register_output, powered=args.powered)
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Always generate the Verilog, bypassing the cache')
 
-    ports = [adder.a, adder.b, adder.o]
-    if args.powered:
-        ports.extend([adder.VPWR, adder.VGND])
+    args = parser.parse_args()
 
-    args.output.write(verilog.convert(adder, ports=ports, name='adder', strip_internal_attrs=True))
+    config = {k: v for (k, v) in vars(args).items()
+              if k not in ('output', 'cache_dir', 'no_cache', 'report', 'liberty')}
+
+    try:
+        get_process(args.process)
+        get_algorithm(args.algorithm)
+        if args.backend not in (None, 'amaranth', 'structural', 'hierarchical'):
+            raise ValueError("Unknown backend")
+        if args.max_fanout and args.backend in (None, 'amaranth'):
+            raise ValueError("--max-fanout needs the structural or hierarchical backend")
+        if args.max_fanout and not hasattr(get_process(args.process), '_cell_sizes'):
+            raise ValueError("--max-fanout isn't supported for this process")
+    except ValueError as e:
+        print(e)
+        exit(1)
+
+    cache = None if args.no_cache else VerilogCache(args.cache_dir)
+    try:
+        generate(config, args.output, cache)
+    except ValueError as e:
+        print(e)
+        exit(1)
+
+    if args.report:
+        write_report(args.report, generate_report(config, args.liberty))
@@ -111,3 +111,254 @@ module AO33x2_ASAP7_75t_R (Y, A1, A2, A3, B1, B2, B3);
 	or (Y, int_fwire_1, int_fwire_0);
 
 endmodule
+
+module AND2x4_ASAP7_75t_R (Y, A, B);
+	output Y;
+	input A, B;
+
+	// Function
+	and (Y, A, B);
+
+endmodule
+
+module AND2x6_ASAP7_75t_R (Y, A, B);
+	output Y;
+	input A, B;
+
+	// Function
+	and (Y, A, B);
+
+endmodule
+
+module XOR2x2_ASAP7_75t_R (Y, A, B);
+	output Y;
+	input A, B;
+
+	// Function
+	wire A__bar, B__bar, int_fwire_0;
+	wire int_fwire_1;
+
+	not (A__bar, A);
+	and (int_fwire_0, A__bar, B);
+	not (B__bar, B);
+	and (int_fwire_1, A, B__bar);
+	or (Y, int_fwire_1, int_fwire_0);
+
+endmodule
+
+module INVx2_ASAP7_75t_R (Y, A);
+	output Y;
+	input A;
+
+	// Function
+	not (Y, A);
+
+endmodule
+
+module INVx4_ASAP7_75t_R (Y, A);
+	output Y;
+	input A;
+
+	// Function
+	not (Y, A);
+
+endmodule
+
+module AO21x2_ASAP7_75t_R (Y, A1, A2, B);
+	output Y;
+	input A1, A2, B;
+
+	// Function
+	wire int_fwire_0;
+
+	and (int_fwire_0, A1, A2);
+	or (Y, int_fwire_0, B);
+
+endmodule
+
+module AO22x2_ASAP7_75t_R (Y, A1, A2, B1, B2);
+	output Y;
+	input A1, A2, B1, B2;
+
+	// Function
+	wire int_fwire_0, int_fwire_1;
+
+	and (int_fwire_0, B1, B2);
+	and (int_fwire_1, A1, A2);
+	or (Y, int_fwire_1, int_fwire_0);
+
+endmodule
+
+module BUFx2_ASAP7_75t_R (Y, A);
+	output Y;
+	input A;
+
+	// Function
+	buf (Y, A);
+
+endmodule
+
+module BUFx4_ASAP7_75t_R (Y, A);
+	output Y;
+	input A;
+
+	// Function
+	buf (Y, A);
+
+endmodule
+
+module BUFx8_ASAP7_75t_R (Y, A);
+	output Y;
+	input A;
+
+	// Function
+	buf (Y, A);
+
+endmodule
+
+module OR2x2_ASAP7_75t_R (Y, A, B);
+	output Y;
+	input A, B;
+
+	// Function
+	or (Y, A, B);
+
+endmodule
+
+module OR2x4_ASAP7_75t_R (Y, A, B);
+	output Y;
+	input A, B;
+
+	// Function
+	or (Y, A, B);
+
+endmodule
+
+module OR2x6_ASAP7_75t_R (Y, A, B);
+	output Y;
+	input A, B;
+
+	// Function
+	or (Y, A, B);
+
+endmodule
+
+module NAND2xp5_ASAP7_75t_R (Y, A, B);
+	output Y;
+	input A, B;
+
+	// Function
+	wire int_fwire_0;
+
+	not (Y, int_fwire_0);
+	and (int_fwire_0, A, B);
+
+endmodule
+
+module NAND2x1_ASAP7_75t_R (Y, A, B);
+	output Y;
+	input A, B;
+
+	// Function
+	wire int_fwire_0;
+
+	not (Y, int_fwire_0);
+	and (int_fwire_0, A, B);
+
+endmodule
+
+module NAND2x2_ASAP7_75t_R (Y, A, B);
+	output Y;
+	input A, B;
+
+	// Function
+	wire int_fwire_0;
+
+	not (Y, int_fwire_0);
+	and (int_fwire_0, A, B);
+
+endmodule
+
+module NOR2xp33_ASAP7_75t_R (Y, A, B);
+	output Y;
+	input A, B;
+
+	// Function
+	wire int_fwire_0;
+
+	not (Y, int_fwire_0);
+	or (int_fwire_0, A, B);
+
+endmodule
+
+module NOR2x1_ASAP7_75t_R (Y, A, B);
+	output Y;
+	input A, B;
+
+	// Function
+	wire int_fwire_0;
+
+	not (Y, int_fwire_0);
+	or (int_fwire_0, A, B);
+
+endmodule
+
+module NOR2x2_ASAP7_75t_R (Y, A, B);
+	output Y;
+	input A, B;
+
+	// Function
+	wire int_fwire_0;
+
+	not (Y, int_fwire_0);
+	or (int_fwire_0, A, B);
+
+endmodule
+
+module AOI21xp5_ASAP7_75t_R (Y, A1, A2, B);
+	output Y;
+	input A1, A2, B;
+
+	// Function
+	wire int_fwire_0;
+
+	and (int_fwire_0, A1, A2);
+	nor (Y, int_fwire_0, B);
+
+endmodule
+
+module AOI21x1_ASAP7_75t_R (Y, A1, A2, B);
+	output Y;
+	input A1, A2, B;
+
+	// Function
+	wire int_fwire_0;
+
+	and (int_fwire_0, A1, A2);
+	nor (Y, int_fwire_0, B);
+
+endmodule
+
+module OAI21xp5_ASAP7_75t_R (Y, A1, A2, B);
+	output Y;
+	input A1, A2, B;
+
+	// Function
+	wire int_fwire_0;
+
+	or (int_fwire_0, A1, A2);
+	nand (Y, int_fwire_0, B);
+
+endmodule
+
+module OAI21x1_ASAP7_75t_R (Y, A1, A2, B);
+	output Y;
+	input A1, A2, B;
+
+	// Function
+	wire int_fwire_0;
+
+	or (int_fwire_0, A1, A2);
+	nand (Y, int_fwire_0, B);
+
+endmodule
@@ -2,6 +2,31 @@ from amaranth import Elaboratable, Instance, Signal
 
 
 class ASAP7Process(Elaboratable):
+    # Drive strengths of each cell we instantiate, weakest first, with the
+    # fanout each one is good for. Used by sizing.py
+    _cell_sizes = {
+        "AND2x2_ASAP7_75t_R": (("AND2x2_ASAP7_75t_R", 6), ("AND2x4_ASAP7_75t_R", 12),
+                               ("AND2x6_ASAP7_75t_R", 18)),
+        "OR2x2_ASAP7_75t_R": (("OR2x2_ASAP7_75t_R", 6), ("OR2x4_ASAP7_75t_R", 12),
+                              ("OR2x6_ASAP7_75t_R", 18)),
+        "XOR2x1_ASAP7_75t_R": (("XOR2x1_ASAP7_75t_R", 4), ("XOR2x2_ASAP7_75t_R", 8)),
+        "INVx1_ASAP7_75t_R": (("INVx1_ASAP7_75t_R", 4), ("INVx2_ASAP7_75t_R", 8),
+                              ("INVx4_ASAP7_75t_R", 16)),
+        "AO21x1_ASAP7_75t_R": (("AO21x1_ASAP7_75t_R", 4), ("AO21x2_ASAP7_75t_R", 8)),
+        "AO22x1_ASAP7_75t_R": (("AO22x1_ASAP7_75t_R", 4), ("AO22x2_ASAP7_75t_R", 8)),
+        "NAND2xp5_ASAP7_75t_R": (("NAND2xp5_ASAP7_75t_R", 4), ("NAND2x1_ASAP7_75t_R", 8),
+                                 ("NAND2x2_ASAP7_75t_R", 16)),
+        "NOR2xp33_ASAP7_75t_R": (("NOR2xp33_ASAP7_75t_R", 4), ("NOR2x1_ASAP7_75t_R", 8),
+                                 ("NOR2x2_ASAP7_75t_R", 16)),
+        "AOI21xp5_ASAP7_75t_R": (("AOI21xp5_ASAP7_75t_R", 4), ("AOI21x1_ASAP7_75t_R", 8)),
+        "OAI21xp5_ASAP7_75t_R": (("OAI21xp5_ASAP7_75t_R", 4), ("OAI21x1_ASAP7_75t_R", 8)),
+    }
+
+    # Buffers for buffer trees, weakest first, and their input and output
+    _buffers = (("BUFx2_ASAP7_75t_R", 8), ("BUFx4_ASAP7_75t_R", 16), ("BUFx8_ASAP7_75t_R", 32))
+    _buffer_pins = ("A", "Y")
+    _power_pins = ("VPWR", "VPB", "VGND", "VNB")
+
     def _PoweredInstance(self, *args, **kwargs):
         if self._powered:
             kwargs.update({
@@ -22,6 +47,36 @@ class ASAP7Process(Elaboratable):
 
         self.m.submodules += andgate
 
+    def _generate_or(self, a, b, o):
+        orgate = self._PoweredInstance(
+            "OR2x2_ASAP7_75t_R",
+            i_A=a,
+            i_B=b,
+            o_Y=o
+        )
+
+        self.m.submodules += orgate
+
+    def _generate_nand(self, a, b, o):
+        nandgate = self._PoweredInstance(
+            "NAND2xp5_ASAP7_75t_R",
+            i_A=a,
+            i_B=b,
+            o_Y=o
+        )
+
+        self.m.submodules += nandgate
+
+    def _generate_nor(self, a, b, o):
+        norgate = self._PoweredInstance(
+            "NOR2xp33_ASAP7_75t_R",
+            i_A=a,
+            i_B=b,
+            o_Y=o
+        )
+
+        self.m.submodules += norgate
+
     def _generate_xor(self, a, b, o):
         xorgate = self._PoweredInstance(
             "XOR2x1_ASAP7_75t_R",
@@ -63,14 +118,20 @@ class ASAP7Process(Elaboratable):
             i_A=con,
             o_Y=carry_out
         )
-        self.m.submodules += inv1
+        if name:
+            self.m.submodules[name + "_carry_inv"] = inv1
+        else:
+            self.m.submodules += inv1
 
         inv2 = self._PoweredInstance(
             "INVx1_ASAP7_75t_R",
             i_A=sn,
             o_Y=sum_out
         )
-        self.m.submodules += inv2
+        if name:
+            self.m.submodules[name + "_sum_inv"] = inv2
+        else:
+            self.m.submodules += inv2
 
     def _generate_half_adder(self, a, b, sum_out, carry_out, name=None):
         con = Signal()
@@ -94,14 +155,20 @@ class ASAP7Process(Elaboratable):
             i_A=con,
             o_Y=carry_out
         )
-        self.m.submodules += inv1
+        if name:
+            self.m.submodules[name + "_carry_inv"] = inv1
+        else:
+            self.m.submodules += inv1
 
         inv2 = self._PoweredInstance(
             "INVx1_ASAP7_75t_R",
             i_A=sn,
             o_Y=sum_out
         )
-        self.m.submodules += inv2
+        if name:
+            self.m.submodules[name + "_sum_inv"] = inv2
+        else:
+            self.m.submodules += inv2
 
     # Used in adder
     def _generate_ao21(self, a1, a2, b1, o):
@@ -116,6 +183,32 @@ class ASAP7Process(Elaboratable):
 
         self.m.submodules += a21o
 
+    # Used in adder
+    def _generate_aoi21(self, a1, a2, b1, o):
+        # 2-input AND into first input of 2-input NOR
+        a21oi = self._PoweredInstance(
+            "AOI21xp5_ASAP7_75t_R",
+            o_Y=o,
+            i_A1=a1,
+            i_A2=a2,
+            i_B=b1
+        )
+
+        self.m.submodules += a21oi
+
+    # Used in adder
+    def _generate_oai21(self, a1, a2, b1, o):
+        # 2-input OR into first input of 2-input NAND
+        o21ai = self._PoweredInstance(
+            "OAI21xp5_ASAP7_75t_R",
+            o_Y=o,
+            i_A1=a1,
+            i_A2=a2,
+            i_B=b1
+        )
+
+        self.m.submodules += o21ai
+
     # Used in multiplier
     def _generate_ao22(self, a1, a2, b1, b2, o):
         # 2-input AND into both inputs of 2-input OR
@@ -0,0 +1,145 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+import adder
+import multiplier
+from cache import VerilogCache
+from qor import write_report
+
+
+GENERATORS = {
+    'adder': adder.generate,
+    'multiplier': multiplier.generate,
+}
+
+REPORTS = {
+    'adder': adder.generate_report,
+    'multiplier': multiplier.generate_report,
+}
+
+
+def expand(spec):
+    # A spec is a list of entries, each with a generator, a matrix of
+    # options to take the cross product of, fixed options common to every
+    # point and an output filename template, eg:
+    #
+    # [{"generator": "adder",
+    #   "output": "adder_{process}_{algorithm}.v",
+    #   "options": {"bits": 64},
+    #   "matrix": {"process": ["sky130hd", "asap7"],
+    #              "algorithm": ["brentkung", "koggestone"]}}]
+    points = []
+    for entry in spec:
+        generator = entry['generator']
+        if generator not in GENERATORS:
+            raise ValueError("Unknown generator %s" % generator)
+
+        matrix = entry.get('matrix', {})
+        names = list(matrix)
+        template = entry.get('output', '_'.join([generator] + ['{%s}' % n for n in names]) + '.v')
+
+        for values in itertools.product(*(matrix[n] for n in names)):
+            config = dict(entry.get('options', {}))
+            config.update(zip(names, values))
+            points.append((generator, config, template.format(**config)))
+
+    filenames = [p[2] for p in points]
+    duplicates = set(f for f in filenames if filenames.count(f) > 1)
+    if duplicates:
+        raise ValueError("Output filenames are not unique: %s" % ', '.join(sorted(duplicates)))
+
+    return points
+
+
+def generate_point(point, output_dir, cache_dir, use_cache, report=False, liberty=None):
+    generator, config, filename = point
+    cache = VerilogCache(cache_dir) if use_cache else None
+
+    path = os.path.join(output_dir, filename)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+    start = time.perf_counter()
+    with open(path, 'w') as f:
+        GENERATORS[generator](config, f, cache)
+    elapsed = time.perf_counter() - start
+
+    with open(path, 'rb') as f:
+        verilog = f.read()
+
+    entry = {
+        'generator': generator,
+        'config': config,
+        'file': filename,
+        'sha256': hashlib.sha256(verilog).hexdigest(),
+        'seconds': round(elapsed, 3),
+    }
+
+    if report:
+        entry['report'] = os.path.splitext(filename)[0] + '.json'
+        with open(os.path.join(output_dir, entry['report']), 'w') as f:
+            write_report(f, REPORTS[generator](config, liberty))
+
+    return entry
+
+
+def run(spec, output_dir, jobs=None, cache_dir=None, use_cache=True, report=False, liberty=None):
+    # Generate every point of a spec in a process pool, and write the Verilog
+    # plus a manifest.json describing each file to output_dir. With report
+    # set, a JSON report (see qor.py) is written next to each file.
+    points = expand(spec)
+    os.makedirs(output_dir, exist_ok=True)
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(generate_point, p, output_dir, cache_dir, use_cache, report, liberty)
+                   for p in points]
+        manifest = [f.result() for f in futures]
+
+    with open(os.path.join(output_dir, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+        f.write('\n')
+
+    return manifest
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Generate a matrix of adders and multipliers')
+
+    parser.add_argument('spec', type=argparse.FileType('r'),
+                        help='JSON matrix spec')
+
+    parser.add_argument('--output-dir', default='generated',
+                        help='Write Verilog and manifest.json to this directory')
+
+    parser.add_argument('--jobs', type=int,
+                        help='Number of parallel jobs (default is the number of CPUs)')
+
+    parser.add_argument('--cache-dir',
+                        help='Directory of the generated Verilog cache')
+
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Always generate the Verilog, bypassing the cache')
+
+    parser.add_argument('--report', action='store_true',
+                        help='Write a JSON report of cell counts, area, logic depth and fanout for each file')
+
+    parser.add_argument('--liberty', action='append',
+                        help='Liberty file to take cell areas from for the reports (may be given more than once)')
+
+    args = parser.parse_args()
+
+    try:
+        spec = json.load(args.spec)
+        expand(spec)
+    except ValueError as e:
+        print(e)
+        exit(1)
+
+    manifest = run(spec, args.output_dir, jobs=args.jobs, cache_dir=args.cache_dir,
+                   use_cache=not args.no_cache, report=args.report, liberty=args.liberty)
+    print("Generated %d files in %s" % (len(manifest), args.output_dir), file=sys.stderr)
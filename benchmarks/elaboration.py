@@ -0,0 +1,54 @@
+import os
+import sys
+import time
+import argparse
+
+from amaranth.hdl import Fragment
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from sky130hd.process import SKY130HDProcess  # noqa: E402
+from asap7.process import ASAP7Process  # noqa: E402
+from gf180mcu.process import GF180MCUProcess  # noqa: E402
+from none.process import NoneProcess  # noqa: E402
+
+from adder import BrentKung  # noqa: E402
+from multiplier import Multiplier, BoothRadix4, Dadda  # noqa: E402
+
+
+# Time how long it takes to elaborate a multiplier (before any Verilog is
+# written), and how much of that is spent in partial product accumulation.
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark multiplier elaboration time')
+
+    parser.add_argument('--bits', type=int, nargs='+', default=[8, 16, 32, 64, 128, 256],
+                        help='Widths to benchmark')
+
+    parser.add_argument('--process', default='none',
+                        help='What process to build for (none (default), sky130hd, asap7, gf180mcu)')
+
+    args = parser.parse_args()
+
+    process = {
+        'none': NoneProcess,
+        'sky130hd': SKY130HDProcess,
+        'asap7': ASAP7Process,
+        'gf180mcu': GF180MCUProcess,
+    }[args.process]
+
+    class myadder(BrentKung, process):
+        pass
+
+    class mymultiplier(Multiplier, BoothRadix4, Dadda, process):
+        def _acc_partial_products(self):
+            start = time.perf_counter()
+            super()._acc_partial_products()
+            self.accumulation_time = time.perf_counter() - start
+
+    print("%6s %14s %16s" % ("bits", "elaborate (s)", "accumulate (s)"))
+    for bits in args.bits:
+        multiplier = mymultiplier(bits=bits, adder=myadder)
+        start = time.perf_counter()
+        Fragment.get(multiplier, None)
+        elapsed = time.perf_counter() - start
+        print("%6d %14.3f %16.3f" % (bits, elapsed, multiplier.accumulation_time))
@@ -0,0 +1,109 @@
+import os
+import glob
+import json
+import hashlib
+import tempfile
+
+import amaranth
+
+
+# Everything that can change the generated Verilog: the generators, the
+# process modules and their cell models.
+SOURCES = ["*.py", "*/process.py", "*/*.v"]
+
+_sources_hash = None
+
+
+def sources_hash():
+    global _sources_hash
+
+    if _sources_hash is None:
+        root = os.path.dirname(os.path.abspath(__file__))
+        h = hashlib.sha256(amaranth.__version__.encode())
+        files = set()
+        for pattern in SOURCES:
+            files.update(glob.glob(os.path.join(root, pattern)))
+        for filename in sorted(files):
+            h.update(os.path.relpath(filename, root).encode())
+            with open(filename, 'rb') as f:
+                h.update(f.read())
+        _sources_hash = h.hexdigest()
+
+    return _sources_hash
+
+
+def default_directory():
+    if 'VLSI_ARITHMETIC_CACHE' in os.environ:
+        return os.environ['VLSI_ARITHMETIC_CACHE']
+    base = os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache'))
+    return os.path.join(base, 'vlsi-arithmetic')
+
+
+class VerilogCache:
+    # Content addressed cache of generated Verilog. Entries are keyed on the
+    # generator configuration plus a hash of the generator sources, and the
+    # least recently used entries are evicted once the cache grows beyond
+    # max_size bytes.
+    def __init__(self, directory=None, max_size=256 * 1024 * 1024):
+        self.directory = directory or default_directory()
+        self.max_size = max_size
+
+    def key(self, config):
+        h = hashlib.sha256(sources_hash().encode())
+        h.update(json.dumps(config, sort_keys=True).encode())
+        return h.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.v')
+
+    def get(self, key):
+        try:
+            with open(self._path(key)) as f:
+                verilog = f.read()
+        except FileNotFoundError:
+            return None
+
+        # Mark as recently used
+        os.utime(self._path(key))
+        return verilog
+
+    def put(self, key, verilog):
+        os.makedirs(self.directory, exist_ok=True)
+
+        # Write to a temporary file and rename, so concurrent users never
+        # see a partial entry
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            f.write(verilog)
+        os.replace(tmp, self._path(key))
+
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for filename in glob.glob(os.path.join(self.directory, '*.v')):
+            try:
+                st = os.stat(filename)
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, filename))
+
+        size = sum(e[1] for e in entries)
+        for (mtime, entry_size, filename) in sorted(entries):
+            if size <= self.max_size:
+                break
+            try:
+                os.remove(filename)
+            except FileNotFoundError:
+                pass
+            size -= entry_size
+
+    def get_or_generate(self, config, generate):
+        # Return the cached Verilog for config, calling generate() to create
+        # it on a miss
+        key = self.key(config)
+        verilog = self.get(key)
+        if verilog is None:
+            verilog = generate()
+            self.put(key, verilog)
+        return verilog
@@ -1,42 +1,181 @@
 #!/bin/bash -e
 
-mkdir -p generated
-
 PROCESSES="sky130hd asap7 gf180mcu"
 ADDERS="brentkung koggestone hancarlson"
+PREFIX_ADDERS="sklansky ladnerfischer knowles prefix_2_1_2 sparsetree"
+PREFIX_ADDERS="${PREFIX_ADDERS} ling_brentkung ling_koggestone ling_hancarlson"
+PREFIX_ADDERS="${PREFIX_ADDERS} inverting_brentkung inverting_koggestone inverting_hancarlson"
+BACKENDS="amaranth structural hierarchical"
+REDUCTIONS="wallace compressor42"
+BOOTH_RADICES="8 16"
+
+# Generate every design in parallel
+python3 batch.py ci/formal.json --output-dir=generated
 
 # Test adders
 for PROCESS in ${PROCESSES}; do
-	for ADDER in ${ADDERS}; do
-		VERILOG=generated/adder_${PROCESS}_${ADDER}.v
-		python3 adder.py --bits=64 --algorithm=${ADDER} --process=${PROCESS} --output=${VERILOG}
-		BITS=64 VERILOG=${VERILOG} PROCESS_VERILOG=${PROCESS}/${PROCESS}.v yosys -c formal/adder.tcl
+	for ADDER in ${ADDERS} ${PREFIX_ADDERS}; do
+		for BACKEND in ${BACKENDS}; do
+			VERILOG=generated/adder_${PROCESS}_${ADDER}_${BACKEND}.v
+			BITS=64 VERILOG=${VERILOG} PROCESS_VERILOG=${PROCESS}/${PROCESS}.v yosys -c formal/adder.tcl
+		done
+	done
+done
+
+# Test adders with register stages between prefix levels
+for PROCESS in ${PROCESSES}; do
+	for ADDER in ${ADDERS} sklansky ladnerfischer knowles; do
+		for BACKEND in ${BACKENDS}; do
+			VERILOG=generated/adder_pipelined_${PROCESS}_${ADDER}_${BACKEND}.v
+			BITS=64 LATENCY=2 VERILOG=${VERILOG} PROCESS_VERILOG=${PROCESS}/${PROCESS}.v yosys -c formal/adder_pipelined.tcl
+		done
 	done
 done
 
 # Test multipliers
 for PROCESS in ${PROCESSES}; do
 	for ADDER in ${ADDERS}; do
-		VERILOG=generated/multiplier_${PROCESS}_${ADDER}.v
-		python3 multiplier.py --bits=8 --algorithm=${ADDER} --process=${PROCESS} --output=${VERILOG}
+		for BACKEND in ${BACKENDS}; do
+			VERILOG=generated/multiplier_${PROCESS}_${ADDER}_${BACKEND}.v
+			BITS=8 VERILOG=${VERILOG} PROCESS_VERILOG=${PROCESS}/${PROCESS}.v yosys -c formal/multiplier.tcl
+		done
+	done
+done
+
+# Test timing driven multipliers
+for PROCESS in ${PROCESSES}; do
+	for BACKEND in ${BACKENDS}; do
+		VERILOG=generated/multiplier_timing_driven_${PROCESS}_brentkung_${BACKEND}.v
 		BITS=8 VERILOG=${VERILOG} PROCESS_VERILOG=${PROCESS}/${PROCESS}.v yosys -c formal/multiplier.tcl
 	done
 done
 
+# Test multipliers with the other partial product reductions
+for PROCESS in ${PROCESSES}; do
+	for REDUCTION in ${REDUCTIONS}; do
+		for BACKEND in ${BACKENDS}; do
+			VERILOG=generated/multiplier_${REDUCTION}_${PROCESS}_brentkung_${BACKEND}.v
+			BITS=8 VERILOG=${VERILOG} PROCESS_VERILOG=${PROCESS}/${PROCESS}.v yosys -c formal/multiplier.tcl
+		done
+	done
+done
+
+# Test multipliers with higher radix booth encoding
+for PROCESS in ${PROCESSES}; do
+	for RADIX in ${BOOTH_RADICES}; do
+		for ADDER in ${ADDERS}; do
+			for BACKEND in ${BACKENDS}; do
+				VERILOG=generated/multiplier_booth${RADIX}_${PROCESS}_${ADDER}_${BACKEND}.v
+				BITS=8 VERILOG=${VERILOG} PROCESS_VERILOG=${PROCESS}/${PROCESS}.v yosys -c formal/multiplier.tcl
+			done
+		done
+	done
+done
+
+# Test signed multipliers
+for PROCESS in ${PROCESSES}; do
+	for RADIX in 4 ${BOOTH_RADICES}; do
+		for ADDER in ${ADDERS}; do
+			for BACKEND in ${BACKENDS}; do
+				VERILOG=generated/multiplier_signed_booth${RADIX}_${PROCESS}_${ADDER}_${BACKEND}.v
+				BITS=8 VERILOG=${VERILOG} PROCESS_VERILOG=${PROCESS}/${PROCESS}.v yosys -c formal/multiplier_signed.tcl
+			done
+		done
+	done
+done
+
+# Test rectangular multipliers
+for PROCESS in ${PROCESSES}; do
+	for B_BITS in 5 11; do
+		for ADDER in ${ADDERS}; do
+			for BACKEND in ${BACKENDS}; do
+				VERILOG=generated/multiplier_8x${B_BITS}_${PROCESS}_${ADDER}_${BACKEND}.v
+				BITS=8 B_BITS=${B_BITS} VERILOG=${VERILOG} PROCESS_VERILOG=${PROCESS}/${PROCESS}.v yosys -c formal/multiplier.tcl
+			done
+		done
+	done
+done
+
 # Test multiply adders
 for PROCESS in ${PROCESSES}; do
 	for ADDER in ${ADDERS}; do
-		VERILOG=generated/multiply_adder_${PROCESS}_${ADDER}.v
-		python3 multiplier.py --bits=4 --multiply-add --algorithm=${ADDER} --process=${PROCESS} --output=${VERILOG}
-		BITS=4 VERILOG=${VERILOG} PROCESS_VERILOG=${PROCESS}/${PROCESS}.v yosys -c formal/multiply_adder.tcl
+		for BACKEND in ${BACKENDS}; do
+			VERILOG=generated/multiply_adder_${PROCESS}_${ADDER}_${BACKEND}.v
+			BITS=4 VERILOG=${VERILOG} PROCESS_VERILOG=${PROCESS}/${PROCESS}.v yosys -c formal/multiply_adder.tcl
+		done
 	done
 done
 
 # Test multiply adder with pipelining
 for PROCESS in ${PROCESSES}; do
 	for ADDER in ${ADDERS}; do
-		VERILOG=generated/multiply_adder_${PROCESS}_${ADDER}.v
-		python3 multiplier.py --bits=4 --multiply-add --algorithm=${ADDER} --process=${PROCESS} --register-input --register-middle --register-output --output=${VERILOG}
-		BITS=4 VERILOG=${VERILOG} PROCESS_VERILOG=${PROCESS}/${PROCESS}.v yosys -c formal/multiply_adder_pipelined.tcl
+		for BACKEND in ${BACKENDS}; do
+			VERILOG=generated/multiply_adder_pipelined_${PROCESS}_${ADDER}_${BACKEND}.v
+			BITS=4 VERILOG=${VERILOG} PROCESS_VERILOG=${PROCESS}/${PROCESS}.v yosys -c formal/multiply_adder_pipelined.tcl
+		done
+	done
+done
+
+# Test multiply adders pipelined with --stages, which adds stages - 1 cycles
+# of latency
+for PROCESS in ${PROCESSES}; do
+	for STAGES in 2 4; do
+		for BACKEND in structural hierarchical; do
+			VERILOG=generated/multiply_adder_stages${STAGES}_${PROCESS}_brentkung_${BACKEND}.v
+			BITS=4 LATENCY=$((STAGES - 1)) VERILOG=${VERILOG} PROCESS_VERILOG=${PROCESS}/${PROCESS}.v yosys -c formal/multiply_adder_pipelined.tcl
+		done
+	done
+done
+
+# Test dot products, with and without an accumulator
+for PROCESS in ${PROCESSES}; do
+	for RADIX in 4 8; do
+		for BACKEND in ${BACKENDS}; do
+			VERILOG=generated/dot_product_${PROCESS}_${RADIX}_${BACKEND}.v
+			BITS=4 TERMS=3 VERILOG=${VERILOG} PROCESS_VERILOG=${PROCESS}/${PROCESS}.v yosys -c formal/dot_product.tcl
+			VERILOG=generated/dot_product_adder_${PROCESS}_${RADIX}_${BACKEND}.v
+			BITS=4 TERMS=3 VERILOG=${VERILOG} PROCESS_VERILOG=${PROCESS}/${PROCESS}.v yosys -c formal/dot_product_adder.tcl
+		done
+	done
+done
+
+# Test multiply accumulators, whose accumulator is in carry save form
+for PROCESS in ${PROCESSES}; do
+	for RADIX in 4 8; do
+		for BACKEND in ${BACKENDS}; do
+			VERILOG=generated/multiply_accumulator_${PROCESS}_${RADIX}_${BACKEND}.v
+			BITS=4 VERILOG=${VERILOG} PROCESS_VERILOG=${PROCESS}/${PROCESS}.v yosys -c formal/multiply_accumulator.tcl
+		done
+	done
+done
+
+# Test partitioned multipliers in every mode
+for PROCESS in ${PROCESSES}; do
+	for LANES in 2 4; do
+		for BACKEND in ${BACKENDS}; do
+			VERILOG=generated/multiplier_lanes${LANES}_${PROCESS}_4_${BACKEND}.v
+			BITS=8 LANES=${LANES} VERILOG=${VERILOG} PROCESS_VERILOG=${PROCESS}/${PROCESS}.v yosys -c formal/multiplier_partitioned.tcl
+		done
+	done
+done
+
+# Test multipliers with a final adder built for the arrival profile
+for PROCESS in ${PROCESSES}; do
+	for BACKEND in ${BACKENDS}; do
+		VERILOG=generated/multiplier_hybrid_${PROCESS}_${BACKEND}.v
+		BITS=8 VERILOG=${VERILOG} PROCESS_VERILOG=${PROCESS}/${PROCESS}.v yosys -c formal/multiplier.tcl
+	done
+done
+
+# Test truncated multipliers stay within two units of the lowest column
+# they keep
+for PROCESS in ${PROCESSES}; do
+	for COMPENSATION in constant variable; do
+		for RADIX in 4 8; do
+			for BACKEND in ${BACKENDS}; do
+				VERILOG=generated/multiplier_truncated_${COMPENSATION}_booth${RADIX}_${PROCESS}_${BACKEND}.v
+				BITS=8 TRUNCATE=8 MAX_ERROR=2 VERILOG=${VERILOG} PROCESS_VERILOG=${PROCESS}/${PROCESS}.v yosys -c formal/multiplier_truncated.tcl
+			done
+		done
 	done
 done
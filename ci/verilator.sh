@@ -10,30 +10,41 @@ TESTS=""
 
 build_one_test () {
 	PIPELINE_DEPTH="$1"
-	shift
+	A_BITS="$2"
+	B_BITS="$3"
+	shift 3
 	ARGS="$*"
 
-	# Exhaustive test of 8 bit multiply/adder for every process and adder type
+	# Exhaustive test of an A_BITS x B_BITS multiply/adder for every process and adder type
 	for PROCESS in ${PROCESSES}; do
 		for ADDER in ${ADDERS}; do
 			PIPELINE_CMD=$(echo $ARGS | sed -e 's/ --/-/g' -e 's/--//')
-			VERILOG="generated/multiplier_${PROCESS}_${ADDER}_${PIPELINE_CMD}_8.v"
-			BINARY=multiply-adder-${PROCESS}-${ADDER}_${PIPELINE_CMD}_8
-			python3 multiplier.py --bits=8 --process=${PROCESS} --algorithm=${ADDER} --multiply-add ${ARGS} --output=${VERILOG}
-			verilator ${VERILATOR_OPTS} -CFLAGS "-O3 -DPIPELINE_DEPTH=${PIPELINE_DEPTH}" --assert --cc --exe --build ${VERILOG} ${PROCESS}/${PROCESS}.v verilator/multiplier.cpp -o ${BINARY} -top-module multiply_adder
+			VERILOG="generated/multiplier_${PROCESS}_${ADDER}_${PIPELINE_CMD}_${A_BITS}x${B_BITS}.v"
+			BINARY=multiply-adder-${PROCESS}-${ADDER}_${PIPELINE_CMD}_${A_BITS}x${B_BITS}
+			python3 multiplier.py --bits=${A_BITS} --b-bits=${B_BITS} --process=${PROCESS} --algorithm=${ADDER} --multiply-add ${ARGS} --output=${VERILOG}
+			verilator ${VERILATOR_OPTS} -CFLAGS "-O3 -DPIPELINE_DEPTH=${PIPELINE_DEPTH} -DA_BITS=${A_BITS} -DB_BITS=${B_BITS}" --assert --cc --exe --build ${VERILOG} ${PROCESS}/${PROCESS}.v verilator/multiplier.cpp -o ${BINARY} -top-module multiply_adder
 			TESTS="${TESTS} obj_dir/${BINARY}"
 		done
 	done
 }
 
-build_one_test 0 ""
-build_one_test 1 "--register-input"
-build_one_test 1 "--register-middle"
-build_one_test 1 "--register-output"
-build_one_test 2 "--register-input --register-middle"
-build_one_test 2 "--register-input --register-output"
-build_one_test 2 "--register-middle --register-output"
-build_one_test 3 "--register-input --register-middle --register-output"
+build_one_test 0 8 8 ""
+build_one_test 1 8 8 "--register-input"
+build_one_test 1 8 8 "--register-middle"
+build_one_test 1 8 8 "--register-output"
+build_one_test 2 8 8 "--register-input --register-middle"
+build_one_test 2 8 8 "--register-input --register-output"
+build_one_test 2 8 8 "--register-middle --register-output"
+build_one_test 3 8 8 "--register-input --register-middle --register-output"
+
+# Rectangular, with the narrower operand on either side
+build_one_test 0 8 5 ""
+build_one_test 0 5 8 ""
+build_one_test 3 8 5 "--register-input --register-middle --register-output"
+
+# Pipelined with --stages, which adds stages - 1 cycles of latency
+build_one_test 2 8 8 "--stages=3 --backend=structural"
+build_one_test 3 8 8 "--stages=3 --register-input --register-output --backend=hierarchical"
 
 # Run N in parallel
 N=4
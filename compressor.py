@@ -0,0 +1,102 @@
+from collections import deque
+
+
+# Estimated delays of the cells of a compressor tree in units of a simple
+# gate, from each input to each output. The sum of a full adder goes through
+# two xors, but its carry in only goes through the second one. Timing
+# driven reduction and pipelining plan with these for every process, the
+# static timing in sta.py is what uses the real cell delays.
+UNIT_DELAYS = {
+    # inv, and, or, xor, ao21, ao22 etc
+    "gate": 1,
+    # (a, b, carry_in) to (sum_out, carry_out)
+    "full_adder": ((2, 2), (2, 2), (1, 1)),
+    # (a, b) to (sum_out, carry_out)
+    "half_adder": ((1, 1), (1, 1)),
+    # (a, b, c, d, carry_in) to (sum_out, carry_out, cout) of a 4:2
+    # compressor built from two full adders. None if there is no path.
+    "compressor42": ((4, 4, 2), (4, 4, 2), (3, 3, 1), (2, 2, None), (1, 1, None)),
+}
+
+# The same in cells, where every adder is one level of logic
+CELL_LEVELS = {
+    "gate": 1,
+    "full_adder": ((1, 1), (1, 1), (1, 1)),
+    "half_adder": ((1, 1), (1, 1)),
+    "compressor42": ((2, 2, 1), (2, 2, 1), (2, 2, 1), (1, 1, None), (1, 1, None)),
+}
+
+
+def adder_arrival(delays, kind, arrivals):
+    # Arrival times of the outputs of a full_adder, half_adder or
+    # compressor42 whose inputs arrive at arrivals
+    table = delays[kind]
+    return tuple(max(t + d[out] for (t, d) in zip(arrivals, table) if d[out] is not None)
+                 for out in range(len(table[0])))
+
+
+class Columns:
+    # The columns of bits a compressor tree reduces. Each column is a deque
+    # so bits are taken from the head in O(1), and we keep a histogram of
+    # column heights so the tallest column is known without rescanning every
+    # column after each adder. With a key (eg the arrival time of each bit)
+    # pop() takes the bits with the smallest keys instead of the oldest.
+    def __init__(self, columns, key=None):
+        self._key = key
+        self._columns = [deque(column) for column in columns]
+        self._count = [0] * (max([len(c) for c in self._columns] + [0]) + 1)
+        for column in self._columns:
+            self._count[len(column)] += 1
+        self._max_height = len(self._count) - 1
+
+    def __len__(self):
+        return len(self._columns)
+
+    def __getitem__(self, offset):
+        return self._columns[offset]
+
+    def height(self, offset):
+        return len(self._columns[offset])
+
+    def max_height(self):
+        return self._max_height
+
+    def _resize(self, old, new):
+        if new == len(self._count):
+            self._count.append(0)
+        self._count[old] -= 1
+        self._count[new] += 1
+        if new > self._max_height:
+            self._max_height = new
+        while self._max_height > 0 and self._count[self._max_height] == 0:
+            self._max_height -= 1
+
+    def push(self, offset, bit):
+        # Add a bit to the bottom of a column. Bits pushed beyond the last
+        # column (eg the carry out of the top column) are dropped.
+        if offset >= len(self._columns):
+            return
+        column = self._columns[offset]
+        column.append(bit)
+        self._resize(len(column) - 1, len(column))
+
+    def pop(self, offset, n=1):
+        # Take n bits from the top of a column, oldest first. With a key,
+        # take the n bits with the smallest keys, smallest first (and
+        # oldest first when keys are equal).
+        column = self._columns[offset]
+        if self._key is None:
+            bits = [column.popleft() for i in range(n)]
+        else:
+            order = sorted(range(len(column)), key=lambda i: self._key(column[i]))[:n]
+            bits = [column[i] for i in order]
+            for i in sorted(order, reverse=True):
+                del column[i]
+        self._resize(len(column) + n, len(column))
+        return bits
+
+    def pad(self, height, bit):
+        # Pad every column up to height with copies of bit
+        for offset in range(len(self._columns)):
+            while self.height(offset) < height:
+                self.push(offset, bit)
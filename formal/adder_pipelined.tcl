@@ -0,0 +1,26 @@
+yosys -import
+
+read_verilog -defer gold/adder_pipelined.v
+chparam -set BITS $::env(BITS) gold_adder_pipelined
+chparam -set LATENCY $::env(LATENCY) gold_adder_pipelined
+prep -flatten -top gold_adder_pipelined
+splitnets -ports
+design -stash gold
+
+read_verilog $::env(VERILOG) $::env(PROCESS_VERILOG)
+prep -flatten -top adder
+splitnets -ports
+design -stash gate
+
+design -copy-from gold -as gold gold_adder_pipelined
+design -copy-from gate -as gate adder
+equiv_make gold gate equiv
+prep -flatten -top equiv
+
+opt_clean -purge
+#show -prefix equiv-prep -colors 1 -stretch
+
+opt -full
+equiv_simple -seq 5
+equiv_induct -seq 5
+equiv_status -assert
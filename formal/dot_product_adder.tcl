@@ -0,0 +1,29 @@
+yosys -import
+
+read_verilog -defer gold/dot_product_adder.v
+chparam -set BITS $::env(BITS) gold_dot_product_adder
+if {[info exists ::env(B_BITS)]} {
+    chparam -set B_BITS $::env(B_BITS) gold_dot_product_adder
+}
+chparam -set TERMS $::env(TERMS) gold_dot_product_adder
+prep -flatten -top gold_dot_product_adder
+splitnets -ports
+design -stash gold
+
+read_verilog $::env(VERILOG) $::env(PROCESS_VERILOG)
+prep -flatten -top dot_product_adder
+splitnets -ports
+design -stash gate
+
+design -copy-from gold -as gold gold_dot_product_adder
+design -copy-from gate -as gate dot_product_adder
+equiv_make gold gate equiv
+prep -flatten -top equiv
+
+opt_clean -purge
+#show -prefix equiv-prep -colors 1 -stretch
+
+opt -full
+equiv_simple
+equiv_induct
+equiv_status -assert
@@ -2,6 +2,9 @@ yosys -import
 
 read_verilog -defer gold/multiplier.v
 chparam -set BITS $::env(BITS) gold_multiplier
+if {[info exists ::env(B_BITS)]} {
+    chparam -set B_BITS $::env(B_BITS) gold_multiplier
+}
 prep -flatten -top gold_multiplier
 splitnets -ports
 design -stash gold
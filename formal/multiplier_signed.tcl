@@ -0,0 +1,28 @@
+yosys -import
+
+read_verilog -defer gold/multiplier_signed.v
+chparam -set BITS $::env(BITS) gold_multiplier_signed
+if {[info exists ::env(B_BITS)]} {
+    chparam -set B_BITS $::env(B_BITS) gold_multiplier_signed
+}
+prep -flatten -top gold_multiplier_signed
+splitnets -ports
+design -stash gold
+
+read_verilog $::env(VERILOG) $::env(PROCESS_VERILOG)
+prep -flatten -top multiplier
+splitnets -ports
+design -stash gate
+
+design -copy-from gold -as gold gold_multiplier_signed
+design -copy-from gate -as gate multiplier
+equiv_make gold gate equiv
+prep -flatten -top equiv
+
+opt_clean -purge
+#show -prefix equiv-prep -colors 1 -stretch
+
+opt -full
+equiv_simple
+equiv_induct
+equiv_status -assert
@@ -0,0 +1,14 @@
+yosys -import
+
+# A truncated multiplier isn't equivalent to a * b, so prove a bound on its
+# error instead
+read_verilog $::env(VERILOG) $::env(PROCESS_VERILOG)
+read_verilog -defer gold/multiplier_truncated.v
+chparam -set BITS $::env(BITS) gold_multiplier_truncated
+chparam -set TRUNCATE $::env(TRUNCATE) gold_multiplier_truncated
+if {[info exists ::env(MAX_ERROR)]} {
+    chparam -set MAX_ERROR $::env(MAX_ERROR) gold_multiplier_truncated
+}
+prep -flatten -top gold_multiplier_truncated
+
+sat -prove ok 1 -verify -show-inputs
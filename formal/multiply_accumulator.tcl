@@ -0,0 +1,30 @@
+yosys -import
+
+read_verilog -defer gold/multiply_accumulator.v
+chparam -set BITS $::env(BITS) gold_multiply_accumulator
+if {[info exists ::env(B_BITS)]} {
+    chparam -set B_BITS $::env(B_BITS) gold_multiply_accumulator
+}
+prep -flatten -top gold_multiply_accumulator
+splitnets -ports
+design -stash gold
+
+read_verilog $::env(VERILOG) $::env(PROCESS_VERILOG)
+prep -flatten -top multiply_accumulator
+splitnets -ports
+design -stash gate
+
+design -copy-from gold -as gold gold_multiply_accumulator
+design -copy-from gate -as gate multiply_accumulator
+equiv_make gold gate equiv
+prep -flatten -top equiv
+
+opt_clean -purge
+#show -prefix equiv-prep -colors 1 -stretch
+
+# The accumulator is in carry save form, so its registers don't match the
+# gold ones. Induction on o, the sum of the two rows, proves them equal.
+opt -full
+equiv_simple -seq 5
+equiv_induct -seq 5
+equiv_status -assert
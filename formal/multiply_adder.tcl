@@ -2,6 +2,9 @@ yosys -import
 
 read_verilog -defer gold/multiply_adder.v
 chparam -set BITS $::env(BITS) gold_multiply_adder
+if {[info exists ::env(B_BITS)]} {
+    chparam -set B_BITS $::env(B_BITS) gold_multiply_adder
+}
 prep -flatten -top gold_multiply_adder
 splitnets -ports
 design -stash gold
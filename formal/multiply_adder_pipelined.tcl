@@ -2,6 +2,12 @@ yosys -import
 
 read_verilog -defer gold/multiply_adder_pipelined.v
 chparam -set BITS $::env(BITS) gold_multiply_adder_pipelined
+if {[info exists ::env(B_BITS)]} {
+    chparam -set B_BITS $::env(B_BITS) gold_multiply_adder_pipelined
+}
+if {[info exists ::env(LATENCY)]} {
+    chparam -set LATENCY $::env(LATENCY) gold_multiply_adder_pipelined
+}
 prep -flatten -top gold_multiply_adder_pipelined
 splitnets -ports
 design -stash gold
@@ -221,3 +221,399 @@ output ZN;
         or MGM_BG_8( ZN, ZN_row1, ZN_row2 );
 
 endmodule
+
+module gf180mcu_fd_sc_mcu7t5v0__and2_2( A1, A2, Z );
+input A1, A2;
+output Z;
+
+        and MGM_BG_0( Z, A1, A2 );
+
+endmodule
+
+module gf180mcu_fd_sc_mcu7t5v0__and2_4( A1, A2, Z );
+input A1, A2;
+output Z;
+
+        and MGM_BG_0( Z, A1, A2 );
+
+endmodule
+
+module gf180mcu_fd_sc_mcu7t5v0__xor2_2( A2, A1, Z );
+input A1, A2;
+output Z;
+
+        wire A2_inv_for_gf180mcu_fd_sc_mcu7t5v0__xor2_2;
+
+        not MGM_BG_0( A2_inv_for_gf180mcu_fd_sc_mcu7t5v0__xor2_2, A2 );
+
+        wire Z_row1;
+
+        and MGM_BG_1( Z_row1, A2_inv_for_gf180mcu_fd_sc_mcu7t5v0__xor2_2, A1 );
+
+        wire A1_inv_for_gf180mcu_fd_sc_mcu7t5v0__xor2_2;
+
+        not MGM_BG_2( A1_inv_for_gf180mcu_fd_sc_mcu7t5v0__xor2_2, A1 );
+
+        wire Z_row2;
+
+        and MGM_BG_3( Z_row2, A1_inv_for_gf180mcu_fd_sc_mcu7t5v0__xor2_2, A2 );
+
+        or MGM_BG_4( Z, Z_row1, Z_row2 );
+
+endmodule
+
+module gf180mcu_fd_sc_mcu7t5v0__xor2_4( A2, A1, Z );
+input A1, A2;
+output Z;
+
+        wire A2_inv_for_gf180mcu_fd_sc_mcu7t5v0__xor2_4;
+
+        not MGM_BG_0( A2_inv_for_gf180mcu_fd_sc_mcu7t5v0__xor2_4, A2 );
+
+        wire Z_row1;
+
+        and MGM_BG_1( Z_row1, A2_inv_for_gf180mcu_fd_sc_mcu7t5v0__xor2_4, A1 );
+
+        wire A1_inv_for_gf180mcu_fd_sc_mcu7t5v0__xor2_4;
+
+        not MGM_BG_2( A1_inv_for_gf180mcu_fd_sc_mcu7t5v0__xor2_4, A1 );
+
+        wire Z_row2;
+
+        and MGM_BG_3( Z_row2, A1_inv_for_gf180mcu_fd_sc_mcu7t5v0__xor2_4, A2 );
+
+        or MGM_BG_4( Z, Z_row1, Z_row2 );
+
+endmodule
+
+module gf180mcu_fd_sc_mcu7t5v0__inv_2( I, ZN );
+input I;
+output ZN;
+
+        not MGM_BG_0( ZN, I );
+
+endmodule
+
+module gf180mcu_fd_sc_mcu7t5v0__inv_4( I, ZN );
+input I;
+output ZN;
+
+        not MGM_BG_0( ZN, I );
+
+endmodule
+
+module gf180mcu_fd_sc_mcu7t5v0__addf_2( S, A, CI, B, CO );
+input A, B, CI;
+output CO, S;
+
+        wire CO_row1;
+
+        and MGM_BG_0( CO_row1, A, B );
+
+        wire CO_row2;
+
+        and MGM_BG_1( CO_row2, A, CI );
+
+        wire CO_row3;
+
+        and MGM_BG_2( CO_row3, B, CI );
+
+        or MGM_BG_3( CO, CO_row1, CO_row2, CO_row3 );
+
+        wire S_row1;
+
+        and MGM_BG_4( S_row1, A, B, CI );
+
+        wire B_inv_for_gf180mcu_fd_sc_mcu7t5v0__addf_2;
+
+        not MGM_BG_5( B_inv_for_gf180mcu_fd_sc_mcu7t5v0__addf_2, B );
+
+        wire CI_inv_for_gf180mcu_fd_sc_mcu7t5v0__addf_2;
+
+        not MGM_BG_6( CI_inv_for_gf180mcu_fd_sc_mcu7t5v0__addf_2, CI );
+
+        wire S_row2;
+
+        and MGM_BG_7( S_row2, B_inv_for_gf180mcu_fd_sc_mcu7t5v0__addf_2, CI_inv_for_gf180mcu_fd_sc_mcu7t5v0__addf_2, A );
+
+        wire A_inv_for_gf180mcu_fd_sc_mcu7t5v0__addf_2;
+
+        not MGM_BG_8( A_inv_for_gf180mcu_fd_sc_mcu7t5v0__addf_2, A );
+
+        wire S_row3;
+
+        and MGM_BG_9( S_row3, A_inv_for_gf180mcu_fd_sc_mcu7t5v0__addf_2, CI_inv_for_gf180mcu_fd_sc_mcu7t5v0__addf_2, B );
+
+        wire S_row4;
+
+        and MGM_BG_10( S_row4, A_inv_for_gf180mcu_fd_sc_mcu7t5v0__addf_2, B_inv_for_gf180mcu_fd_sc_mcu7t5v0__addf_2, CI );
+
+        or MGM_BG_11( S, S_row1, S_row2, S_row3, S_row4 );
+
+endmodule
+
+module gf180mcu_fd_sc_mcu7t5v0__addf_4( S, A, CI, B, CO );
+input A, B, CI;
+output CO, S;
+
+        wire CO_row1;
+
+        and MGM_BG_0( CO_row1, A, B );
+
+        wire CO_row2;
+
+        and MGM_BG_1( CO_row2, A, CI );
+
+        wire CO_row3;
+
+        and MGM_BG_2( CO_row3, B, CI );
+
+        or MGM_BG_3( CO, CO_row1, CO_row2, CO_row3 );
+
+        wire S_row1;
+
+        and MGM_BG_4( S_row1, A, B, CI );
+
+        wire B_inv_for_gf180mcu_fd_sc_mcu7t5v0__addf_4;
+
+        not MGM_BG_5( B_inv_for_gf180mcu_fd_sc_mcu7t5v0__addf_4, B );
+
+        wire CI_inv_for_gf180mcu_fd_sc_mcu7t5v0__addf_4;
+
+        not MGM_BG_6( CI_inv_for_gf180mcu_fd_sc_mcu7t5v0__addf_4, CI );
+
+        wire S_row2;
+
+        and MGM_BG_7( S_row2, B_inv_for_gf180mcu_fd_sc_mcu7t5v0__addf_4, CI_inv_for_gf180mcu_fd_sc_mcu7t5v0__addf_4, A );
+
+        wire A_inv_for_gf180mcu_fd_sc_mcu7t5v0__addf_4;
+
+        not MGM_BG_8( A_inv_for_gf180mcu_fd_sc_mcu7t5v0__addf_4, A );
+
+        wire S_row3;
+
+        and MGM_BG_9( S_row3, A_inv_for_gf180mcu_fd_sc_mcu7t5v0__addf_4, CI_inv_for_gf180mcu_fd_sc_mcu7t5v0__addf_4, B );
+
+        wire S_row4;
+
+        and MGM_BG_10( S_row4, A_inv_for_gf180mcu_fd_sc_mcu7t5v0__addf_4, B_inv_for_gf180mcu_fd_sc_mcu7t5v0__addf_4, CI );
+
+        or MGM_BG_11( S, S_row1, S_row2, S_row3, S_row4 );
+
+endmodule
+
+module gf180mcu_fd_sc_mcu7t5v0__addh_2( CO, A, B, S );
+input A, B;
+output CO, S;
+
+        and MGM_BG_0( CO, A, B );
+
+        wire B_inv_for_gf180mcu_fd_sc_mcu7t5v0__addh_2;
+
+        not MGM_BG_1( B_inv_for_gf180mcu_fd_sc_mcu7t5v0__addh_2, B );
+
+        wire S_row1;
+
+        and MGM_BG_2( S_row1, B_inv_for_gf180mcu_fd_sc_mcu7t5v0__addh_2, A );
+
+        wire A_inv_for_gf180mcu_fd_sc_mcu7t5v0__addh_2;
+
+        not MGM_BG_3( A_inv_for_gf180mcu_fd_sc_mcu7t5v0__addh_2, A );
+
+        wire S_row2;
+
+        and MGM_BG_4( S_row2, A_inv_for_gf180mcu_fd_sc_mcu7t5v0__addh_2, B );
+
+        or MGM_BG_5( S, S_row1, S_row2 );
+
+endmodule
+
+module gf180mcu_fd_sc_mcu7t5v0__addh_4( CO, A, B, S );
+input A, B;
+output CO, S;
+
+        and MGM_BG_0( CO, A, B );
+
+        wire B_inv_for_gf180mcu_fd_sc_mcu7t5v0__addh_4;
+
+        not MGM_BG_1( B_inv_for_gf180mcu_fd_sc_mcu7t5v0__addh_4, B );
+
+        wire S_row1;
+
+        and MGM_BG_2( S_row1, B_inv_for_gf180mcu_fd_sc_mcu7t5v0__addh_4, A );
+
+        wire A_inv_for_gf180mcu_fd_sc_mcu7t5v0__addh_4;
+
+        not MGM_BG_3( A_inv_for_gf180mcu_fd_sc_mcu7t5v0__addh_4, A );
+
+        wire S_row2;
+
+        and MGM_BG_4( S_row2, A_inv_for_gf180mcu_fd_sc_mcu7t5v0__addh_4, B );
+
+        or MGM_BG_5( S, S_row1, S_row2 );
+
+endmodule
+
+module gf180mcu_fd_sc_mcu7t5v0__buf_1( I, Z );
+input I;
+output Z;
+
+        buf MGM_BG_0( Z, I );
+
+endmodule
+
+module gf180mcu_fd_sc_mcu7t5v0__buf_2( I, Z );
+input I;
+output Z;
+
+        buf MGM_BG_0( Z, I );
+
+endmodule
+
+module gf180mcu_fd_sc_mcu7t5v0__buf_4( I, Z );
+input I;
+output Z;
+
+        buf MGM_BG_0( Z, I );
+
+endmodule
+
+module gf180mcu_fd_sc_mcu7t5v0__buf_8( I, Z );
+input I;
+output Z;
+
+        buf MGM_BG_0( Z, I );
+
+endmodule
+
+module gf180mcu_fd_sc_mcu7t5v0__or2_1( A1, A2, Z );
+input A1, A2;
+output Z;
+
+        or MGM_BG_0( Z, A1, A2 );
+
+endmodule
+
+module gf180mcu_fd_sc_mcu7t5v0__or2_2( A1, A2, Z );
+input A1, A2;
+output Z;
+
+        or MGM_BG_0( Z, A1, A2 );
+
+endmodule
+
+module gf180mcu_fd_sc_mcu7t5v0__or2_4( A1, A2, Z );
+input A1, A2;
+output Z;
+
+        or MGM_BG_0( Z, A1, A2 );
+
+endmodule
+
+module gf180mcu_fd_sc_mcu7t5v0__nand2_1( A1, A2, ZN );
+input A1, A2;
+output ZN;
+
+        nand MGM_BG_0( ZN, A1, A2 );
+
+endmodule
+
+module gf180mcu_fd_sc_mcu7t5v0__nand2_2( A1, A2, ZN );
+input A1, A2;
+output ZN;
+
+        nand MGM_BG_0( ZN, A1, A2 );
+
+endmodule
+
+module gf180mcu_fd_sc_mcu7t5v0__nand2_4( A1, A2, ZN );
+input A1, A2;
+output ZN;
+
+        nand MGM_BG_0( ZN, A1, A2 );
+
+endmodule
+
+module gf180mcu_fd_sc_mcu7t5v0__nor2_1( A1, A2, ZN );
+input A1, A2;
+output ZN;
+
+        nor MGM_BG_0( ZN, A1, A2 );
+
+endmodule
+
+module gf180mcu_fd_sc_mcu7t5v0__nor2_2( A1, A2, ZN );
+input A1, A2;
+output ZN;
+
+        nor MGM_BG_0( ZN, A1, A2 );
+
+endmodule
+
+module gf180mcu_fd_sc_mcu7t5v0__nor2_4( A1, A2, ZN );
+input A1, A2;
+output ZN;
+
+        nor MGM_BG_0( ZN, A1, A2 );
+
+endmodule
+
+module gf180mcu_fd_sc_mcu7t5v0__aoi21_2( A2, ZN, A1, B );
+input A1, A2, B;
+output ZN;
+
+        wire A_row;
+
+        and MGM_BG_0( A_row, A1, A2 );
+
+        nor MGM_BG_1( ZN, A_row, B );
+
+endmodule
+
+module gf180mcu_fd_sc_mcu7t5v0__aoi21_4( A2, ZN, A1, B );
+input A1, A2, B;
+output ZN;
+
+        wire A_row;
+
+        and MGM_BG_0( A_row, A1, A2 );
+
+        nor MGM_BG_1( ZN, A_row, B );
+
+endmodule
+
+module gf180mcu_fd_sc_mcu7t5v0__oai21_1( A2, ZN, A1, B );
+input A1, A2, B;
+output ZN;
+
+        wire A_row;
+
+        or MGM_BG_0( A_row, A1, A2 );
+
+        nand MGM_BG_1( ZN, A_row, B );
+
+endmodule
+
+module gf180mcu_fd_sc_mcu7t5v0__oai21_2( A2, ZN, A1, B );
+input A1, A2, B;
+output ZN;
+
+        wire A_row;
+
+        or MGM_BG_0( A_row, A1, A2 );
+
+        nand MGM_BG_1( ZN, A_row, B );
+
+endmodule
+
+module gf180mcu_fd_sc_mcu7t5v0__oai21_4( A2, ZN, A1, B );
+input A1, A2, B;
+output ZN;
+
+        wire A_row;
+
+        or MGM_BG_0( A_row, A1, A2 );
+
+        nand MGM_BG_1( ZN, A_row, B );
+
+endmodule
@@ -2,6 +2,47 @@ from amaranth import Elaboratable, Instance, Signal
 
 
 class GF180MCUProcess(Elaboratable):
+    # Drive strengths of each cell we instantiate, weakest first, with the
+    # fanout each one is good for. Used by sizing.py
+    _cell_sizes = {
+        "gf180mcu_fd_sc_mcu7t5v0__and2_1": (("gf180mcu_fd_sc_mcu7t5v0__and2_1", 4),
+                                            ("gf180mcu_fd_sc_mcu7t5v0__and2_2", 8),
+                                            ("gf180mcu_fd_sc_mcu7t5v0__and2_4", 16)),
+        "gf180mcu_fd_sc_mcu7t5v0__or2_1": (("gf180mcu_fd_sc_mcu7t5v0__or2_1", 4),
+                                           ("gf180mcu_fd_sc_mcu7t5v0__or2_2", 8),
+                                           ("gf180mcu_fd_sc_mcu7t5v0__or2_4", 16)),
+        "gf180mcu_fd_sc_mcu7t5v0__nand2_1": (("gf180mcu_fd_sc_mcu7t5v0__nand2_1", 4),
+                                             ("gf180mcu_fd_sc_mcu7t5v0__nand2_2", 8),
+                                             ("gf180mcu_fd_sc_mcu7t5v0__nand2_4", 16)),
+        "gf180mcu_fd_sc_mcu7t5v0__nor2_1": (("gf180mcu_fd_sc_mcu7t5v0__nor2_1", 4),
+                                            ("gf180mcu_fd_sc_mcu7t5v0__nor2_2", 8),
+                                            ("gf180mcu_fd_sc_mcu7t5v0__nor2_4", 16)),
+        "gf180mcu_fd_sc_mcu7t5v0__aoi21_1": (("gf180mcu_fd_sc_mcu7t5v0__aoi21_1", 4),
+                                             ("gf180mcu_fd_sc_mcu7t5v0__aoi21_2", 8),
+                                             ("gf180mcu_fd_sc_mcu7t5v0__aoi21_4", 16)),
+        "gf180mcu_fd_sc_mcu7t5v0__oai21_1": (("gf180mcu_fd_sc_mcu7t5v0__oai21_1", 4),
+                                             ("gf180mcu_fd_sc_mcu7t5v0__oai21_2", 8),
+                                             ("gf180mcu_fd_sc_mcu7t5v0__oai21_4", 16)),
+        "gf180mcu_fd_sc_mcu7t5v0__xor2_1": (("gf180mcu_fd_sc_mcu7t5v0__xor2_1", 4),
+                                            ("gf180mcu_fd_sc_mcu7t5v0__xor2_2", 8),
+                                            ("gf180mcu_fd_sc_mcu7t5v0__xor2_4", 16)),
+        "gf180mcu_fd_sc_mcu7t5v0__inv_1": (("gf180mcu_fd_sc_mcu7t5v0__inv_1", 4),
+                                           ("gf180mcu_fd_sc_mcu7t5v0__inv_2", 8),
+                                           ("gf180mcu_fd_sc_mcu7t5v0__inv_4", 16)),
+        "gf180mcu_fd_sc_mcu7t5v0__addf_1": (("gf180mcu_fd_sc_mcu7t5v0__addf_1", 4),
+                                            ("gf180mcu_fd_sc_mcu7t5v0__addf_2", 8),
+                                            ("gf180mcu_fd_sc_mcu7t5v0__addf_4", 16)),
+        "gf180mcu_fd_sc_mcu7t5v0__addh_1": (("gf180mcu_fd_sc_mcu7t5v0__addh_1", 4),
+                                            ("gf180mcu_fd_sc_mcu7t5v0__addh_2", 8),
+                                            ("gf180mcu_fd_sc_mcu7t5v0__addh_4", 16)),
+    }
+
+    # Buffers for buffer trees, weakest first, and their input and output
+    _buffers = (("gf180mcu_fd_sc_mcu7t5v0__buf_1", 4), ("gf180mcu_fd_sc_mcu7t5v0__buf_2", 8),
+                ("gf180mcu_fd_sc_mcu7t5v0__buf_4", 16), ("gf180mcu_fd_sc_mcu7t5v0__buf_8", 32))
+    _buffer_pins = ("I", "Z")
+    _power_pins = ("VDD", "VSS")
+
     def _PoweredInstance(self, *args, **kwargs):
         if self._powered:
             kwargs.update({
@@ -20,6 +61,36 @@ class GF180MCUProcess(Elaboratable):
 
         self.m.submodules += andgate
 
+    def _generate_or(self, a, b, o):
+        orgate = self._PoweredInstance(
+            "gf180mcu_fd_sc_mcu7t5v0__or2_1",
+            i_A1=a,
+            i_A2=b,
+            o_Z=o
+        )
+
+        self.m.submodules += orgate
+
+    def _generate_nand(self, a, b, o):
+        nandgate = self._PoweredInstance(
+            "gf180mcu_fd_sc_mcu7t5v0__nand2_1",
+            i_A1=a,
+            i_A2=b,
+            o_ZN=o
+        )
+
+        self.m.submodules += nandgate
+
+    def _generate_nor(self, a, b, o):
+        norgate = self._PoweredInstance(
+            "gf180mcu_fd_sc_mcu7t5v0__nor2_1",
+            i_A1=a,
+            i_A2=b,
+            o_ZN=o
+        )
+
+        self.m.submodules += norgate
+
     def _generate_xor(self, a, b, o):
         xorgate = self._PoweredInstance(
             "gf180mcu_fd_sc_mcu7t5v0__xor2_1",
@@ -88,6 +159,32 @@ class GF180MCUProcess(Elaboratable):
         )
         self.m.submodules += inv1
 
+    # Used in adder
+    def _generate_aoi21(self, a1, a2, b1, o):
+        # 2-input AND into first input of 2-input NOR
+        a21oi = self._PoweredInstance(
+            "gf180mcu_fd_sc_mcu7t5v0__aoi21_1",
+            o_ZN=o,
+            i_A1=a1,
+            i_A2=a2,
+            i_B=b1
+        )
+
+        self.m.submodules += a21oi
+
+    # Used in adder
+    def _generate_oai21(self, a1, a2, b1, o):
+        # 2-input OR into first input of 2-input NAND
+        o21ai = self._PoweredInstance(
+            "gf180mcu_fd_sc_mcu7t5v0__oai21_1",
+            o_ZN=o,
+            i_A1=a1,
+            i_A2=a2,
+            i_B=b1
+        )
+
+        self.m.submodules += o21ai
+
     # Used in multiplier
     def _generate_ao22(self, a1, a2, b1, b2, o):
         zn = Signal()
@@ -0,0 +1,26 @@
+module gold_adder_pipelined
+#(
+    parameter BITS=64,
+    parameter LATENCY=2
+) (
+`ifdef USE_POWER_PINS
+    input VPWR,
+    input VGND,
+`endif
+    input clk,
+    input rst, // unusued, but amaranth still creates it
+    input [BITS-1:0] a,
+    input [BITS-1:0] b,
+    output [BITS-1:0] o
+);
+    reg [BITS-1:0] o_tmp[LATENCY-1:0];
+    integer i;
+
+    always @(posedge clk) begin
+	for (i = LATENCY-1; i > 0; i = i - 1)
+		o_tmp[i] = o_tmp[i-1];
+	o_tmp[0] = a + b;
+    end
+
+    assign o = o_tmp[LATENCY-1];
+endmodule
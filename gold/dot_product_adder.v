@@ -0,0 +1,29 @@
+module gold_dot_product_adder
+#(
+    parameter BITS=4,
+    parameter B_BITS=BITS,
+    parameter TERMS=2
+) (
+`ifdef USE_POWER_PINS
+    input VPWR,
+    input VGND,
+`endif
+    input [TERMS*BITS-1:0] a,
+    input [TERMS*B_BITS-1:0] b,
+    input [BITS+B_BITS+$clog2(TERMS)-1:0] c,
+    output [BITS+B_BITS+$clog2(TERMS)-1:0] o
+);
+    localparam O_BITS = BITS+B_BITS+$clog2(TERMS);
+
+    wire [O_BITS-1:0] sum [0:TERMS];
+    assign sum[0] = c;
+
+    genvar i;
+    generate
+        for (i = 0; i < TERMS; i = i + 1) begin
+            assign sum[i+1] = sum[i] + a[i*BITS +: BITS] * b[i*B_BITS +: B_BITS];
+        end
+    endgenerate
+
+    assign o = sum[TERMS];
+endmodule
@@ -1,14 +1,15 @@
 module gold_multiplier
 #(
-    parameter BITS=64
+    parameter BITS=64,
+    parameter B_BITS=BITS
 ) (
 `ifdef USE_POWER_PINS
     input VPWR,
     input VGND,
 `endif
     input [BITS-1:0] a,
-    input [BITS-1:0] b,
-    output [BITS*2-1:0] o
+    input [B_BITS-1:0] b,
+    output [BITS+B_BITS-1:0] o
 );
     assign o = a * b;
 endmodule
@@ -0,0 +1,32 @@
+module gold_multiplier_partitioned
+#(
+    parameter BITS=16,
+    parameter LANES=4
+) (
+`ifdef USE_POWER_PINS
+    input VPWR,
+    input VGND,
+`endif
+    input [BITS-1:0] a,
+    input [BITS-1:0] b,
+    input [$clog2($clog2(LANES)+1)-1:0] mode,
+    output [2*BITS-1:0] o
+);
+    localparam LEVELS = $clog2(LANES);
+
+    // The product of each mode, 2^m lanes of BITS >> m bits
+    wire [(LEVELS+1)*2*BITS-1:0] products;
+
+    genvar m, l;
+    generate
+        for (m = 0; m <= LEVELS; m = m + 1) begin
+            for (l = 0; l < (1 << m); l = l + 1) begin
+                assign products[2*BITS*m + 2*(BITS >> m)*l +: 2*(BITS >> m)] =
+                    a[(BITS >> m)*l +: (BITS >> m)] * b[(BITS >> m)*l +: (BITS >> m)];
+            end
+        end
+    endgenerate
+
+    // Modes above the number of levels select the most lanes
+    assign o = (mode > LEVELS) ? products[2*BITS*LEVELS +: 2*BITS] : products[2*BITS*mode +: 2*BITS];
+endmodule
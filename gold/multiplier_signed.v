@@ -0,0 +1,15 @@
+module gold_multiplier_signed
+#(
+    parameter BITS=64,
+    parameter B_BITS=BITS
+) (
+`ifdef USE_POWER_PINS
+    input VPWR,
+    input VGND,
+`endif
+    input signed [BITS-1:0] a,
+    input signed [B_BITS-1:0] b,
+    output signed [BITS+B_BITS-1:0] o
+);
+    assign o = a * b;
+endmodule
@@ -0,0 +1,27 @@
+module gold_multiplier_truncated
+#(
+    parameter BITS=8,
+    parameter TRUNCATE=8,
+    parameter MAX_ERROR=2
+) (
+    input [BITS-1:0] a,
+    input [BITS-1:0] b,
+    output ok
+);
+    wire [2*BITS-1:0] o;
+
+    multiplier dut (
+        .a(a),
+        .b(b),
+        .o(o)
+    );
+
+    // The product wraps, so the error is taken modulo 2^(2*BITS)
+    wire [2*BITS-1:0] exact = a * b;
+    wire signed [2*BITS-1:0] error = o - exact;
+
+    // The low TRUNCATE bits are zero, and the rest is within MAX_ERROR
+    // units of the lowest column we keep
+    assign ok = (o[TRUNCATE-1:0] == 0) &&
+                (error <= (MAX_ERROR << TRUNCATE)) && (error >= -(MAX_ERROR << TRUNCATE));
+endmodule
@@ -0,0 +1,23 @@
+module gold_multiply_accumulator
+#(
+    parameter BITS=64,
+    parameter B_BITS=BITS
+) (
+`ifdef USE_POWER_PINS
+    input VPWR,
+    input VGND,
+`endif
+    input clk,
+    input rst, // unusued, but amaranth still creates it
+    input [BITS-1:0] a,
+    input [B_BITS-1:0] b,
+    input clear,
+    output [BITS+B_BITS-1:0] o
+);
+    reg [BITS+B_BITS-1:0] accumulator;
+
+    always @(posedge clk)
+        accumulator <= (clear ? 0 : accumulator) + a * b;
+
+    assign o = accumulator;
+endmodule
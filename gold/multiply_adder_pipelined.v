@@ -1,6 +1,8 @@
 module gold_multiply_adder_pipelined
 #(
-    parameter BITS=64
+    parameter BITS=64,
+    parameter B_BITS=BITS,
+    parameter LATENCY=3
 ) (
 `ifdef USE_POWER_PINS
     input VPWR,
@@ -9,17 +11,18 @@ module gold_multiply_adder_pipelined
     input clk,
     input rst, // unusued, but amaranth still creates it
     input [BITS-1:0] a,
-    input [BITS-1:0] b,
-    input [BITS*2-1:0] c,
-    output [BITS*2-1:0] o
+    input [B_BITS-1:0] b,
+    input [BITS+B_BITS-1:0] c,
+    output [BITS+B_BITS-1:0] o
 );
-    reg [BITS*2-1:0] o_tmp[2:0];
+    reg [BITS+B_BITS-1:0] o_tmp[LATENCY-1:0];
+    integer i;
 
     always @(posedge clk) begin
-	o_tmp[2] = o_tmp[1];
-	o_tmp[1] = o_tmp[0];
+	for (i = LATENCY-1; i > 0; i = i - 1)
+		o_tmp[i] = o_tmp[i-1];
 	o_tmp[0] = (a * b) + c;
     end
 
-    assign o = o_tmp[2];
+    assign o = o_tmp[LATENCY-1];
 endmodule
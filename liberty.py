@@ -0,0 +1,255 @@
+import re
+from bisect import bisect_right
+
+
+# Liberty files are a tree of groups, eg:
+#
+# library (name) {
+#   time_unit : "1ns";
+#   cell (sky130_fd_sc_hd__a21o_1) {
+#     pin (X) {
+#       direction : output;
+#       timing () {
+#         related_pin : "A1";
+#         cell_rise (template) { index_1 ("..."); values ("...", "..."); }
+#       }
+#     }
+#   }
+# }
+_COMMENTS = re.compile(r'/\*.*?\*/|//[^\n]*|\\\r?\n', re.S)
+_TOKENS = re.compile(r'"(?:[^"\\]|\\.)*"|[(){}:;,]|[^\s(){}:;,"]+')
+
+_TIME_UNITS = {"s": 1e9, "ms": 1e6, "us": 1e3, "ns": 1.0, "ps": 1e-3, "fs": 1e-6}
+_CAP_UNITS = {"f": 1e12, "mf": 1e9, "uf": 1e6, "nf": 1e3, "pf": 1.0, "ff": 1e-3}
+
+
+class Group:
+    __slots__ = ("type", "args", "attributes", "groups")
+
+    def __init__(self, type, args):
+        self.type = type
+        self.args = args
+        self.attributes = {}
+        self.groups = []
+
+    def __repr__(self):
+        return "Group({!r}, {!r})".format(self.type, self.args)
+
+    def find(self, type):
+        return [g for g in self.groups if g.type == type]
+
+
+def _unquote(token):
+    if token.startswith('"'):
+        return token[1:-1]
+    return token
+
+
+def parse(text, cells=None):
+    # Parse Liberty text into a tree of Groups. If cells is given, cell
+    # groups for any other cell are skipped without being parsed, which
+    # makes loading a large library for a handful of cells much quicker.
+    tokens = _TOKENS.findall(_COMMENTS.sub(' ', text))
+    n = len(tokens)
+    pos = 0
+    root = Group(None, [])
+    stack = [root]
+
+    while pos < n:
+        token = tokens[pos]
+        if token == '}':
+            stack.pop()
+            pos += 1
+            continue
+        if token == ';':
+            pos += 1
+            continue
+
+        name = token
+        pos += 1
+        if tokens[pos] == ':':
+            # Simple attribute, the value runs up to the ;
+            end = pos + 1
+            while end < n and tokens[end] not in (';', '}'):
+                end += 1
+            stack[-1].attributes[name] = _unquote(" ".join(tokens[pos + 1:end]))
+            pos = end
+            continue
+
+        if tokens[pos] != '(':
+            raise ValueError("Liberty syntax error near %s %s" % (name, tokens[pos]))
+
+        # Group or complex attribute, both start with an argument list
+        end = tokens.index(')', pos)
+        args = [_unquote(t) for t in tokens[pos + 1:end] if t != ',']
+        pos = end + 1
+
+        if pos < n and tokens[pos] == '{':
+            pos += 1
+            if name == "cell" and cells is not None and args[0] not in cells:
+                depth = 1
+                while depth:
+                    if tokens[pos] == '{':
+                        depth += 1
+                    elif tokens[pos] == '}':
+                        depth -= 1
+                    pos += 1
+                continue
+            group = Group(name, args)
+            stack[-1].groups.append(group)
+            stack.append(group)
+        else:
+            stack[-1].attributes[name] = args
+
+    return root.groups
+
+
+def _floats(values):
+    # Table values are a list of quoted, comma separated strings
+    if isinstance(values, str):
+        values = [values]
+    return [[float(v) for v in row.replace(',', ' ').split()] for row in values]
+
+
+def _unit(value, units, default):
+    # "1ns", "100ps" or a complex attribute such as (1, pf)
+    if value is None:
+        return default
+    if isinstance(value, list):
+        scale, unit = value
+    else:
+        m = re.match(r'\s*([0-9.eE+-]*)\s*([A-Za-z]+)', value)
+        scale, unit = m.group(1) or 1, m.group(2)
+    return float(scale) * units[unit.lower()]
+
+
+class Table:
+    # An NLDM lookup table, indexed by input slew and output load. Points
+    # outside the table are linearly extrapolated from the nearest edge.
+    def __init__(self, group, templates, time_scale, cap_scale):
+        template = templates.get(group.args[0] if group.args else None)
+        variables = []
+        indices = []
+        for i in (1, 2):
+            index = group.attributes.get("index_%d" % i)
+            if index is None and template is not None:
+                index = template.attributes.get("index_%d" % i)
+            variable = template.attributes.get("variable_%d" % i) if template is not None else None
+            if index is None:
+                break
+            indices.append(_floats(index)[0])
+            variables.append(variable)
+
+        values = _floats(group.attributes["values"])
+
+        # Scale the indices and values to ns and pF
+        scales = []
+        for variable in variables:
+            scales.append(cap_scale if variable and "capacitance" in variable else time_scale)
+        indices = [[x * s for x in index] for (index, s) in zip(indices, scales)]
+        values = [[v * time_scale for v in row] for row in values]
+
+        self._slew_first = not variables or "capacitance" not in (variables[0] or "")
+        if len(indices) == 0:
+            self.index_1, self.index_2 = [0.0], [0.0]
+        elif len(indices) == 1:
+            self.index_1, self.index_2 = indices[0], [0.0]
+            values = [[v] for v in values[0]]
+        else:
+            self.index_1, self.index_2 = indices
+        self.values = values
+
+    @staticmethod
+    def _segment(index, x):
+        if len(index) == 1:
+            return 0, 0, 0.0
+        i = min(max(bisect_right(index, x) - 1, 0), len(index) - 2)
+        return i, i + 1, (x - index[i]) / (index[i + 1] - index[i])
+
+    def lookup(self, slew, load):
+        x, y = (slew, load) if self._slew_first else (load, slew)
+        i0, i1, fx = self._segment(self.index_1, x)
+        j0, j1, fy = self._segment(self.index_2, y)
+        v = self.values
+        v0 = v[i0][j0] + (v[i0][j1] - v[i0][j0]) * fy
+        v1 = v[i1][j0] + (v[i1][j1] - v[i1][j0]) * fy
+        return v0 + (v1 - v0) * fx
+
+
+class Arc:
+    # A combinational timing arc from related_pin to the output pin. sense
+    # is positive_unate, negative_unate or non_unate, and the tables are
+    # keyed on the output transition: "rise" or "fall".
+    __slots__ = ("related_pin", "sense", "delay", "slew")
+
+    def __init__(self, related_pin, sense, delay, slew):
+        self.related_pin = related_pin
+        self.sense = sense
+        self.delay = delay
+        self.slew = slew
+
+
+class LibertyCell:
+    def __init__(self, name, area, capacitance, arcs):
+        self.name = name
+        self.area = area
+        # Input pin capacitance in pF
+        self.capacitance = capacitance
+        # Output pin name to a list of Arcs
+        self.arcs = arcs
+
+
+class Library:
+    # The cells of one or more Liberty files, with times in ns and
+    # capacitances in pF whatever units each file uses.
+    def __init__(self):
+        self.cells = {}
+
+    @classmethod
+    def load(cls, filenames, cells=None):
+        library = cls()
+        for filename in filenames:
+            with open(filename) as f:
+                library.add(f.read(), cells)
+        return library
+
+    def add(self, text, cells=None):
+        for lib in parse(text, cells):
+            time_scale = _unit(lib.attributes.get("time_unit"), _TIME_UNITS, 1.0)
+            cap_scale = _unit(lib.attributes.get("capacitive_load_unit"), _CAP_UNITS, 1.0)
+            templates = {g.args[0]: g for g in lib.groups if g.type.endswith("_template") and g.args}
+            for cell in lib.find("cell"):
+                self.cells[cell.args[0]] = self._cell(cell, templates, time_scale, cap_scale)
+
+    def _cell(self, group, templates, time_scale, cap_scale):
+        capacitance = {}
+        arcs = {}
+        for pin in group.find("pin"):
+            direction = pin.attributes.get("direction")
+            for name in pin.args:
+                if direction == "input":
+                    capacitance[name] = float(pin.attributes.get("capacitance", 0)) * cap_scale
+                elif direction == "output":
+                    arcs[name] = []
+
+            if direction != "output":
+                continue
+
+            for timing in pin.find("timing"):
+                if timing.attributes.get("timing_type", "combinational") != "combinational":
+                    continue
+                tables = {g.type: Table(g, templates, time_scale, cap_scale) for g in timing.groups
+                          if g.type in ("cell_rise", "cell_fall", "rise_transition", "fall_transition")}
+                if "cell_rise" not in tables and "cell_fall" not in tables:
+                    continue
+                delay = {"rise": tables.get("cell_rise", tables.get("cell_fall")),
+                         "fall": tables.get("cell_fall", tables.get("cell_rise"))}
+                slew = {"rise": tables.get("rise_transition", tables.get("fall_transition")),
+                        "fall": tables.get("fall_transition", tables.get("rise_transition"))}
+                sense = timing.attributes.get("timing_sense", "non_unate")
+                for related_pin in timing.attributes.get("related_pin", "").split():
+                    for name in pin.args:
+                        arcs[name].append(Arc(related_pin, sense, delay, slew))
+
+        area = float(group.attributes.get("area", 0))
+        return LibertyCell(group.args[0], area, capacitance, arcs)
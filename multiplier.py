@@ -1,26 +1,42 @@
+import io
 import sys
+import random
 import math
+import inspect
 import argparse
+import itertools
+import functools
+import numpy as np
 
 from amaranth import Elaboratable, Module, Signal, Cat, Const
-from amaranth.back import verilog
 
-from sky130hd.process import SKY130HDProcess
-from asap7.process import ASAP7Process
-from gf180mcu.process import GF180MCUProcess
-from none.process import NoneProcess
+from cache import VerilogCache
+from structural import write_verilog
+from qor import liberty_report, write_report
+from netlist import Netlist
+from sizing import size_netlist
+from pipeline import pipeline_netlist
+from simulator import NetlistSimulator
 
-from adder import BrentKung, KoggeStone, HanCarlson, Inferred
+from adder import HybridAdder, get_process, get_algorithm
+from compressor import Columns, UNIT_DELAYS, CELL_LEVELS, adder_arrival
 
 
 class Multiplier(Elaboratable):
     def __init__(self, adder, bits=64, multiply_add=False, register_input=False,
-                 register_middle=False, register_output=False, powered=False):
+                 register_middle=False, register_output=False, powered=False, timing_driven=False,
+                 signed=False, b_bits=None, truncate=0, compensation="constant", lanes=1, final_adder=None,
+                 fold_constants=True):
+        # a is bits wide and b is b_bits wide, b_bits defaults to bits
+        if b_bits is None:
+            b_bits = bits
+        product_bits = bits + b_bits
+
         self.a = Signal(bits)
-        self.b = Signal(bits)
+        self.b = Signal(b_bits)
         if multiply_add:
-            self.c = Signal(bits * 2)
-        self.o = Signal(bits * 2)
+            self.c = Signal(product_bits)
+        self.o = Signal(product_bits)
 
         if powered:
             self._powered = True
@@ -30,26 +46,259 @@ class Multiplier(Elaboratable):
             self._powered = False
 
         self._adder = adder
+        # Optionally an adder class that takes the arrival time of each bit
+        # (eg HybridAdder) for the final addition
+        self._final_adder = final_adder
         self._bits = bits
+        self._b_bits = b_bits
+        self._product_bits = product_bits
         self._multiply_add = multiply_add
         self._register_input = register_input
         self._register_middle = register_middle
         self._register_output = register_output
+        self._timing_driven = timing_driven
+        # Signed (two's complement) a and b
+        self._signed = signed
+
+        # Truncated multipliers drop the partial products in the columns
+        # below truncate, and add a compensation for them: the constant
+        # expected value of what was dropped, or (variable) the bits of the
+        # top dropped column moved up a column plus a smaller constant. The
+        # low truncate bits of the output are zero.
+        if truncate < 0 or truncate >= product_bits:
+            raise ValueError("Truncation must be less than the product width")
+        if compensation not in ("none", "constant", "variable"):
+            raise ValueError("Unknown compensation")
+        self._truncate = truncate
+        self._compensation = compensation
+
+        # Partitioned (SIMD) multipliers split a, b and o into up to lanes
+        # lanes. mode selects 2^mode lanes, each multiplying its bits of a
+        # and b into its (twice as wide) bits of o. The lane boundaries of
+        # level k are the bit offsets that are odd multiples of bits >> k,
+        # they are split when mode >= k.
+        if lanes < 1 or lanes & (lanes - 1):
+            raise ValueError("Lanes must be a power of two")
+        if lanes > 1:
+            if bits % (2 * lanes):
+                raise ValueError("Lanes must be an even number of bits wide")
+            if b_bits != bits or signed or truncate or multiply_add:
+                raise ValueError("Partitioned multipliers must be square, unsigned, untruncated and can't "
+                                 "multiply add")
+            self.mode = Signal(range(lanes.bit_length()))
+        self._lanes = lanes
+        self._lane_levels = lanes.bit_length() - 1
+
+        # Sum the constant bits of the partial products into one constant
+        # row before reduction, and don't spend adders on constants
+        self._constant_folding = fold_constants
+
+        # Estimated arrival time of partial product bits in unit delays,
+        # by id(). Bits that aren't in here (inputs, constants) arrive at 0.
+        self._delays = UNIT_DELAYS
+        self._arrival = {}
+
+        # Depth in cells of the outputs of the reduction adders, by id().
+        # Other bits are as deep as their arrival time in gates.
+        self._levels = {}
+
+        # Probability of partial product bits being one, by id(). Bits that
+        # aren't in here are one half the time.
+        self._one_probability = {}
+
+        # Prefix of the names of submodules partial product generation
+        # creates, DotProduct gives each term its own
+        self._prefix = ""
 
         # Optionally register inputs. Partial product generation
         # reads from these
         self.a_registered = Signal(bits, reset_less=True)
-        self.b_registered = Signal(bits, reset_less=True)
+        self.b_registered = Signal(b_bits, reset_less=True)
         if multiply_add:
-            self.c_registered = Signal(bits * 2, reset_less=True)
+            self.c_registered = Signal(product_bits, reset_less=True)
+        if lanes > 1:
+            self.mode_registered = Signal(len(self.mode), reset_less=True)
+
+        # Per lane copies of the operands, see _lane_operand()
+        self._lane_enables = None
+        self._lane_operands = {}
 
         # partial product generation writes to this and partial product
         # accumulation reads from this
-        self._partial_products = [[] for i in range(bits * 2)]
+        self._partial_products = [[] for i in range(product_bits)]
 
         # partial product accumulation writes to these
-        self._final_a = Signal(bits * 2)
-        self._final_b = Signal(bits * 2)
+        self._final_a = Signal(product_bits)
+        self._final_b = Signal(product_bits)
+
+    def _bit_arrival(self, bit):
+        return self._arrival.get(id(bit), 0)
+
+    def _bit_level(self, bit):
+        return self._levels.get(id(bit), self._bit_arrival(bit) / self._delays["gate"])
+
+    def _adder_arrival(self, kind, inputs, outputs):
+        # Note when the outputs of an adder in the reduction arrive, and how
+        # deep in cells they are
+        arrivals = adder_arrival(self._delays, kind, [self._bit_arrival(bit) for bit in inputs])
+        levels = adder_arrival(CELL_LEVELS, kind, [self._bit_level(bit) for bit in inputs])
+        for (o, arrival, level) in zip(outputs, arrivals, levels):
+            self._arrival[id(o)] = arrival
+            self._levels[id(o)] = level
+
+    def _bit_probability(self, bit):
+        if isinstance(bit, Const):
+            return bit.value
+        return self._one_probability.get(id(bit), 0.5)
+
+    def _truncate_partial_products(self):
+        # Drop the columns below the cut and compensate for their expected
+        # value, rounded to the weight of the lowest column we keep
+        cut = self._truncate
+        columns = self._partial_products
+        expected = sum(self._bit_probability(bit) * 2 ** offset for offset in range(cut) for bit in columns[offset])
+
+        if self._compensation == "variable":
+            # The bits of the top dropped column take the place of the
+            # carries out of the dropped columns, which they are
+            # correlated with
+            moved = columns[cut - 1]
+            columns[cut].extend(moved)
+            expected -= sum(self._bit_probability(bit) for bit in moved) * 2 ** cut
+
+        for offset in range(cut):
+            columns[offset] = []
+
+        if self._compensation != "none":
+            constant = round(expected / 2 ** cut) % 2 ** (self._product_bits - cut)
+            for i in range(self._product_bits - cut):
+                if (constant >> i) & 1:
+                    columns[cut + i].append(Const(1))
+
+    def _lane_level(self, i, j):
+        # The lowest level of the lane boundaries between bit offsets i and
+        # j of an operand, or None if they are always in the same lane
+        for k in range(1, self._lane_levels + 1):
+            width = self._bits >> k
+            if i // width != j // width:
+                return k
+        return None
+
+    def _gen_lane_enables(self):
+        # One bit per level, set when the lane boundaries of that level
+        # are joined (mode < level). Compare mode with each level from the
+        # most significant bit down.
+        mode = [self.mode_registered[i] for i in range(len(self.mode_registered))]
+        notmode = [Signal() for bit in mode]
+        for (bit, notbit) in zip(mode, notmode):
+            self._generate_inv(bit, notbit)
+
+        def gate(generate, a, b):
+            if a is None:
+                return b
+            o = Signal()
+            generate(a, b, o)
+            return o
+
+        self._lane_enables = {}
+        for k in range(1, self._lane_levels + 1):
+            less = equal = None
+            for i in reversed(range(len(mode))):
+                if (k >> i) & 1:
+                    less = gate(self._generate_or, less, gate(self._generate_and, equal, notmode[i]))
+                    equal = gate(self._generate_and, equal, mode[i])
+                else:
+                    equal = gate(self._generate_and, equal, notmode[i])
+            self._lane_enables[k] = less
+
+    def _lane_operand(self, value, offset):
+        # The bits of an operand (a_registered or b_registered) in the same
+        # lane as bit offset, and zeros elsewhere, as a list. Built once
+        # for each of the narrowest lanes, the bits of the other lanes are
+        # gated by the enables of the boundaries in between.
+        width = self._bits >> self._lane_levels
+        key = (id(value), offset // width)
+        if key in self._lane_operands:
+            return self._lane_operands[key][1]
+
+        if self._lane_enables is None:
+            self._gen_lane_enables()
+
+        # The enables are an inverter and a couple of gates deep
+        arrival = 3 * self._delays["gate"]
+
+        bits = []
+        for i in range(len(value)):
+            level = self._lane_level(i, offset)
+            if level is None:
+                bits.append(value[i])
+            else:
+                o = Signal()
+                self._generate_and(value[i], self._lane_enables[level], o)
+                self._arrival[id(o)] = arrival + self._delays["gate"]
+                bits.append(o)
+
+        # Keep a reference to value so its id isn't reused
+        self._lane_operands[key] = (value, bits)
+        return bits
+
+    def _fold_constants(self):
+        # Sum the constant bits of every column into one constant, so no
+        # column has more than one of them
+        constant = 0
+        for (offset, column) in enumerate(self._partial_products):
+            constant += sum(bit.value << offset for bit in column if isinstance(bit, Const))
+            column[:] = [bit for bit in column if not isinstance(bit, Const)]
+
+        constant %= 1 << self._product_bits
+        for i in range(self._product_bits):
+            if (constant >> i) & 1:
+                self._partial_products[i].append(Const(1))
+
+    def _reduce_adder(self, kind, inputs, name):
+        # A full or half adder in the reduction, returns its sum and carry.
+        # With constant folding the only constant left in a column is a
+        # single one, and a + 1 needs no half adder: its sum is ~a and its
+        # carry is a itself.
+        if kind == "half_adder" and self._constant_folding and any(isinstance(bit, Const) for bit in inputs):
+            a, = [bit for bit in inputs if not isinstance(bit, Const)]
+            s = Signal()
+            self._generate_inv(a, s)
+            self._arrival[id(s)] = self._bit_arrival(a) + self._delays["gate"]
+            self._levels[id(s)] = self._bit_level(a) + 1
+            return s, a
+
+        s = Signal()
+        c = Signal()
+        if kind == "full_adder":
+            self._generate_full_adder(*inputs, s, c, name)
+        else:
+            self._generate_half_adder(*inputs, s, c, name)
+        self._adder_arrival(kind, inputs, (s, c))
+        return s, c
+
+    def _final_rows(self, columns):
+        # The two rows left after reduction go to the final adder. Note how
+        # deep in cells each of its columns is, and how many of the
+        # low columns are down to one bit and don't need adding.
+        self._final_single = 0
+        while self._final_single < len(columns) and columns.height(self._final_single) < 2:
+            self._final_single += 1
+
+        columns.pad(2, Const(0))
+
+        self._final_a = Cat(columns[n][0] for n in range(len(columns)))
+        self._final_b = Cat(columns[n][1] for n in range(len(columns)))
+        self._final_arrival = [max(self._bit_level(columns[n][0]), self._bit_level(columns[n][1]))
+                               for n in range(len(columns))]
+
+    def _booth_operands(self):
+        # Booth encoding works through the multiplier a few bits at a time,
+        # so we encode the narrower operand. Returns the multiplier, its
+        # width, the multiplicand and its width.
+        if self._b_bits < self._bits:
+            return self.b_registered, self._b_bits, self.a_registered, self._bits
+        return self.a_registered, self._bits, self.b_registered, self._b_bits
 
     def elaborate(self, platform):
         self.m = Module()
@@ -60,24 +309,38 @@ class Multiplier(Elaboratable):
             self.m.d.sync += self.b_registered.eq(self.b)
             if self._multiply_add:
                 self.m.d.sync += self.c_registered.eq(self.c)
+            if self._lanes > 1:
+                self.m.d.sync += self.mode_registered.eq(self.mode)
         else:
             self.m.d.comb += self.a_registered.eq(self.a),
             self.m.d.comb += self.b_registered.eq(self.b),
             if self._multiply_add:
                 self.m.d.comb += self.c_registered.eq(self.c)
+            if self._lanes > 1:
+                self.m.d.comb += self.mode_registered.eq(self.mode)
+
+        # Optionally register between partial product accumulation and
+        # final addition. A MultiplyAccumulator feeds these back into the
+        # partial products.
+        self._final_a_registered = Signal(self._product_bits, reset_less=True)
+        self._final_b_registered = Signal(self._product_bits, reset_less=True)
 
         self._gen_partial_products()
 
         if self._multiply_add:
-            for i in range(self._bits * 2):
+            for i in range(self._product_bits):
                 self._partial_products[i].append(self.c_registered[i])
 
+        if self._truncate:
+            self._truncate_partial_products()
+
+        if self._constant_folding:
+            self._fold_constants()
+
         self._acc_partial_products()
 
-        # Optionally register between partial product accumulation and
-        # final addition.
-        final_a_registered = Signal(self._bits * 2, reset_less=True)
-        final_b_registered = Signal(self._bits * 2, reset_less=True)
+        final_a_registered = self._final_a_registered
+        final_b_registered = self._final_b_registered
         if self._register_middle:
             self.m.d.sync += final_a_registered.eq(self._final_a)
             self.m.d.sync += final_b_registered.eq(self._final_b)
@@ -85,17 +348,27 @@ class Multiplier(Elaboratable):
             self.m.d.comb += final_a_registered.eq(self._final_a)
             self.m.d.comb += final_b_registered.eq(self._final_b)
 
-        # Final addition
-        result = Signal(self._bits * 2)
-        self.m.submodules.final_adder = adder = self._adder(bits=self._bits * 2)
+        # Final addition, of the columns we didn't truncate. The low columns
+        # with one bit left go straight through.
+        result = Signal(self._product_bits)
+        cut = self._truncate
+        start = min(max(cut, self._final_single), self._product_bits - 1)
+        bits = self._product_bits - start
+        if self._final_adder:
+            # Registered rows all arrive at once
+            arrival = [0] * bits if self._register_middle else self._final_arrival[start:self._product_bits]
+            adder = self._final_adder(bits=bits, arrival=arrival)
+        else:
+            adder = self._adder(bits=bits)
+        self.m.submodules.final_adder = adder
         self.m.d.comb += [
-            adder.a.eq(final_a_registered),
-            adder.b.eq(final_b_registered),
-            result.eq(adder.o),
+            adder.a.eq(final_a_registered[start:]),
+            adder.b.eq(final_b_registered[start:]),
+            result.eq(Cat(Const(0, cut), final_a_registered[cut:start], adder.o)),
         ]
 
         # Optionally register output
-        result_registered = Signal(self._bits * 2, reset_less=True)
+        result_registered = Signal(self._product_bits, reset_less=True)
         if self._register_output:
             self.m.d.sync += result_registered.eq(result)
         else:
@@ -106,6 +379,118 @@ class Multiplier(Elaboratable):
         return self.m
 
 
+class DotProduct(Multiplier):
+    # The sum of terms products, a[i] * b[i], plus c with multiply_add. The
+    # partial products of every term go into a single reduction and final
+    # adder, rather than a multiplier each and an adder tree. a and b hold
+    # the operands of each term packed together, term 0 in the low bits.
+    # The output has enough bits above the product that the sum of the
+    # products can't overflow, and c is as wide as the output.
+    def __init__(self, adder, terms=2, bits=64, b_bits=None, multiply_add=False, **kwargs):
+        if terms < 1:
+            raise ValueError("A dot product needs at least one term")
+        super().__init__(adder, bits=bits, b_bits=b_bits, multiply_add=multiply_add, **kwargs)
+
+        self._terms = terms
+        self._product_bits = self._product_bits + (terms - 1).bit_length()
+        product_bits = self._product_bits
+
+        self.a = Signal(terms * self._bits)
+        self.b = Signal(terms * self._b_bits)
+        if multiply_add:
+            self.c = Signal(product_bits)
+        self.o = Signal(product_bits)
+
+        self.a_registered = Signal(terms * self._bits, reset_less=True)
+        self.b_registered = Signal(terms * self._b_bits, reset_less=True)
+        if multiply_add:
+            self.c_registered = Signal(product_bits, reset_less=True)
+
+        self._partial_products = [[] for i in range(product_bits)]
+        self._final_a = Signal(product_bits)
+        self._final_b = Signal(product_bits)
+
+    def _gen_partial_products(self):
+        # Generate the partial products of each term in turn, pointing the
+        # generator at its operands, and gather them into one set of
+        # columns
+        a_registered, b_registered = self.a_registered, self.b_registered
+        columns = [[] for i in range(self._product_bits)]
+
+        for term in range(self._terms):
+            self.a_registered = a_registered[term * self._bits:(term + 1) * self._bits]
+            self.b_registered = b_registered[term * self._b_bits:(term + 1) * self._b_bits]
+            self._partial_products = [[] for i in range(self._product_bits)]
+            self._prefix = "term%d_" % term
+            super()._gen_partial_products()
+            for (column, bits) in zip(columns, self._partial_products):
+                column.extend(bits)
+
+        self.a_registered, self.b_registered = a_registered, b_registered
+        self._partial_products = columns
+
+
+class MultiplyAccumulator(Multiplier):
+    # Accumulates a * b (plus c with multiply_add) every cycle. The
+    # accumulator is kept in carry save form in the registers between the
+    # reduction and the final adder (so the middle is always registered),
+    # and both of its rows go back into the reduction with the next partial
+    # products. The final adder only resolves the accumulator for o, it is
+    # off the loop. clear starts a new sum, the accumulator takes just this
+    # cycle's product.
+    def __init__(self, adder, bits=64, truncate=0, lanes=1, **kwargs):
+        if truncate or lanes > 1:
+            raise ValueError("A multiply accumulator can't be truncated or partitioned")
+        super().__init__(adder, bits=bits, register_middle=True, **kwargs)
+
+        self.clear = Signal()
+        self.clear_registered = Signal(reset_less=True)
+
+    def _gen_partial_products(self):
+        super()._gen_partial_products()
+
+        if self._register_input:
+            self.m.d.sync += self.clear_registered.eq(self.clear)
+        else:
+            self.m.d.comb += self.clear_registered.eq(self.clear)
+
+        notclear = Signal()
+        self._generate_inv(self.clear_registered, notclear)
+
+        for (name, accumulator) in (("a", self._final_a_registered), ("b", self._final_b_registered)):
+            for i in range(self._product_bits):
+                o = Signal(name="accumulator_%s%d" % (name, i))
+                self._generate_and(accumulator[i], notclear, o)
+                self._arrival[id(o)] = self._delays["gate"]
+                self._partial_products[i].append(o)
+
+
+@functools.lru_cache(maxsize=None)
+def _booth_probability(block, mand, invert):
+    # Probability of a radix 4 booth mux output being one. block and mand
+    # give the input bit each of their bits comes from, as a number, or
+    # None for a zero. Input bits are one half the time.
+    inputs = sorted(set(bit for bit in block + mand if bit is not None))
+    ones = 0
+    for values in itertools.product((0, 1), repeat=len(inputs)):
+        value = dict(zip(inputs, values))
+        b = [value.get(bit, 0) for bit in block]
+        m = [value.get(bit, 0) for bit in mand]
+        magnitude = abs(b[0] + b[1] - 2 * b[2])
+        ones += ((m[0] & (magnitude == 2)) | (m[1] & (magnitude == 1))) ^ b[2] ^ invert
+    return ones / 2 ** len(inputs)
+
+
+def _source_pattern(*groups):
+    # Renumber the input bits of some groups of bits in the order they
+    # first appear, so equivalent patterns share a cache entry
+    order = []
+    for bit in itertools.chain(*groups):
+        if bit is not None and bit not in order:
+            order.append(bit)
+    return tuple(tuple(None if bit is None else order.index(bit) for bit in group) for group in groups)
+
+
 class BoothRadix4(Elaboratable):
     def _generate_booth_encoder(self, block, sign, sel):
         # This is the standard booth encoder. We output a sign bit
@@ -131,6 +516,10 @@ class BoothRadix4(Elaboratable):
         sel_0 = Signal()
         sel_1 = Signal()
 
+        # sel[0] is two gates deep, an inverter and an ao33
+        gate = self._delays["gate"]
+        self._arrival[id(sel)] = 2 * gate
+
         # sel[0]:
         # 011 | 100
         try:
@@ -145,6 +534,7 @@ class BoothRadix4(Elaboratable):
                 t = Signal()
                 self._generate_and(block[2], notblock[1], t)
                 self._generate_ao32(notblock[2], block[1], block[0], t, notblock[0], sel_0)
+                self._arrival[id(sel)] = 3 * gate
 
         # sel[1]:
         # ?01 | ?10
@@ -158,69 +548,451 @@ class BoothRadix4(Elaboratable):
         self._generate_ao22(multiplicand[0], sel[0], multiplicand[1], sel[1], t)
         self._generate_xor(t, sign, o)
 
+    def _gen_signed_partial_products(self):
+        # Signed operands don't need zeros above the multiplier, so there
+        # is no extra row. Each row is (x ^ sign) + sign where x is a
+        # signed multiple of the multiplicand. Its sign extension is taken
+        # care of by inverting the top bit of the row and adding a
+        # constant.
+        product_bits = self._product_bits
+        self._partial_products = [[] for i in range(product_bits)]
+
+        def add(offset, bit):
+            # Bits above the product are dropped
+            if offset < product_bits:
+                self._partial_products[offset].append(bit)
+
+        a, a_bits, b, b_bits = self._booth_operands()
+        multiplier = Signal(a_bits + 2)
+        multiplicand = Signal(b_bits + 2)
+
+        # Add a zero in the LSB of the multiplier and multiplicand, and
+        # sign extend them
+        self.m.d.comb += [
+            multiplier.eq(Cat(Const(0), a, a[a_bits - 1])),
+            multiplicand.eq(Cat(Const(0), b, b[b_bits - 1])),
+        ]
+
+        # Where each of their bits come from, for _booth_probability
+        multiplier_source = [None] + list(range(a_bits)) + [a_bits - 1]
+        multiplicand_source = [None] + list(range(a_bits, a_bits + b_bits)) + [a_bits + b_bits - 1]
+
+        constant = 0
+
+        # Step through the multiplier 2 bits at a time
+        for off_b in range(0, a_bits, 2):
+            # ...selecting a block of three bits at a time
+            block = Signal(3, name="booth_block%d" % off_b)
+            self.m.d.comb += block.eq(multiplier[off_b:off_b + 3])
+
+            sign = Signal(name="booth_block%d_sign" % off_b)
+            sel = Signal(2, name="booth_block%d_sel" % off_b)
+            self._generate_booth_encoder(block, sign, sel)
+
+            notsign = Signal()
+            self._generate_inv(sign, notsign)
+            self._arrival[id(notsign)] = self._delays["gate"]
+
+            # Step through the multiplicand 1 bit at a time
+            for off_m in range(b_bits + 1):
+                # ...selecting 2 bits at a time
+                mand = Signal(2, name="booth_block%d_mand%d" % (off_b, off_m))
+                self.m.d.comb += mand.eq(multiplicand[off_m:off_m + 2])
+
+                o = Signal(name="booth_b%d_m%d" % (off_b, off_m))
+                add(off_b + off_m, o)
+
+                # The top bit of the row is inverted
+                self._generate_booth_mux(mand, sel, notsign if off_m == b_bits else sign, o)
+                self._arrival[id(o)] = self._arrival[id(sel)] + 2 * self._delays["gate"]
+                self._one_probability[id(o)] = _booth_probability(
+                    *_source_pattern(multiplier_source[off_b:off_b + 3], multiplicand_source[off_m:off_m + 2]),
+                    off_m == b_bits)
+
+            add(off_b, sign)
+            constant -= 1 << (off_b + b_bits)
+
+        constant %= 1 << product_bits
+        for i in range(product_bits):
+            if (constant >> i) & 1:
+                add(i, Const(1))
+
     def _gen_partial_products(self):
+        if self._signed:
+            self._gen_signed_partial_products()
+            return
+
         # We write one bit above the final product but never use it
-        self._partial_products = [[] for i in range((self._bits) * 2 + 1)]
+        self._partial_products = [[] for i in range(self._product_bits + 1)]
 
-        multiplier = Signal(self._bits + 3)
-        multiplicand = Signal(self._bits + 2)
+        def add(offset, bit):
+            # Bits above that are dropped
+            if offset < len(self._partial_products):
+                self._partial_products[offset].append(bit)
+
+        a, a_bits, b, b_bits = self._booth_operands()
+        multiplier = Signal(a_bits + 3)
+        multiplicand = Signal(b_bits + 2)
 
         # Add a zero in the LSB of the multiplier and multiplicand
         self.m.d.comb += [
-            multiplier.eq(Cat(Const(0), self.a_registered, Const(0), Const(0))),
-            multiplicand.eq(Cat(Const(0), self.b_registered)),
+            multiplier.eq(Cat(Const(0), a, Const(0), Const(0))),
+            multiplicand.eq(Cat(Const(0), b)),
         ]
 
-        last_b = self._bits
-        last_m = self._bits
+        # Where each of their bits come from, for _booth_probability
+        multiplier_source = [None] + list(range(a_bits)) + [None, None]
+        multiplicand_source = [None] + list(range(a_bits, a_bits + b_bits)) + [None]
+
+        # The last row is always positive, its block includes the zeros
+        # above the multiplier
+        last_b = a_bits - a_bits % 2
+        last_m = b_bits
+
+        # The value of the sign extension bits when every sign is zero
+        constant = 0
 
         # Step through the multiplier 2 bits at a time
-        for off_b in range(0, self._bits + 1, 2):
+        for off_b in range(0, a_bits + 1, 2):
             # ...selecting a block of three bits at a tie
             block = Signal(3, name="booth_block%d" % off_b)
-            self.m.d.comb += block.eq(multiplier[off_b:off_b + 3])
-
             sign = Signal(name="booth_block%d_sign" % off_b)
             sel = Signal(2, name="booth_block%d_sel" % off_b)
+
+            block_bits = multiplier[off_b:off_b + 3]
+            row_multiplicand = multiplicand
+            low = None
+            if self._lanes > 1:
+                # Each row only multiplies the multiplicand bits in its
+                # lane, and the bit below a split lane boundary belongs to
+                # the lane below
+                row_multiplicand = Cat(Const(0), *self._lane_operand(b, min(off_b, a_bits - 1)))
+                if 0 < off_b < a_bits:
+                    low = self._lane_operand(a, off_b)[off_b - 1]
+                    block_bits = Cat(low, multiplier[off_b + 1:off_b + 3])
+
+            self.m.d.comb += block.eq(block_bits)
             self._generate_booth_encoder(block, sign, sel)
+            if low is not None:
+                self._arrival[id(sel)] += self._bit_arrival(low)
 
             # Step through the multiplicand 1 bit at a time
-            for off_m in range(self._bits + 1):
+            for off_m in range(b_bits + 1):
                 # ...selecting 2 bits at a time
                 mand = Signal(2, name="booth_block%d_mand%d" % (off_b, off_m))
-                self.m.d.comb += mand.eq(multiplicand[off_m:off_m + 2])
+                self.m.d.comb += mand.eq(row_multiplicand[off_m:off_m + 2])
 
                 o = Signal(name="booth_b%d_m%d" % (off_b, off_m))
-                self._partial_products[off_b + off_m].append(o)
+                add(off_b + off_m, o)
 
                 self._generate_booth_mux(mand, sel, sign, o)
+                # An ao22 and an xor after the encoder
+                self._arrival[id(o)] = self._arrival[id(sel)] + 2 * self._delays["gate"]
+                self._one_probability[id(o)] = _booth_probability(
+                    *_source_pattern(multiplier_source[off_b:off_b + 3], multiplicand_source[off_m:off_m + 2]),
+                    False)
 
                 # Add sign to bit to lowest bit of row (ignoring last row)
                 if off_m == 0 and off_b != last_b:
-                    self._partial_products[off_b].append(sign)
+                    add(off_b, sign)
 
                 if off_m == last_m:
                     notsign = Signal()
                     self._generate_inv(sign, notsign)
+                    self._arrival[id(notsign)] = self._delays["gate"]
 
                     if off_b == 0:
                         # Add (notsign, sign, sign) to top bits of first row
-                        self._partial_products[off_b + off_m + 1].append(sign)
-                        self._partial_products[off_b + off_m + 2].append(sign)
-                        self._partial_products[off_b + off_m + 3].append(notsign)
+                        add(off_b + off_m + 1, sign)
+                        add(off_b + off_m + 2, sign)
+                        add(off_b + off_m + 3, notsign)
+                        constant += 1 << (off_b + off_m + 3)
                     elif off_b != last_b:
                         # Add (1, notsign) to top bits of all rows except first and last
-                        self._partial_products[off_b + off_m + 1].append(notsign)
-                        self._partial_products[off_b + off_m + 2].append(Const(1))
+                        add(off_b + off_m + 1, notsign)
+                        add(off_b + off_m + 2, Const(1))
+                        constant += 3 << (off_b + off_m + 1)
+
+        # A split lane boundary needs the positive top row of the lane
+        # below it, the top multiplier bit of that lane times its
+        # multiplicand. Its multiplicand bits are all below the boundary.
+        for off_b in range(2, a_bits, 2):
+            level = self._lane_level(off_b - 1, off_b) if self._lanes > 1 else None
+            if level is None:
+                continue
+
+            notenable = Signal(name="booth_lane%d_split" % off_b)
+            self._generate_inv(self._lane_enables[level], notenable)
+            top = Signal(name="booth_lane%d_top" % off_b)
+            self._generate_and(a[off_b - 1], notenable, top)
+
+            lane = self._lane_operand(b, off_b - 1)
+            for off_m in range(max(off_b - (a_bits >> level), 0), off_b):
+                o = Signal(name="booth_lane%d_m%d" % (off_b, off_m))
+                self._generate_and(top, lane[off_m], o)
+                self._arrival[id(o)] = self._bit_arrival(lane[off_m]) + 2 * self._delays["gate"]
+                add(off_b + off_m, o)
+
+        # The rows add up to the product plus that constant, which wraps to
+        # zero above the product of a multiplier. Wider columns (eg in a
+        # DotProduct) need it taken off.
+        constant = -constant % (1 << self._product_bits)
+        for i in range(self._product_bits):
+            if (constant >> i) & 1:
+                add(i, Const(1))
+
+
+class BoothRadix8(Elaboratable):
+    # Higher radix booth encoding. Each block of _booth_bits + 1 multiplier
+    # bits (overlapping by one) selects a multiple of the multiplicand
+    # between -2^(_booth_bits - 1) and 2^(_booth_bits - 1), so radix 8 has
+    # about a third as many partial product rows as long multiplication.
+    # The odd multiples (3x, and 5x and 7x for radix 16) are precomputed
+    # with carry propagate adders of the same class as the final adder.
+    _booth_bits = 3
+
+    def _generate_and_tree(self, inputs, o):
+        # AND of one or more bits as a tree of 2 input ands
+        inputs = list(inputs)
+        while len(inputs) > 2:
+            t = Signal()
+            self._generate_and(inputs[0], inputs[1], t)
+            inputs = inputs[2:] + [t]
+        if len(inputs) == 2:
+            self._generate_and(inputs[0], inputs[1], o)
+        else:
+            self.m.d.comb += o.eq(inputs[0])
+
+    def _generate_or_tree(self, inputs, o):
+        # OR of one or more bits as a tree of 2 input ors
+        inputs = list(inputs)
+        while len(inputs) > 2:
+            t = Signal()
+            self._generate_or(inputs[0], inputs[1], t)
+            inputs = inputs[2:] + [t]
+        if len(inputs) == 2:
+            self._generate_or(inputs[0], inputs[1], o)
+        else:
+            self.m.d.comb += o.eq(inputs[0])
+
+    def _generate_booth_encoder(self, block, sign, sel):
+        # The multiple is -2^(k-1)*block[k] + 2^(k-2)*block[k-1] + ... +
+        # block[1] + block[0]. Inverting the low bits of negative blocks
+        # gives the magnitude as z[0] + (z[k-1:1] as a number), which we
+        # decode to a one hot selector, sel[m - 1] for a magnitude of m.
+        k = self._booth_bits
+
+        # sign is just the top bit
+        self.m.d.comb += sign.eq(block[k])
+
+        z = Signal(k)
+        notz = Signal(k)
+        for i in range(k):
+            self._generate_xor(block[i], sign, z[i])
+            self._generate_inv(z[i], notz[i])
+
+        # Decode the high bits
+        high = []
+        for value in range(2 ** (k - 1)):
+            t = Signal()
+            self._generate_and_tree([z[i] if (value >> (i - 1)) & 1 else notz[i] for i in range(1, k)], t)
+            high.append(t)
+
+        # A magnitude of m is high == m with z[0] clear, or high == m - 1
+        # with z[0] set
+        for m in range(1, 2 ** (k - 1)):
+            self._generate_ao22(high[m], notz[0], high[m - 1], z[0], sel[m - 1])
+        self._generate_and(high[-1], z[0], sel[-1])
+
+    def _gen_multiples(self, multiplicand, bits, width):
+        # Multiples of the multiplicand (bits wide) from 0 to
+        # 2^(_booth_bits - 1), each a list of width bits. Even multiples
+        # are shifts, odd ones take an adder.
+        b = [multiplicand[i] for i in range(bits)]
+        if self._signed:
+            b = b + [multiplicand[bits - 1]] * (width - bits)
+        else:
+            b = b + [Const(0)] * (width - bits)
+
+        multiples = {0: [Const(0)] * width, 1: b}
+        for m in range(2, 2 ** (self._booth_bits - 1) + 1):
+            if m % 2 == 0:
+                multiples[m] = [Const(0)] + multiples[m // 2][:-1]
+                continue
+
+            adder = self._adder(bits=width)
+            self.m.submodules["%sbooth_multiple%d" % (self._prefix, m)] = adder
+
+            # m = 2^n + 1 is b + (b << n), and 7 is (b << 3) + ~b + 1. The
+            # low bits of b << 3 are zero, so the + 1 goes in its LSB.
+            n = (m - 1).bit_length() - 1
+            if m == 2 ** n + 1:
+                a = [Const(0)] * n + b[:width - n]
+                c = b
+            else:
+                a = [Const(1), Const(0), Const(0)] + b[:width - 3]
+                c = []
+                for i in range(width):
+                    if i < bits:
+                        t = Signal()
+                        self._generate_inv(b[i], t)
+                        c.append(t)
+                    elif self._signed:
+                        c.append(c[bits - 1])
+                    else:
+                        c.append(Const(1))
+
+            self.m.d.comb += [
+                adder.a.eq(Cat(*a)),
+                adder.b.eq(Cat(*c)),
+            ]
+            multiples[m] = [adder.o[i] for i in range(width)]
+
+        return multiples
+
+    def _gen_partial_products(self):
+        if self._lanes > 1:
+            raise ValueError("Partitioned multipliers need radix 4 booth or long multiplication")
+
+        k = self._booth_bits
+        product_bits = self._product_bits
+        self._partial_products = [[] for i in range(product_bits)]
+
+        def add(offset, bit):
+            # Bits above the product are dropped
+            if offset < product_bits:
+                self._partial_products[offset].append(bit)
+
+        a, a_bits, b, b_bits = self._booth_operands()
+
+        # Each row is a multiple of up to 2^(k-1) times the multiplicand
+        width = b_bits + k - 1
+        multiples = self._gen_multiples(b, b_bits, width)
+
+        gate = self._delays["gate"]
+        # A rough estimate of the depth of the adders for the odd multiples
+        multiple_arrival = {m: 0 for m in multiples}
+        for m in multiples:
+            if m % 2 == 1 and m > 1:
+                multiple_arrival[m] = (2 * math.ceil(math.log2(width)) + 2) * gate
+            elif m > 1:
+                multiple_arrival[m] = multiple_arrival[m // 2]
+
+        # Add a zero in the LSB of the multiplier. Unsigned multipliers get
+        # enough zeros above it that the top block is always positive,
+        # signed ones are sign extended.
+        if self._signed:
+            rows = (a_bits + k - 1) // k
+            multiplier = Signal(rows * k + 1)
+            self.m.d.comb += multiplier.eq(Cat(Const(0), a, a[a_bits - 1].replicate(rows * k - a_bits)))
+        else:
+            rows = a_bits // k + 1
+            multiplier = Signal(rows * k + 1)
+            self.m.d.comb += multiplier.eq(Cat(Const(0), a))
+
+        # The sign extension of the rows adds up to a constant
+        constant = 0
+
+        for row in range(rows):
+            off_b = row * k
+
+            block = Signal(k + 1, name="booth_block%d" % off_b)
+            self.m.d.comb += block.eq(multiplier[off_b:off_b + k + 1])
+
+            # The top bit of the block is the sign, blocks whose top bit is
+            # above an unsigned multiplier are positive
+            positive = off_b + k > a_bits and not self._signed
+
+            sign = Signal(name="booth_block%d_sign" % off_b)
+            sel = Signal(2 ** (k - 1), name="booth_block%d_sel" % off_b)
+            self._generate_booth_encoder(block, sign, sel)
+
+            if not positive:
+                notsign = Signal()
+                self._generate_inv(sign, notsign)
+                self._arrival[id(notsign)] = gate
+
+            # An xor, an inverter, the high bit decoder and an ao22
+            sel_arrival = (3 + math.ceil(math.log2(max(k - 1, 1)))) * gate
+
+            for off_m in range(width):
+                terms = [(sel[m - 1], multiples[m][off_m], multiple_arrival[m]) for m in range(1, 2 ** (k - 1) + 1)
+                         if not isinstance(multiples[m][off_m], Const)]
+
+                # AND each multiple with its select, in pairs
+                ands = []
+                for i in range(0, len(terms), 2):
+                    t = Signal()
+                    if i + 1 < len(terms):
+                        self._generate_ao22(terms[i][0], terms[i][1], terms[i + 1][0], terms[i + 1][1], t)
+                    else:
+                        self._generate_and(terms[i][0], terms[i][1], t)
+                    ands.append(t)
+
+                o = Signal(name="booth_b%d_m%d" % (off_b, off_m))
+                if positive:
+                    self._generate_or_tree(ands, o)
+                else:
+                    t = Signal()
+                    self._generate_or_tree(ands, t)
+                    # The top bit of a signed row is inverted
+                    self._generate_xor(t, notsign if self._signed and off_m == width - 1 else sign, o)
+                add(off_b + off_m, o)
+
+                depth = 1 + math.ceil(math.log2(len(ands))) + (0 if positive else 1)
+                self._arrival[id(o)] = max([sel_arrival] + [a for (_, _, a) in terms]) + depth * gate
+
+            if self._signed:
+                # The row is (x ^ sign) + sign, with x signed. Its top bit
+                # t is worth -t * 2^(width - 1), which is
+                # ~t * 2^(width - 1) - 2^(width - 1).
+                add(off_b, sign)
+                constant -= 1 << (off_b + width - 1)
+            elif not positive:
+                # The row is (x ^ sign) + sign - sign * 2^width, and
+                # -sign * 2^width is notsign * 2^width - 2^width
+                add(off_b, sign)
+                add(off_b + width, notsign)
+                constant -= 1 << (off_b + width)
+
+        constant %= 1 << product_bits
+        for i in range(product_bits):
+            if (constant >> i) & 1:
+                add(i, Const(1))
+
+
+class BoothRadix16(BoothRadix8):
+    _booth_bits = 4
 
 
 class LongMultiplication(Elaboratable):
     def _gen_partial_products(self):
+        constant = 0
         for off_a in range(self._bits):
-            for off_b in range(self._bits):
+            for off_b in range(self._b_bits):
                 o = Signal()
                 self._partial_products[off_a + off_b].append(o)
-                self._generate_and(self.a[off_a], self.b[off_b], o)
+                # Baugh-Wooley: the products of one sign bit and one
+                # other bit have negative weight, -x is ~x - 1
+                if self._signed and (off_a == self._bits - 1) != (off_b == self._b_bits - 1):
+                    self._generate_nand(self.a_registered[off_a], self.b_registered[off_b], o)
+                    self._one_probability[id(o)] = 0.75
+                    constant -= 1 << (off_a + off_b)
+                    self._arrival[id(o)] = self._delays["gate"]
+                else:
+                    b = self.b_registered[off_b]
+                    if self._lanes > 1:
+                        # Only the products of bits in the same lane
+                        b = self._lane_operand(self.b_registered, off_a)[off_b]
+                    self._generate_and(self.a_registered[off_a], b, o)
+                    self._one_probability[id(o)] = 0.25
+                    self._arrival[id(o)] = self._bit_arrival(b) + self._delays["gate"]
+
+        # The constants add up to 2^(m - 1) + 2^(n - 1) - 2^(m + n - 1)
+        constant %= 1 << self._product_bits
+        for i in range(self._product_bits):
+            if (constant >> i) & 1:
+                self._partial_products[i].append(Const(1))
 
 
 class Dadda(Elaboratable):
@@ -238,65 +1010,438 @@ class Dadda(Elaboratable):
         return out
 
     def _acc_partial_products(self):
-        height = max(len(x) for x in self._partial_products)
-        dadda_heights = self._calc_dadda_heights(height)
+        # Timing driven reduction feeds the earliest bits of a column into
+        # each adder, instead of the oldest, and the latest of the three
+        # bits of a full adder into its fast carry in.
+        key = self._bit_arrival if self._timing_driven else None
+        columns = Columns(self._partial_products, key)
+        dadda_heights = self._calc_dadda_heights(columns.max_height())
 
         iteration = 0
 
         # Loop until we have a depth of 2
-        while max(len(x) for x in self._partial_products) > 2:
-            for offset in range(len(self._partial_products)):
+        while columns.max_height() > 2:
+            for offset in range(len(columns)):
                 subiteration = 0
-                while len(self._partial_products[offset]) > dadda_heights[0]:
-                    s = Signal()
-                    c = Signal()
-
+                while columns.height(offset) > dadda_heights[0]:
                     # Full adder of three bits if there are 2 or more extra elements
-                    if len(self._partial_products[offset]) > (1 + dadda_heights[0]):
-                        i0 = self._partial_products[offset].pop(0)
-                        i1 = self._partial_products[offset].pop(0)
-                        i2 = self._partial_products[offset].pop(0)
+                    if columns.height(offset) > (1 + dadda_heights[0]):
+                        inputs = columns.pop(offset, 3)
 
                         name = "dadda_fa_%d_%d_%d" % (iteration, offset, subiteration)
-                        self._generate_full_adder(i0, i1, i2, s, c, name)
+                        kind = "full_adder"
 
                     # Half adder of two bits if there is 1 extra element
                     else:
-                        i0 = self._partial_products[offset].pop(0)
-                        i1 = self._partial_products[offset].pop(0)
+                        inputs = columns.pop(offset, 2)
 
                         name = "dadda_ha_%d_%d_%d" % (iteration, offset, subiteration)
-                        self._generate_half_adder(i0, i1, s, c, name)
+                        kind = "half_adder"
+
+                    s, c = self._reduce_adder(kind, inputs, name)
 
                     # result goes in the bottom of current column and carry goes in the bottom
-                    # of the next column
-                    self._partial_products[offset].append(s)
-                    # Ignore the carry out of the top bit
-                    if (offset + 1) <= (self._bits * 2):
-                        self._partial_products[offset + 1].append(c)
+                    # of the next column. The carry out of the top bit is ignored.
+                    columns.push(offset, s)
+                    columns.push(offset + 1, c)
 
                     subiteration = subiteration + 1
 
             dadda_heights.pop(0)
             iteration = iteration + 1
 
-        for offset in range(len(self._partial_products)):
-            while len(self._partial_products[offset]) < 2:
-                self._partial_products[offset].append(Const(0))
+        self._final_rows(columns)
 
-        self._final_a = Cat(self._partial_products[n][0] for n in range(len(self._partial_products)))
-        self._final_b = Cat(self._partial_products[n][1] for n in range(len(self._partial_products)))
 
+class Wallace(Elaboratable):
+    # A Wallace tree reduces every column as far as it can in each stage,
+    # each three bits go into a full adder and a pair left over into a half
+    # adder. It uses more adders than Dadda but has the same number of
+    # stages.
+    def _acc_partial_products(self):
+        key = self._bit_arrival if self._timing_driven else None
+        columns = Columns(self._partial_products, key)
 
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description='Create Verilog Multiplier')
+        iteration = 0
+
+        # Loop until we have a depth of 2
+        while columns.max_height() > 2:
+            # Everything this stage produces goes into the next stage
+            outputs = []
+            for offset in range(len(columns)):
+                bits = columns.pop(offset, columns.height(offset))
+                subiteration = 0
+                while len(bits) >= 2:
+                    if len(bits) >= 3:
+                        inputs, bits = bits[:3], bits[3:]
+
+                        name = "wallace_fa_%d_%d_%d" % (iteration, offset, subiteration)
+                        kind = "full_adder"
+                    else:
+                        inputs, bits = bits, []
+
+                        name = "wallace_ha_%d_%d_%d" % (iteration, offset, subiteration)
+                        kind = "half_adder"
+
+                    s, c = self._reduce_adder(kind, inputs, name)
+
+                    outputs.append((offset, s))
+                    outputs.append((offset + 1, c))
+
+                    subiteration = subiteration + 1
+
+                outputs.extend((offset, bit) for bit in bits)
+
+            # The carry out of the top bit is ignored
+            for (offset, bit) in outputs:
+                columns.push(offset, bit)
+
+            iteration = iteration + 1
+
+        self._final_rows(columns)
+
+
+class Compressor42(Elaboratable):
+    # A tree of 4:2 compressors. Each compressor takes four bits of a column
+    # and a carry in from the column below, and produces a sum, a carry
+    # into the next stage and a carry out into the next column of this
+    # stage. The carry out doesn't depend on the carry in, so nothing
+    # ripples along a stage. Like Dadda, each stage only reduces columns to
+    # a target height, but the targets double instead of growing by 1.5x.
+    # The regular structure lays out well on wide multipliers.
+    def _calc_compressor42_heights(self, bits):
+        d = 2
+        out = list()
+
+        while d < bits:
+            out.append(d)
+            d = 2 * d
+
+        out.reverse()
+
+        return out
+
+    def _compressor42(self, a, b, c, d, carry_in, sum_out, carry_out, cout, name):
+        if hasattr(self, "_generate_compressor42"):
+            self._generate_compressor42(a, b, c, d, carry_in, sum_out, carry_out, cout, name)
+        else:
+            # The process has no 4:2 compressor cell, use two full adders
+            t = Signal()
+            self._generate_full_adder(a, b, c, t, cout, name + "_0")
+            self._generate_full_adder(t, d, carry_in, sum_out, carry_out, name + "_1")
+
+    def _acc_partial_products(self):
+        key = self._bit_arrival if self._timing_driven else None
+        columns = Columns(self._partial_products, key)
+        heights = self._calc_compressor42_heights(columns.max_height())
+
+        iteration = 0
+
+        # Loop until we have a depth of 2
+        while columns.max_height() > 2:
+            target = heights.pop(0) if heights else 2
+
+            # Everything this stage produces goes into the next stage,
+            # except for the carry outs which go into the next column
+            outputs = [[] for n in range(len(columns) + 1)]
+            couts = []
+            for offset in range(len(columns)):
+                bits = columns.pop(offset, columns.height(offset))
+                carry_ins, couts = couts, []
+                subiteration = 0
+
+                while True:
+                    excess = len(outputs[offset]) + len(bits) + len(carry_ins) - target
+
+                    # A compressor needs four bits and a carry in, which
+                    # comes from the column below if it can
+                    if excess >= 3 and len(bits) >= 4 and (carry_ins or len(bits) >= 5):
+                        inputs, bits = bits[:4], bits[4:]
+                        if carry_ins:
+                            inputs.append(carry_ins.pop(0))
+                        else:
+                            inputs.append(bits.pop(0))
 
+                        s = Signal()
+                        c = Signal()
+                        cout = Signal()
+
+                        name = "compressor42_%d_%d_%d" % (iteration, offset, subiteration)
+                        self._compressor42(*inputs, s, c, cout, name)
+
+                        self._adder_arrival("compressor42", inputs, (s, c, cout))
+
+                        couts.append(cout)
+
+                    # Otherwise full and half adders, as in Dadda. Carry ins
+                    # are the latest bits, so they go in last.
+                    elif excess >= 1 and len(bits) + len(carry_ins) >= 2:
+                        n = 3 if excess >= 2 and len(bits) + len(carry_ins) >= 3 else 2
+                        inputs, bits = bits[:n], bits[n:]
+                        while len(inputs) < n:
+                            inputs.append(carry_ins.pop(0))
+
+                        if n == 3:
+                            name = "compressor42_fa_%d_%d_%d" % (iteration, offset, subiteration)
+                            kind = "full_adder"
+                        else:
+                            name = "compressor42_ha_%d_%d_%d" % (iteration, offset, subiteration)
+                            kind = "half_adder"
+
+                        s, c = self._reduce_adder(kind, inputs, name)
+
+                    else:
+                        break
+
+                    outputs[offset].append(s)
+                    outputs[offset + 1].append(c)
+
+                    subiteration = subiteration + 1
+
+                # Unused bits and carry ins go into the next stage
+                outputs[offset].extend(bits + carry_ins)
+
+            # The carry out of the top bit is ignored
+            for offset in range(len(columns)):
+                for bit in outputs[offset]:
+                    columns.push(offset, bit)
+
+            iteration = iteration + 1
+
+        self._final_rows(columns)
+
+
+def get_booth(radix=None):
+    if not radix or radix == 4:
+        return BoothRadix4
+    elif radix == 8:
+        return BoothRadix8
+    elif radix == 16:
+        return BoothRadix16
+    raise ValueError("Unknown booth radix")
+
+
+def get_reduction(name=None):
+    if not name or name.lower() == 'dadda':
+        return Dadda
+    elif name.lower() == 'wallace':
+        return Wallace
+    elif name.lower() == 'compressor42':
+        return Compressor42
+    raise ValueError("Unknown reduction")
+
+
+def build_multiplier(bits=32, multiply_add=False, register_input=False, register_middle=False,
+                     register_output=False, powered=False, process=None, algorithm=None, timing_driven=False,
+                     reduction=None, booth_radix=None, signed=False, b_bits=None, truncate=0,
+                     compensation="constant", terms=1, lanes=1, accumulate=False, hybrid_final_adder=False,
+                     fold_constants=True):
+    # Compose the multiplier from its command line configuration. Returns
+    # the multiplier, its ports and the name of the top level module. More
+    # than one term makes a DotProduct, accumulate a MultiplyAccumulator.
+    process = get_process(process)
+    algorithm = get_algorithm(algorithm)
+    reduction = get_reduction(reduction)
+    booth = get_booth(booth_radix)
+
+    if accumulate:
+        if terms > 1:
+            raise ValueError("A multiply accumulator has one term")
+
+        class mymultiplier(MultiplyAccumulator, booth, reduction, process):
+            pass
+        kwargs = {}
+        name = 'multiply_accumulator'
+    elif terms > 1:
+        class mymultiplier(DotProduct, booth, reduction, process):
+            pass
+        kwargs = dict(terms=terms)
+        name = 'dot_product'
+    else:
+        class mymultiplier(Multiplier, booth, reduction, process):
+            pass
+        kwargs = {}
+        name = 'multiplier'
+
+    class myadder(algorithm, process):
+        pass
+
+    final_adder = None
+    if hybrid_final_adder:
+        class myfinaladder(HybridAdder, process):
+            pass
+        final_adder = myfinaladder
+
+    # A multiply accumulator always registers the middle
+    if not accumulate:
+        kwargs['register_middle'] = register_middle
+
+    multiplier = mymultiplier(bits=bits, adder=myadder, multiply_add=multiply_add,
+                              register_input=register_input,
+                              register_output=register_output,
+                              powered=powered,
+                              timing_driven=timing_driven,
+                              signed=signed,
+                              b_bits=b_bits,
+                              truncate=truncate,
+                              compensation=compensation,
+                              lanes=lanes,
+                              final_adder=final_adder,
+                              fold_constants=fold_constants,
+                              **kwargs)
+
+    ports = [multiplier.a, multiplier.b, multiplier.o]
+    if multiply_add:
+        ports.append(multiplier.c)
+        if not accumulate:
+            name = 'dot_product_adder' if terms > 1 else 'multiply_adder'
+    if lanes > 1:
+        ports.append(multiplier.mode)
+    if accumulate:
+        ports.append(multiplier.clear)
+    if powered:
+        ports.extend([multiplier.VPWR, multiplier.VGND])
+
+    return multiplier, ports, name
+
+
+def transform_netlist(multiplier, stages=None, max_fanout=None):
+    # The netlist of a multiplier, pipelined into stages and then sized
+    # for max_fanout if we were asked to. Pipelining assumes the only
+    # registers are on the inputs and outputs.
+    netlist = Netlist.from_elaboratable(multiplier)
+    if stages is not None:
+        if multiplier._register_middle:
+            raise ValueError("Pipelining places its own registers, it can't be used with register_middle or "
+                             "accumulate")
+        pipeline_netlist(netlist, multiplier, [multiplier.o], stages)
+    if max_fanout:
+        size_netlist(netlist, multiplier, [multiplier.o], max_fanout)
+    return netlist
+
+
+def generate(config, f, cache=None):
+    # Write Verilog for a configuration of build_multiplier() arguments
+    # plus the backend to f, going through the cache if we have one
+    config = dict(config)
+    backend = config.pop('backend', None) or 'amaranth'
+    max_fanout = config.pop('max_fanout', None)
+    stages = config.pop('stages', None)
+    if backend not in ('amaranth', 'structural', 'hierarchical'):
+        raise ValueError("Unknown backend")
+    if (stages is not None or max_fanout) and backend == 'amaranth':
+        raise ValueError("Pipelining and sizing need the structural or hierarchical backend")
+
+    def build_and_write(f):
+        multiplier, ports, name = build_multiplier(**config)
+        design = multiplier
+        if stages is not None or max_fanout:
+            design = transform_netlist(multiplier, stages, max_fanout)
+        write_verilog(f, design, ports, name, backend)
+
+    if cache is None:
+        build_and_write(f)
+        return
+
+    def convert():
+        out = io.StringIO()
+        build_and_write(out)
+        return out.getvalue()
+
+    # Key the cache on every argument, so leaving out a default doesn't
+    # create a separate entry
+    arguments = inspect.signature(build_multiplier).bind(**config)
+    arguments.apply_defaults()
+    key = dict(arguments.arguments, generator='multiplier', backend=backend, max_fanout=max_fanout,
+               stages=stages)
+    f.write(cache.get_or_generate(key, convert))
+
+
+def truncation_error(config, vectors=4096):
+    # The error of a truncated multiplier against the same multiplier
+    # without truncation, in units of its lowest output column, over random
+    # operands. Returns the largest error either way and the mean error.
+    config = dict(config, register_input=False, register_middle=False, register_output=False, powered=False)
+    if config.get('accumulate'):
+        raise ValueError("Truncation error needs a combinational multiplier")
+    truncated, ports, name = build_multiplier(**config)
+    exact, ports, name = build_multiplier(**dict(config, truncate=0))
+
+    rng = random.Random(1)
+    inputs = {}
+    for port in ('a', 'b', 'c'):
+        if hasattr(truncated, port):
+            inputs[port] = np.array([rng.getrandbits(len(getattr(truncated, port))) for i in range(vectors)],
+                                    dtype=object)
+
+    o, = NetlistSimulator(truncated).evaluate([(getattr(truncated, p), v) for (p, v) in inputs.items()],
+                                              [truncated.o])
+    expected, = NetlistSimulator(exact).evaluate([(getattr(exact, p), v) for (p, v) in inputs.items()],
+                                                 [exact.o])
+
+    # The products wrap, so take the error modulo the product width
+    bits = len(truncated.o)
+    errors = [((int(x) - int(y) + 2**(bits - 1)) % 2**bits - 2**(bits - 1)) / 2**config['truncate']
+              for (x, y) in zip(o, expected)]
+    return {'max': max(abs(e) for e in errors), 'mean': sum(errors) / vectors}
+
+
+def generate_report(config, liberty=None):
+    # Cell count, area, depth and fanout report of a configuration, see
+    # qor.design_report(). With constant folding, also how many cells it
+    # removed, and for truncated multipliers how far off they are.
+    config = dict(config)
+    config.pop('backend', None)
+    max_fanout = config.pop('max_fanout', None)
+    stages = config.pop('stages', None)
+    multiplier, ports, name = build_multiplier(**config)
+    design = transform_netlist(multiplier, stages, max_fanout)
+    report = liberty_report(design, [multiplier.o], liberty, top='partial_products')
+
+    if config.get('fold_constants', True):
+        unfolded, ports, name = build_multiplier(**dict(config, fold_constants=False))
+        unfolded_design = transform_netlist(unfolded, stages, max_fanout)
+        report['constant_folding'] = {'cells_removed': len(unfolded_design.cells) - len(design.cells)}
+
+    if config.get('truncate') and not config.get('accumulate'):
+        report['truncation_error'] = truncation_error(config)
+
+    return report
+
+
+def add_arguments(parser):
+    # Command line options for the configuration generate() and
+    # generate_report() take, shared with sta.py
     parser.add_argument('--bits', type=int,
                         help='Width in bits of adder', default=32)
 
+    parser.add_argument('--b-bits', type=int,
+                        help='Width in bits of b, for rectangular multipliers (defaults to --bits)')
+
     parser.add_argument('--multiply-add', action='store_true',
                         help='Multiply add (a*b+c)')
 
+    parser.add_argument('--accumulate', action='store_true',
+                        help='Multiply accumulate, with the accumulator in carry save form. A clear input '
+                             'starts a new sum')
+
+    parser.add_argument('--terms', type=int, default=1,
+                        help='Build a dot product of this many terms, with the operands of each term packed '
+                             'into a and b')
+
+    parser.add_argument('--signed', action='store_true',
+                        help='Signed (two\'s complement) a and b')
+
+    parser.add_argument('--lanes', type=int, default=1,
+                        help='Partition the multiplier into up to this many lanes, a mode input selects '
+                             '2^mode lanes')
+
+    parser.add_argument('--truncate', type=int, default=0,
+                        help='Drop the partial products below this column, the output bits below it are zero')
+
+    parser.add_argument('--compensation', default='constant',
+                        help='Compensation for truncated partial products (constant (default), variable, none)')
+
     parser.add_argument('--register-input', action='store_true',
                         help='Add a register stage to the input')
 
@@ -314,59 +1459,72 @@ if __name__ == "__main__":
                         help='What process to build for (none (default), sky130hd, asap7, gf180mcu)')
 
     parser.add_argument('--algorithm',
-                        help='Adder algorithm (brentkung (default), koggestone, hancarlson, inferred)')
+                        help='Adder algorithm (brentkung (default), koggestone, hancarlson, sklansky, ladnerfischer, '
+                             'knowles, prefix_<l>_<f>_<t>, sparsetree, sparsetree_<n>, ling_<adder>, '
+                             'inverting_<adder>, inferred)')
+
+    parser.add_argument('--booth-radix', type=int,
+                        help='Booth encoding radix (4 (default), 8, 16)')
+
+    parser.add_argument('--reduction',
+                        help='Partial product reduction (dadda (default), wallace, compressor42)')
+
+    parser.add_argument('--hybrid-final-adder', action='store_true',
+                        help='Build the final adder to suit when each column comes out of the partial product '
+                             'reduction, instead of using --algorithm')
+
+    parser.add_argument('--timing-driven', action='store_true',
+                        help='Feed the earliest arriving bits into each adder of the partial product '
+                             'reduction')
+
+    parser.add_argument('--no-fold-constants', action='store_false', dest='fold_constants',
+                        help='Reduce the constant partial product bits like any other, instead of summing '
+                             'them into one constant row')
+
+    parser.add_argument('--max-fanout', type=int,
+                        help='Size cells and insert buffers so no net drives more than this many inputs '
+                             '(structural and hierarchical backends only)')
+
+    parser.add_argument('--stages', type=int,
+                        help='Pipeline the multiplier into this many stages of balanced delay, adding '
+                             'stages - 1 cycles of latency (structural and hierarchical backends only)')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Create Verilog Multiplier')
+
+    add_arguments(parser)
+
+    parser.add_argument('--backend',
+                        help='Verilog backend (amaranth (default), structural, hierarchical)')
 
     parser.add_argument('--output', type=argparse.FileType('w'), default=sys.stdout,
                         help='Write output to this file')
 
-    args = parser.parse_args()
+    parser.add_argument('--report', type=argparse.FileType('w'),
+                        help='Write a JSON report of cell counts, area, logic depth and fanout, plus the error '
+                             'of a truncated multiplier, to this file')
 
-    process = NoneProcess
-    if args.process:
-        if args.process == 'none':
-            process = NoneProcess
-        elif args.process == 'sky130hd':
-            process = SKY130HDProcess
-        elif args.process == 'asap7':
-            process = ASAP7Process
-        elif args.process == 'gf180mcu':
-            process = GF180MCUProcess
-        else:
-            print("Unknown process")
-            exit(1)
-
-    algorithm = BrentKung
-    if args.algorithm:
-        if args.algorithm.lower() == 'brentkung':
-            algorithm = BrentKung
-        elif args.algorithm.lower() == 'koggestone':
-            algorithm = KoggeStone
-        elif args.algorithm.lower() == 'hancarlson':
-            algorithm = HanCarlson
-        elif args.algorithm.lower() == 'inferred':
-            algorithm = Inferred
-        else:
-            print("Unknown algorithm")
-            exit(1)
+    parser.add_argument('--liberty', action='append',
+                        help='Liberty file to take cell areas from for the report (may be given more than once)')
 
-    class mymultiplier(Multiplier, BoothRadix4, Dadda, process):
-        pass
+    parser.add_argument('--cache-dir',
+                        help='Directory of the generated Verilog cache')
 
-    class myadder(algorithm, process):
-        pass
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Always generate the Verilog, bypassing the cache')
 
-    multiplier = mymultiplier(bits=args.bits, adder=myadder, multiply_add=args.multiply_add,
-                              register_input=args.register_input,
-                              register_middle=args.register_middle,
-                              register_output=args.register_output,
-                              powered=args.powered)
+    args = parser.parse_args()
 
-    ports = [multiplier.a, multiplier.b, multiplier.o]
-    name = 'multiplier'
-    if args.multiply_add:
-        ports.append(multiplier.c)
-        name = 'multiply_adder'
-    if args.powered:
-        ports.extend([multiplier.VPWR, multiplier.VGND])
+    config = {k: v for (k, v) in vars(args).items()
+              if k not in ('output', 'cache_dir', 'no_cache', 'report', 'liberty')}
+
+    cache = None if args.no_cache else VerilogCache(args.cache_dir)
+    try:
+        generate(config, args.output, cache)
+    except ValueError as e:
+        print(e)
+        exit(1)
 
-    args.output.write(verilog.convert(multiplier, ports=ports, name=name, strip_internal_attrs=True))
+    if args.report:
+        write_report(args.report, generate_report(config, args.liberty))
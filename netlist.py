@@ -0,0 +1,250 @@
+from amaranth.hdl import Fragment, Instance, Const, Signal
+
+try:
+    from amaranth.hdl._ast import Slice, Concat, Operator, Assign
+except ImportError:
+    from amaranth.hdl.ast import Slice, Operator, Assign, Cat as Concat
+
+
+# Pin names of the gates recorded by RecordingProcess and of the gates we
+# bit-blast amaranth operators into. These match the arguments of the
+# _generate_* hooks in the process modules.
+GATES = {
+    "and": (("a", "b"), ("o",)),
+    "or": (("a", "b"), ("o",)),
+    "nand": (("a", "b"), ("o",)),
+    "nor": (("a", "b"), ("o",)),
+    "xor": (("a", "b"), ("o",)),
+    "inv": (("a",), ("o",)),
+    "full_adder": (("a", "b", "carry_in"), ("sum_out", "carry_out")),
+    "half_adder": (("a", "b"), ("sum_out", "carry_out")),
+    "ao21": (("a1", "a2", "b1"), ("o",)),
+    "aoi21": (("a1", "a2", "b1"), ("o",)),
+    "oai21": (("a1", "a2", "b1"), ("o",)),
+    "ao22": (("a1", "a2", "b1", "b2"), ("o",)),
+    "ao32": (("a1", "a2", "a3", "b1", "b2"), ("o",)),
+    "ao33": (("a1", "a2", "a3", "b1", "b2", "b3"), ("o",)),
+    "oai33": (("a1", "a2", "a3", "b1", "b2", "b3"), ("o",)),
+    "dff": (("d",), ("q",)),
+}
+
+
+class Cell:
+    # kind is either one of GATES or the library cell name of an Instance.
+    # inputs and outputs map pin names to nets, path is the tuple of
+    # submodule names the cell was found in.
+    __slots__ = ("kind", "inputs", "outputs", "name", "path")
+
+    def __init__(self, kind, inputs, outputs, name=None, path=()):
+        self.kind = kind
+        self.inputs = inputs
+        self.outputs = outputs
+        self.name = name
+        self.path = path
+
+    def __repr__(self):
+        return "Cell({!r}, {!r}, {!r})".format(self.kind, self.inputs, self.outputs)
+
+
+class Netlist:
+    # A flat, bit level view of an elaborated design. Every net is an
+    # integer, nets 0 and 1 are the constants. Comb assignments between
+    # signals become aliases, everything else becomes a Cell.
+    CONST0 = 0
+    CONST1 = 1
+
+    def __init__(self):
+        self.cells = []
+        self.aliases = {}
+        self.net_names = ["1'b0", "1'b1"]
+        self.signals = []
+        self.net_bits = {}
+        self._nets = {}
+
+    @classmethod
+    def from_elaboratable(cls, elaboratable, platform=None):
+        netlist = cls()
+        netlist._add_fragment(Fragment.get(elaboratable, platform), ())
+        return netlist
+
+    def new_net(self, name=None):
+        self.net_names.append(name or "n%d" % len(self.net_names))
+        return len(self.net_names) - 1
+
+    def signal_nets(self, signal):
+        nets = self._nets.get(id(signal))
+        if nets is None:
+            if len(signal) == 1:
+                names = [signal.name]
+            else:
+                names = ["%s[%d]" % (signal.name, i) for i in range(len(signal))]
+            nets = self._nets[id(signal)] = [self.new_net(name) for name in names]
+            for (i, net) in enumerate(nets):
+                self.net_bits[net] = (signal, i)
+            self.signals.append(signal)
+        return nets
+
+    def resolve(self, net):
+        while net in self.aliases:
+            net = self.aliases[net]
+        return net
+
+    def add_cell(self, kind, inputs, outputs, name=None, path=()):
+        cell = Cell(kind, inputs, outputs, name, path)
+        self.cells.append(cell)
+        return cell
+
+    def topological_order(self, cells):
+        # Order cells so each comes after the cells driving its inputs.
+        # Registers must be left out, they break the combinational paths.
+        driver = {}
+        for (i, cell) in enumerate(cells):
+            for net in cell.outputs.values():
+                driver[self.resolve(net)] = i
+
+        users = [[] for cell in cells]
+        pending = [0] * len(cells)
+        for (i, cell) in enumerate(cells):
+            for net in cell.inputs.values():
+                j = driver.get(self.resolve(net))
+                if j is not None:
+                    users[j].append(i)
+                    pending[i] += 1
+
+        ready = [i for i in range(len(cells)) if pending[i] == 0]
+        order = []
+        while ready:
+            i = ready.pop()
+            order.append(cells[i])
+            for j in users[i]:
+                pending[j] -= 1
+                if pending[j] == 0:
+                    ready.append(j)
+
+        if len(order) != len(cells):
+            raise ValueError("Combinational loop in netlist")
+        return order
+
+    def value_nets(self, value, path=()):
+        # Bit-blast an amaranth value into a list of nets, LSB first.
+        if isinstance(value, Const):
+            return [self.CONST1 if (value.value >> i) & 1 else self.CONST0
+                    for i in range(len(value))]
+        if isinstance(value, Signal):
+            return self.signal_nets(value)
+        if isinstance(value, Slice):
+            return self.value_nets(value.value, path)[value.start:value.stop]
+        if isinstance(value, Concat):
+            nets = []
+            for part in value.parts:
+                nets.extend(self.value_nets(part, path))
+            return nets
+        if isinstance(value, Operator):
+            return self._operator_nets(value, path)
+        raise NotImplementedError("Cannot flatten {!r}".format(value))
+
+    def _gate(self, kind, *inputs, path=()):
+        input_pins, output_pins = GATES[kind]
+        outputs = [self.new_net() for pin in output_pins]
+        self.add_cell(kind, dict(zip(input_pins, inputs)), dict(zip(output_pins, outputs)),
+                      path=path)
+        return outputs
+
+    def _operator_nets(self, value, path):
+        operands = [self.value_nets(operand, path) for operand in value.operands]
+        width = len(value)
+
+        def extend(nets):
+            return (nets + [self.CONST0] * width)[:width]
+
+        if value.operator in ("u", "s"):
+            return extend(operands[0])
+        if value.operator == "~":
+            return [self._gate("inv", a, path=path)[0] for a in operands[0]]
+        if value.operator in ("&", "|", "^"):
+            kind = {"&": "and", "|": "or", "^": "xor"}[value.operator]
+            a, b = (extend(nets) for nets in operands)
+            return [self._gate(kind, x, y, path=path)[0] for (x, y) in zip(a, b)]
+        if value.operator == "+":
+            # Ripple carry, skipping adder cells for bits known to be zero
+            a, b = (extend(nets) for nets in operands)
+            carry = self.CONST0
+            out = []
+            for (x, y) in zip(a, b):
+                inputs = [n for n in (x, y, carry) if n != self.CONST0]
+                if len(inputs) == 0:
+                    s, carry = self.CONST0, self.CONST0
+                elif len(inputs) == 1:
+                    s, carry = inputs[0], self.CONST0
+                elif len(inputs) == 2:
+                    s, carry = self._gate("half_adder", *inputs, path=path)
+                else:
+                    s, carry = self._gate("full_adder", *inputs, path=path)
+                out.append(s)
+            return out
+        raise NotImplementedError("Cannot flatten operator {!r}".format(value.operator))
+
+    def _add_assign(self, stmt, domain, path):
+        if not isinstance(stmt, Assign):
+            raise NotImplementedError("Cannot flatten statement {!r}".format(stmt))
+        lhs = self.value_nets(stmt.lhs, path)
+        rhs = self.value_nets(stmt.rhs, path)
+        rhs = (rhs + [self.CONST0] * len(lhs))[:len(lhs)]
+        for (target, source) in zip(lhs, rhs):
+            if domain == "comb":
+                self.aliases[target] = source
+            else:
+                self.add_cell("dff", dict(d=source), dict(q=target), path=path)
+
+    def _statements(self, fragment):
+        # Older amaranth keeps a single list of statements, and has no
+        # fragment origins to find the gates a process recorded through
+        statements = fragment.statements
+        if not isinstance(statements, dict):
+            raise NotImplementedError("Flattening a netlist needs amaranth 0.5 or later")
+        for domain, stmts in statements.items():
+            for stmt in stmts:
+                yield domain, stmt
+
+    def _add_fragment(self, fragment, path, name=None):
+        # Instances are cells of the fragment that contains them rather than
+        # a level of hierarchy of their own
+        if isinstance(fragment, Instance):
+            ports = getattr(fragment, "named_ports", None) or fragment.ports
+            inputs = {}
+            outputs = {}
+            for pin, (value, direction) in ports.items():
+                nets = self.value_nets(value, path)
+                assert len(nets) == 1
+                if direction == "o":
+                    outputs[pin] = nets[0]
+                else:
+                    inputs[pin] = nets[0]
+            self.add_cell(fragment.type, inputs, outputs, name, path)
+            return
+
+        for domain, stmt in self._statements(fragment):
+            self._add_assign(stmt, domain, path)
+
+        # Gates recorded by RecordingProcess while elaborating this fragment
+        for origin in getattr(fragment, "origins", None) or ():
+            recorded = getattr(origin, "_recorded_gates", None)
+            if recorded is None or not any(o is origin._recorded_module for o in fragment.origins):
+                continue
+            for (kind, inputs, outputs, name) in recorded:
+                input_nets = {}
+                for pin, value in inputs.items():
+                    nets = self.value_nets(value, path)
+                    assert len(nets) == 1
+                    input_nets[pin] = nets[0]
+                cell = self.add_cell(kind, input_nets, {}, name, path)
+                for pin, value in outputs.items():
+                    nets = self.value_nets(value, path)
+                    assert len(nets) == 1
+                    cell.outputs[pin] = nets[0]
+
+        for i, (subfragment, name, *_) in enumerate(fragment.subfragments):
+            if isinstance(subfragment, Instance):
+                self._add_fragment(subfragment, path, name)
+            else:
+                self._add_fragment(subfragment, path + (name or "U$%d" % i,))
@@ -5,6 +5,15 @@ class NoneProcess(Elaboratable):
     def _generate_and(self, a, b, o):
         self.m.d.comb += o.eq(a & b)
 
+    def _generate_or(self, a, b, o):
+        self.m.d.comb += o.eq(a | b)
+
+    def _generate_nand(self, a, b, o):
+        self.m.d.comb += o.eq(~(a & b))
+
+    def _generate_nor(self, a, b, o):
+        self.m.d.comb += o.eq(~(a | b))
+
     def _generate_xor(self, a, b, o):
         self.m.d.comb += o.eq(a ^ b)
 
@@ -22,6 +31,16 @@ class NoneProcess(Elaboratable):
         # 2-input AND into first input of 2-input OR
         self.m.d.comb += o.eq((a1 & a2) | b1)
 
+    # Used in adder
+    def _generate_aoi21(self, a1, a2, b1, o):
+        # 2-input AND into first input of 2-input NOR
+        self.m.d.comb += o.eq(~((a1 & a2) | b1))
+
+    # Used in adder
+    def _generate_oai21(self, a1, a2, b1, o):
+        # 2-input OR into first input of 2-input NAND
+        self.m.d.comb += o.eq(~((a1 | a2) & b1))
+
     # Used in multiplier
     def _generate_ao22(self, a1, a2, b1, b2, o):
         # 2-input AND into both inputs of 2-input OR
@@ -31,3 +50,62 @@ class NoneProcess(Elaboratable):
     def _generate_ao32(self, a1, a2, a3, b1, b2, o):
         # 3-input AND into first input, and 2-input AND into 2nd input of 2-input OR
         self.m.d.comb += o.eq((a1 & a2 & a3) | (b1 & b2))
+
+
+class RecordingProcess(Elaboratable):
+    # Instead of describing each gate with amaranth statements, record it
+    # so netlist based tools (netlist.py, simulator.py) can work on the gate
+    # graph directly. The recorded gates are invisible to amaranth, so a
+    # design built with this process can't be simulated by amaranth or
+    # converted to Verilog.
+    def _record(self, kind, inputs, outputs, name=None):
+        # Start a new list each time we are elaborated
+        if getattr(self, "_recorded_module", None) is not self.m:
+            self._recorded_module = self.m
+            self._recorded_gates = []
+        self._recorded_gates.append((kind, inputs, outputs, name))
+
+    def _generate_and(self, a, b, o):
+        self._record("and", dict(a=a, b=b), dict(o=o))
+
+    def _generate_or(self, a, b, o):
+        self._record("or", dict(a=a, b=b), dict(o=o))
+
+    def _generate_nand(self, a, b, o):
+        self._record("nand", dict(a=a, b=b), dict(o=o))
+
+    def _generate_nor(self, a, b, o):
+        self._record("nor", dict(a=a, b=b), dict(o=o))
+
+    def _generate_xor(self, a, b, o):
+        self._record("xor", dict(a=a, b=b), dict(o=o))
+
+    def _generate_inv(self, a, o):
+        self._record("inv", dict(a=a), dict(o=o))
+
+    def _generate_full_adder(self, a, b, carry_in, sum_out, carry_out, name=None):
+        self._record("full_adder", dict(a=a, b=b, carry_in=carry_in),
+                     dict(sum_out=sum_out, carry_out=carry_out), name)
+
+    def _generate_half_adder(self, a, b, sum_out, carry_out, name=None):
+        self._record("half_adder", dict(a=a, b=b), dict(sum_out=sum_out, carry_out=carry_out), name)
+
+    # Used in adder
+    def _generate_ao21(self, a1, a2, b1, o):
+        self._record("ao21", dict(a1=a1, a2=a2, b1=b1), dict(o=o))
+
+    # Used in adder
+    def _generate_aoi21(self, a1, a2, b1, o):
+        self._record("aoi21", dict(a1=a1, a2=a2, b1=b1), dict(o=o))
+
+    # Used in adder
+    def _generate_oai21(self, a1, a2, b1, o):
+        self._record("oai21", dict(a1=a1, a2=a2, b1=b1), dict(o=o))
+
+    # Used in multiplier
+    def _generate_ao22(self, a1, a2, b1, b2, o):
+        self._record("ao22", dict(a1=a1, a2=a2, b1=b1, b2=b2), dict(o=o))
+
+    # Used in multiplier
+    def _generate_ao32(self, a1, a2, a3, b1, b2, o):
+        self._record("ao32", dict(a1=a1, a2=a2, a3=a3, b1=b1, b2=b2), dict(o=o))
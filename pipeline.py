@@ -0,0 +1,142 @@
+import math
+
+from netlist import Netlist, GATES
+from compressor import UNIT_DELAYS
+
+
+def _pin_delays(cell, delays):
+    # Delay from each input pin to each output pin of a cell, in units of a
+    # simple gate. Adders take their per pin delays from the delay table,
+    # every other cell (including process cells) is one gate.
+    if cell.kind in delays and cell.kind in GATES:
+        input_pins, output_pins = GATES[cell.kind]
+        table = delays[cell.kind]
+        return {(i, o): table[x][y] for (x, i) in enumerate(input_pins) for (y, o) in enumerate(output_pins)}
+    return {(i, o): delays["gate"] for i in cell.inputs for o in cell.outputs}
+
+
+def pipeline_netlist(netlist, process, outputs, stages):
+    # Split the logic driving outputs into stages pipeline stages of about
+    # the same estimated delay, inserting stages - 1 ranks of registers. If
+    # an output is registered the logic driving its register is pipelined.
+    # Each cell goes in the stage its outputs arrive in, and every net
+    # crossing into a later stage goes through a chain of registers, shared
+    # by all the cells reading it. Delays are the unit delays of
+    # compressor.py, and power pins are left alone, so process is the
+    # design built with it.
+    if stages < 1:
+        raise ValueError("A pipeline needs at least one stage")
+    delays = UNIT_DELAYS
+    power_pins = getattr(process, "_power_pins", ())
+
+    root = [netlist.resolve(net) for net in range(len(netlist.net_names))]
+    combinational = [cell for cell in netlist.cells if cell.kind != "dff"]
+    driver = {}
+    for cell in combinational:
+        for net in cell.outputs.values():
+            driver[root[net]] = cell
+    registers = {}
+    for cell in netlist.cells:
+        if cell.kind == "dff":
+            registers[root[cell.outputs["q"]]] = cell
+
+    # The nets we pipeline up to: output bits, or the inputs of the
+    # registers driving them. set_end() points one at a delayed net.
+    ends = []
+    for signal in outputs:
+        for net in netlist.signal_nets(signal):
+            if root[net] in registers:
+                ends.append((registers[root[net]], None))
+            elif root[net] not in (Netlist.CONST0, Netlist.CONST1):
+                ends.append((None, net))
+
+    def end_net(end):
+        cell, net = end
+        return root[cell.inputs["d"]] if cell is not None else root[net]
+
+    def set_end(end, net):
+        cell, port = end
+        if cell is not None:
+            cell.inputs["d"] = net
+        else:
+            netlist.aliases[port] = net
+
+    # Output bits driven straight from a cell get a net of their own, so
+    # we can put registers between them and the cell
+    readers = {}
+    for cell in netlist.cells:
+        for (pin, net) in cell.inputs.items():
+            readers.setdefault(root[net], []).append((cell, pin))
+    for (cell, net) in ends:
+        if cell is None and net == root[net] and net in driver:
+            comb = netlist.new_net(netlist.net_names[net] + "_comb")
+            root.append(comb)
+            outs = driver[net].outputs
+            for pin in outs:
+                if outs[pin] == net:
+                    outs[pin] = comb
+            for (user, pin) in readers.get(net, ()):
+                user.inputs[pin] = comb
+            netlist.aliases[net] = comb
+            root[net] = comb
+            driver[comb] = driver.pop(net)
+
+    # Pipeline every cell except those driving other registers, which
+    # belong to another stage of the design. That includes cells that
+    # drive nothing, so they don't read nets from different stages.
+    end_registers = set(id(cell) for (cell, net) in ends if cell is not None)
+    excluded = set()
+    pending = [root[cell.inputs["d"]] for cell in registers.values() if id(cell) not in end_registers]
+    while pending:
+        cell = driver.get(pending.pop())
+        if cell is None or id(cell) in excluded:
+            continue
+        excluded.add(id(cell))
+        pending.extend(root[net] for (pin, net) in cell.inputs.items() if pin not in power_pins)
+    cells = [cell for cell in netlist.topological_order(combinational) if id(cell) not in excluded]
+
+    # Estimated arrival time of every net, inputs and registers at 0
+    arrival = {}
+    for cell in cells:
+        for ((i, o), d) in _pin_delays(cell, delays).items():
+            if i in power_pins:
+                continue
+            net = root[cell.outputs[o]]
+            arrival[net] = max(arrival.get(net, 0), arrival.get(root[cell.inputs[i]], 0) + d)
+    total = max([arrival.get(end_net(end), 0) for end in ends] + [0])
+    if stages == 1 or total == 0:
+        return netlist
+
+    stage = {}
+    for cell in cells:
+        latest = max(arrival[root[net]] for net in cell.outputs.values())
+        s = min(max(math.ceil(latest * stages / total) - 1, 0), stages - 1)
+        for net in cell.outputs.values():
+            stage[root[net]] = s
+
+    chains = {}
+
+    def delayed(net, cycles):
+        # net delayed by a number of clock cycles
+        if cycles == 0 or net in (Netlist.CONST0, Netlist.CONST1):
+            return net
+        chain = chains.setdefault(net, [net])
+        path = driver[net].path if net in driver else ()
+        while len(chain) <= cycles:
+            q = netlist.new_net("%s_stage%d" % (netlist.net_names[net], stage.get(net, 0) + len(chain)))
+            root.append(q)
+            netlist.add_cell("dff", dict(d=chain[-1]), dict(q=q), path=path)
+            chain.append(q)
+        return chain[cycles]
+
+    for cell in cells:
+        s = stage[root[next(iter(cell.outputs.values()))]]
+        for (pin, net) in list(cell.inputs.items()):
+            if pin not in power_pins:
+                cell.inputs[pin] = delayed(root[net], s - stage.get(root[net], 0))
+
+    for end in ends:
+        net = end_net(end)
+        set_end(end, delayed(net, stages - 1 - stage.get(net, 0)))
+
+    return netlist
@@ -0,0 +1,120 @@
+import json
+from collections import Counter
+
+from netlist import Netlist
+from liberty import Library
+
+
+def cell_stage(cell, top):
+    # Cells of a submodule (eg the final adder of a multiplier) belong to
+    # that submodule, named cells (eg dadda_fa_0_1_2) to the stage their
+    # name starts with, and the rest to the top level.
+    if cell.path:
+        return cell.path[0]
+    if cell.name and "_" in cell.name:
+        return cell.name.split("_")[0]
+    return top
+
+
+def _histogram(values):
+    # JSON keys are strings, keep them in numeric order
+    return {str(k): v for (k, v) in sorted(Counter(values).items())}
+
+
+def _summary(cells, depth, fanout, library):
+    counts = Counter(cell.kind for cell in cells)
+    summary = {
+        "cells": sum(counts.values()),
+        "cell_counts": dict(sorted(counts.items())),
+        "area": None,
+        "depth": max(depth, default=0),
+        "fanout": _histogram(fanout),
+    }
+
+    if library is not None:
+        missing = sorted(kind for kind in counts if kind != "dff" and kind not in library.cells)
+        if missing:
+            summary["missing_cells"] = missing
+        else:
+            summary["area"] = round(sum(library.cells[kind].area * n for (kind, n) in counts.items()
+                                        if kind != "dff"), 6)
+
+    return summary
+
+
+def design_report(elaboratable, outputs, library=None, top="top"):
+    # Cell counts, area, logic depth and fanout of a design, for the whole
+    # design and for each of its stages (see cell_stage). Logic depth is
+    # the number of cells between an input or register and each output
+    # bit. Area needs a liberty.Library, and is None if the design uses
+    # cells the library doesn't have.
+    if isinstance(elaboratable, Netlist):
+        netlist = elaboratable
+    else:
+        netlist = Netlist.from_elaboratable(elaboratable)
+    root = [netlist.resolve(net) for net in range(len(netlist.net_names))]
+
+    combinational = [cell for cell in netlist.cells if cell.kind != "dff"]
+    order = netlist.topological_order(combinational)
+
+    # Depth through the whole design, and through each stage only
+    stage = {id(cell): cell_stage(cell, top) for cell in netlist.cells}
+    depth = {}
+    stage_depth = {}
+    driver_stage = {}
+    for cell in order:
+        s = stage[id(cell)]
+        inputs = [root[net] for net in cell.inputs.values()]
+        d = max((depth.get(net, 0) for net in inputs), default=0) + 1
+        sd = max((stage_depth.get(net, 0) for net in inputs if driver_stage.get(net) == s), default=0) + 1
+        for net in cell.outputs.values():
+            depth[root[net]] = d
+            stage_depth[root[net]] = sd
+            driver_stage[root[net]] = s
+
+    # Number of cell inputs each net drives
+    loads = Counter()
+    for cell in netlist.cells:
+        for net in cell.inputs.values():
+            if root[net] not in (Netlist.CONST0, Netlist.CONST1):
+                loads[root[net]] += 1
+
+    stages = {}
+    for cell in netlist.cells:
+        stages.setdefault(stage[id(cell)], []).append(cell)
+
+    def driven(cells):
+        return set(root[net] for cell in cells for net in cell.outputs.values())
+
+    nets = driven(netlist.cells) | set(loads)
+    report = _summary(netlist.cells, depth.values(), [loads[net] for net in nets], library)
+
+    report["outputs"] = {}
+    for signal in outputs:
+        report["outputs"][signal.name] = [depth.get(root[net], 0) for net in netlist.signal_nets(signal)]
+
+    report["stages"] = {}
+    for (name, cells) in stages.items():
+        nets = driven(cells)
+        report["stages"][name] = _summary(cells, [stage_depth[net] for net in nets if net in stage_depth],
+                                          [loads[net] for net in nets], library)
+
+    return report
+
+
+def liberty_report(elaboratable, outputs, liberty=None, top="top"):
+    # design_report(), loading just the cells the design uses from a list
+    # of Liberty files
+    if isinstance(elaboratable, Netlist):
+        netlist = elaboratable
+    else:
+        netlist = Netlist.from_elaboratable(elaboratable)
+    library = None
+    if liberty:
+        library = Library.load(liberty, set(cell.kind for cell in netlist.cells))
+    return design_report(netlist, outputs, library, top)
+
+
+def write_report(f, report):
+    json.dump(report, f, indent=2)
+    f.write("\n")
@@ -0,0 +1,194 @@
+import numpy as np
+
+from netlist import Netlist, GATES
+
+
+# Bit-sliced models of the netlist gates. Each argument is a numpy uint64
+# array holding one bit of 64 vectors per word.
+MODELS = {
+    "and": lambda a, b: (a & b,),
+    "or": lambda a, b: (a | b,),
+    "nand": lambda a, b: (~(a & b),),
+    "nor": lambda a, b: (~(a | b),),
+    "xor": lambda a, b: (a ^ b,),
+    "inv": lambda a: (~a,),
+    "full_adder": lambda a, b, c: (a ^ b ^ c, (a & b) | (c & (a ^ b))),
+    "half_adder": lambda a, b: (a ^ b, a & b),
+    "ao21": lambda a1, a2, b1: ((a1 & a2) | b1,),
+    "aoi21": lambda a1, a2, b1: (~((a1 & a2) | b1),),
+    "oai21": lambda a1, a2, b1: (~((a1 | a2) & b1),),
+    "ao22": lambda a1, a2, b1, b2: ((a1 & a2) | (b1 & b2),),
+    "ao32": lambda a1, a2, a3, b1, b2: ((a1 & a2 & a3) | (b1 & b2),),
+    "ao33": lambda a1, a2, a3, b1, b2, b3: ((a1 & a2 & a3) | (b1 & b2 & b3),),
+    "oai33": lambda a1, a2, a3, b1, b2, b3: (~((a1 | a2 | a3) & (b1 | b2 | b3)),),
+}
+
+ONES = np.uint64(0xffffffffffffffff)
+
+
+class NetlistSimulator:
+    # Bit-parallel simulator of a design built with RecordingProcess (or
+    # NoneProcess). Every net holds one bit of 64 vectors per uint64 word,
+    # and gates of the same kind at the same logic level are evaluated
+    # together, so a batch of vectors costs a few hundred numpy operations.
+    #
+    # Registers are clocked by tick(), the vectors are independent of each
+    # other so a pipelined design can be checked by holding the inputs for
+    # as many cycles as its latency. elaboratable can also be a Netlist
+    # that has been transformed, eg by pipeline.py.
+    def __init__(self, elaboratable):
+        if isinstance(elaboratable, Netlist):
+            netlist = elaboratable
+        else:
+            netlist = Netlist.from_elaboratable(elaboratable)
+        self._netlist = netlist
+
+        # Collapse aliases so every net refers to the net that drives it
+        self._root = [netlist.resolve(net) for net in range(len(netlist.net_names))]
+
+        cells = []
+        registers = []
+        for cell in netlist.cells:
+            if cell.kind == "dff":
+                registers.append(cell)
+            elif cell.kind in MODELS:
+                cells.append(cell)
+            else:
+                raise NotImplementedError("No simulation model for cell {}".format(cell.kind))
+
+        driver = {}
+        for (i, cell) in enumerate(cells):
+            for net in cell.outputs.values():
+                driver[self._root[net]] = i
+
+        # Levelize the gates, inputs and register outputs are at level 0.
+        users = [[] for cell in cells]
+        pending = [0] * len(cells)
+        for (i, cell) in enumerate(cells):
+            for net in cell.inputs.values():
+                j = driver.get(self._root[net])
+                if j is not None:
+                    users[j].append(i)
+                    pending[i] += 1
+
+        level = [1] * len(cells)
+        ready = [i for i in range(len(cells)) if pending[i] == 0]
+        groups = {}
+        while ready:
+            i = ready.pop()
+            groups.setdefault((level[i], cells[i].kind), []).append(cells[i])
+            for j in users[i]:
+                level[j] = max(level[j], level[i] + 1)
+                pending[j] -= 1
+                if pending[j] == 0:
+                    ready.append(j)
+
+        if sum(len(g) for g in groups.values()) != len(cells):
+            raise ValueError("Combinational loop in netlist")
+
+        self._schedule = []
+        for (lvl, kind) in sorted(groups):
+            input_pins, output_pins = GATES[kind]
+            group = groups[(lvl, kind)]
+            ins = [np.array([self._root[c.inputs[p]] for c in group]) for p in input_pins]
+            outs = [np.array([self._root[c.outputs[p]] for c in group]) for p in output_pins]
+            self._schedule.append((MODELS[kind], ins, outs))
+
+        self._registers_d = np.array([self._root[c.inputs["d"]] for c in registers], dtype=int)
+        self._registers_q = np.array([self._root[c.outputs["q"]] for c in registers], dtype=int)
+
+        self._init = []
+        for signal in netlist.signals:
+            init = getattr(signal, "init", None)
+            if init is None:
+                init = signal.reset
+            for (i, net) in enumerate(netlist.signal_nets(signal)):
+                if (init >> i) & 1 and self._root[net] == net:
+                    self._init.append(net)
+
+        self.reset(64)
+
+    def reset(self, vectors):
+        # Size the simulation for a number of vectors and put every net
+        # (including the registers) back to its initial value
+        self._vectors = vectors
+        self._words = (vectors + 63) // 64
+        self._values = np.zeros((len(self._root), self._words), dtype=np.uint64)
+        self._values[Netlist.CONST1] = ONES
+        self._values[self._init] = ONES
+
+    def _nets(self, signal):
+        return [self._root[net] for net in self._netlist.signal_nets(signal)]
+
+    def set(self, signal, values):
+        values = np.asarray(values)
+        if len(values) != self._vectors:
+            self.reset(len(values))
+        self._values[self._nets(signal)] = _to_planes(values, len(signal), self._words)
+
+    def get(self, signal):
+        return _from_planes(self._values[self._nets(signal)], self._vectors)
+
+    def settle(self):
+        values = self._values
+        for (model, ins, outs) in self._schedule:
+            results = model(*(values[i] for i in ins))
+            for (out, result) in zip(outs, results):
+                values[out] = result
+
+    def tick(self):
+        self.settle()
+        self._values[self._registers_q] = self._values[self._registers_d]
+        self.settle()
+
+    def evaluate(self, inputs, outputs, cycles=0, batch=16384):
+        # Apply the input vectors (a list of (signal, array) pairs) in
+        # batches, holding each batch for cycles clock ticks, and return the
+        # value of each output signal.
+        vectors = len(inputs[0][1])
+        results = [[] for o in outputs]
+        for start in range(0, vectors, batch):
+            for signal, values in inputs:
+                self.set(signal, values[start:start + batch])
+            self.settle()
+            for i in range(cycles):
+                self.tick()
+            for (result, signal) in zip(results, outputs):
+                result.append(self.get(signal))
+        return [np.concatenate(result) for result in results]
+
+
+def _to_planes(values, width, words):
+    # Transpose integers into one uint64 bit plane per bit. Values wider than
+    # 64 bits are given as Python integers in an object array.
+    if values.dtype == object:
+        limbs = [(values >> (64 * i)) & 0xffffffffffffffff for i in range((width + 63) // 64)]
+        limbs = [limb.astype(np.uint64) for limb in limbs]
+    else:
+        limbs = [values.astype(np.uint64)]
+
+    planes = np.zeros((width, words * 64), dtype=np.uint8)
+    for (i, limb) in enumerate(limbs):
+        bits = min(64, width - 64 * i)
+        if bits <= 0:
+            break
+        shifts = np.arange(bits, dtype=np.uint64)[:, None]
+        planes[64 * i:64 * i + bits, :len(limb)] = (limb[None, :] >> shifts) & np.uint64(1)
+    return np.packbits(planes, axis=1, bitorder="little").view(np.uint64)
+
+
+def _from_planes(planes, vectors):
+    bits = np.unpackbits(planes.view(np.uint8), axis=1, bitorder="little")[:, :vectors]
+    bits = bits.astype(np.uint64)
+    limbs = []
+    for i in range(0, len(bits), 64):
+        shifts = np.arange(len(bits[i:i + 64]), dtype=np.uint64)[:, None]
+        limbs.append(np.bitwise_or.reduce(bits[i:i + 64] << shifts, axis=0))
+    if len(limbs) == 0:
+        return np.zeros(vectors, dtype=np.uint64)
+    if len(limbs) == 1:
+        return limbs[0]
+    out = limbs[0].astype(object)
+    for (i, limb) in enumerate(limbs[1:], 1):
+        out |= limb.astype(object) << (64 * i)
+    return out
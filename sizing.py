@@ -0,0 +1,94 @@
+from netlist import Netlist
+
+
+def _fanout(netlist, root, outputs, power_pins):
+    # The cell input pins each net drives, and how many output port bits
+    # it drives
+    sinks = {}
+    for cell in netlist.cells:
+        for (pin, net) in cell.inputs.items():
+            if pin not in power_pins:
+                sinks.setdefault(root[net], []).append((cell, pin))
+    ports = {}
+    for signal in outputs:
+        for net in netlist.signal_nets(signal):
+            ports[root[net]] = ports.get(root[net], 0) + 1
+    return sinks, ports
+
+
+def _choose(sizes, fanout):
+    # The weakest size good for fanout, or the strongest if none are
+    for (kind, limit) in sizes:
+        if fanout <= limit:
+            return kind
+    return sizes[-1][0]
+
+
+def size_netlist(netlist, process, outputs, max_fanout=16):
+    # Insert buffer trees on nets driving more than max_fanout cell inputs,
+    # then pick a drive strength for every cell from the fanout of its
+    # outputs. The size tables come from the process (_cell_sizes,
+    # _buffers), so process is the design built with it. outputs are the
+    # output ports, each of their bits counts as one load.
+    sizes = getattr(process, "_cell_sizes", None)
+    if sizes is None:
+        raise ValueError("Cell sizing isn't supported for this process")
+    buffers = process._buffers
+    buffer_in, buffer_out = process._buffer_pins
+
+    if max_fanout < 2:
+        raise ValueError("Maximum fanout must be at least 2")
+
+    # Buffers get the same power connections as the other cells
+    power = {}
+    for cell in netlist.cells:
+        power = {pin: net for (pin, net) in cell.inputs.items() if pin in process._power_pins}
+        if power:
+            break
+
+    root = [netlist.resolve(net) for net in range(len(netlist.net_names))]
+    sinks, ports = _fanout(netlist, root, outputs, process._power_pins)
+
+    driver = {}
+    for cell in netlist.cells:
+        for net in cell.outputs.values():
+            driver[root[net]] = cell
+
+    for (net, loads) in list(sinks.items()):
+        if net in (Netlist.CONST0, Netlist.CONST1):
+            continue
+        # Keep the output ports on the original net, and split the cell
+        # inputs into groups behind buffers until the net is within limit.
+        # Sinks are kept in the order they were created, so each buffer
+        # drives neighbouring bits.
+        limit = max(max_fanout - ports.get(net, 0), 1)
+        path = driver[net].path if net in driver else ()
+        name = netlist.net_names[net]
+        level = 0
+        while len(loads) > limit:
+            groups = [loads[i:i + max_fanout] for i in range(0, len(loads), max_fanout)]
+            loads = []
+            for (i, group) in enumerate(groups):
+                out = netlist.new_net("%s_buf%d_%d" % (name, level, i))
+                for (cell, pin) in group:
+                    cell.inputs[pin] = out
+                inputs = {buffer_in: net}
+                inputs.update(power)
+                buf = netlist.add_cell(buffers[0][0], inputs, {buffer_out: out}, path=path)
+                root.append(out)
+                loads.append((buf, buffer_in))
+            level += 1
+
+    # Size every cell, including the new buffers, for its final fanout
+    sinks, ports = _fanout(netlist, root, outputs, process._power_pins)
+    for cell in netlist.cells:
+        if cell.kind in sizes:
+            table = sizes[cell.kind]
+        elif cell.kind == buffers[0][0]:
+            table = buffers
+        else:
+            continue
+        fanout = max(len(sinks.get(root[net], ())) + ports.get(root[net], 0) for net in cell.outputs.values())
+        cell.kind = _choose(table, fanout)
+
+    return netlist
@@ -2,6 +2,43 @@ from amaranth import Elaboratable, Instance
 
 
 class SKY130HDProcess(Elaboratable):
+    # Drive strengths of each cell we instantiate, weakest first, with the
+    # fanout each one is good for. Used by sizing.py
+    _cell_sizes = {
+        "sky130_fd_sc_hd__and2_1": (("sky130_fd_sc_hd__and2_1", 4), ("sky130_fd_sc_hd__and2_2", 8),
+                                    ("sky130_fd_sc_hd__and2_4", 16)),
+        "sky130_fd_sc_hd__or2_1": (("sky130_fd_sc_hd__or2_1", 4), ("sky130_fd_sc_hd__or2_2", 8),
+                                   ("sky130_fd_sc_hd__or2_4", 16)),
+        "sky130_fd_sc_hd__nand2_1": (("sky130_fd_sc_hd__nand2_1", 4), ("sky130_fd_sc_hd__nand2_2", 8),
+                                     ("sky130_fd_sc_hd__nand2_4", 16)),
+        "sky130_fd_sc_hd__nor2_1": (("sky130_fd_sc_hd__nor2_1", 4), ("sky130_fd_sc_hd__nor2_2", 8),
+                                    ("sky130_fd_sc_hd__nor2_4", 16)),
+        "sky130_fd_sc_hd__a21oi_1": (("sky130_fd_sc_hd__a21oi_1", 4), ("sky130_fd_sc_hd__a21oi_2", 8),
+                                     ("sky130_fd_sc_hd__a21oi_4", 16)),
+        "sky130_fd_sc_hd__o21ai_1": (("sky130_fd_sc_hd__o21ai_1", 4), ("sky130_fd_sc_hd__o21ai_2", 8),
+                                     ("sky130_fd_sc_hd__o21ai_4", 16)),
+        "sky130_fd_sc_hd__xor2_1": (("sky130_fd_sc_hd__xor2_1", 4), ("sky130_fd_sc_hd__xor2_2", 8),
+                                    ("sky130_fd_sc_hd__xor2_4", 16)),
+        "sky130_fd_sc_hd__inv_1": (("sky130_fd_sc_hd__inv_1", 4), ("sky130_fd_sc_hd__inv_2", 8),
+                                   ("sky130_fd_sc_hd__inv_4", 16)),
+        "sky130_fd_sc_hd__fa_1": (("sky130_fd_sc_hd__fa_1", 4), ("sky130_fd_sc_hd__fa_2", 8),
+                                  ("sky130_fd_sc_hd__fa_4", 16)),
+        "sky130_fd_sc_hd__ha_1": (("sky130_fd_sc_hd__ha_1", 4), ("sky130_fd_sc_hd__ha_2", 8),
+                                  ("sky130_fd_sc_hd__ha_4", 16)),
+        "sky130_fd_sc_hd__a21o_1": (("sky130_fd_sc_hd__a21o_1", 4), ("sky130_fd_sc_hd__a21o_2", 8),
+                                    ("sky130_fd_sc_hd__a21o_4", 16)),
+        "sky130_fd_sc_hd__a22o_1": (("sky130_fd_sc_hd__a22o_1", 4), ("sky130_fd_sc_hd__a22o_2", 8),
+                                    ("sky130_fd_sc_hd__a22o_4", 16)),
+        "sky130_fd_sc_hd__a32o_1": (("sky130_fd_sc_hd__a32o_1", 4), ("sky130_fd_sc_hd__a32o_2", 8),
+                                    ("sky130_fd_sc_hd__a32o_4", 16)),
+    }
+
+    # Buffers for buffer trees, weakest first, and their input and output
+    _buffers = (("sky130_fd_sc_hd__buf_1", 4), ("sky130_fd_sc_hd__buf_2", 8),
+                ("sky130_fd_sc_hd__buf_4", 16), ("sky130_fd_sc_hd__buf_8", 32))
+    _buffer_pins = ("A", "X")
+    _power_pins = ("VPWR", "VPB", "VGND", "VNB")
+
     def _PoweredInstance(self, *args, **kwargs):
         if self._powered:
             kwargs.update({
@@ -22,6 +59,36 @@ class SKY130HDProcess(Elaboratable):
 
         self.m.submodules += andgate
 
+    def _generate_or(self, a, b, o):
+        orgate = self._PoweredInstance(
+            "sky130_fd_sc_hd__or2_1",
+            i_A=a,
+            i_B=b,
+            o_X=o
+        )
+
+        self.m.submodules += orgate
+
+    def _generate_nand(self, a, b, o):
+        nandgate = self._PoweredInstance(
+            "sky130_fd_sc_hd__nand2_1",
+            i_A=a,
+            i_B=b,
+            o_Y=o
+        )
+
+        self.m.submodules += nandgate
+
+    def _generate_nor(self, a, b, o):
+        norgate = self._PoweredInstance(
+            "sky130_fd_sc_hd__nor2_1",
+            i_A=a,
+            i_B=b,
+            o_Y=o
+        )
+
+        self.m.submodules += norgate
+
     def _generate_xor(self, a, b, o):
         xorgate = self._PoweredInstance(
             "sky130_fd_sc_hd__xor2_1",
@@ -82,6 +149,32 @@ class SKY130HDProcess(Elaboratable):
 
         self.m.submodules += a21o
 
+    # Used in adder
+    def _generate_aoi21(self, a1, a2, b1, o):
+        # 2-input AND into first input of 2-input NOR
+        a21oi = self._PoweredInstance(
+            "sky130_fd_sc_hd__a21oi_1",
+            o_Y=o,
+            i_A1=a1,
+            i_A2=a2,
+            i_B1=b1
+        )
+
+        self.m.submodules += a21oi
+
+    # Used in adder
+    def _generate_oai21(self, a1, a2, b1, o):
+        # 2-input OR into first input of 2-input NAND
+        o21ai = self._PoweredInstance(
+            "sky130_fd_sc_hd__o21ai_1",
+            o_Y=o,
+            i_A1=a1,
+            i_A2=a2,
+            i_B1=b1
+        )
+
+        self.m.submodules += o21ai
+
     # Used in multiplier
     def _generate_ao22(self, a1, a2, b1, b2, o):
         # 2-input AND into both inputs of 2-input OR
@@ -422,3 +422,1057 @@ module sky130_fd_sc_hd__a32o_1 (
     );
 
 endmodule
+
+module sky130_fd_sc_hd__and2_2 (
+    X,
+    A,
+    B
+);
+
+    output X;
+    input  A;
+    input  B;
+
+    // Voltage supply signals
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    sky130_fd_sc_hd__and2 base (
+        .X(X),
+        .A(A),
+        .B(B)
+    );
+
+endmodule
+
+module sky130_fd_sc_hd__and2_4 (
+    X,
+    A,
+    B
+);
+
+    output X;
+    input  A;
+    input  B;
+
+    // Voltage supply signals
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    sky130_fd_sc_hd__and2 base (
+        .X(X),
+        .A(A),
+        .B(B)
+    );
+
+endmodule
+
+module sky130_fd_sc_hd__xor2_2 (
+    X,
+    A,
+    B
+);
+
+    output X;
+    input  A;
+    input  B;
+
+    // Voltage supply signals
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    sky130_fd_sc_hd__xor2 base (
+        .X(X),
+        .A(A),
+        .B(B)
+    );
+
+endmodule
+
+module sky130_fd_sc_hd__xor2_4 (
+    X,
+    A,
+    B
+);
+
+    output X;
+    input  A;
+    input  B;
+
+    // Voltage supply signals
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    sky130_fd_sc_hd__xor2 base (
+        .X(X),
+        .A(A),
+        .B(B)
+    );
+
+endmodule
+
+module sky130_fd_sc_hd__inv_2 (
+    Y,
+    A
+);
+
+    output Y;
+    input  A;
+
+    // Voltage supply signals
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    sky130_fd_sc_hd__inv base (
+        .Y(Y),
+        .A(A)
+    );
+
+endmodule
+
+module sky130_fd_sc_hd__inv_4 (
+    Y,
+    A
+);
+
+    output Y;
+    input  A;
+
+    // Voltage supply signals
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    sky130_fd_sc_hd__inv base (
+        .Y(Y),
+        .A(A)
+    );
+
+endmodule
+
+module sky130_fd_sc_hd__fa_2 (
+    COUT,
+    SUM ,
+    A   ,
+    B   ,
+    CIN
+);
+
+    output COUT;
+    output SUM ;
+    input  A   ;
+    input  B   ;
+    input  CIN ;
+
+    // Voltage supply signals
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    sky130_fd_sc_hd__fa base (
+        .COUT(COUT),
+        .SUM(SUM),
+        .A(A),
+        .B(B),
+        .CIN(CIN)
+    );
+
+endmodule
+
+module sky130_fd_sc_hd__fa_4 (
+    COUT,
+    SUM ,
+    A   ,
+    B   ,
+    CIN
+);
+
+    output COUT;
+    output SUM ;
+    input  A   ;
+    input  B   ;
+    input  CIN ;
+
+    // Voltage supply signals
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    sky130_fd_sc_hd__fa base (
+        .COUT(COUT),
+        .SUM(SUM),
+        .A(A),
+        .B(B),
+        .CIN(CIN)
+    );
+
+endmodule
+
+module sky130_fd_sc_hd__ha_2 (
+    COUT,
+    SUM ,
+    A   ,
+    B
+);
+
+    output COUT;
+    output SUM ;
+    input  A   ;
+    input  B   ;
+
+    // Voltage supply signals
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    sky130_fd_sc_hd__ha base (
+        .COUT(COUT),
+        .SUM(SUM),
+        .A(A),
+        .B(B)
+    );
+endmodule
+
+module sky130_fd_sc_hd__ha_4 (
+    COUT,
+    SUM ,
+    A   ,
+    B
+);
+
+    output COUT;
+    output SUM ;
+    input  A   ;
+    input  B   ;
+
+    // Voltage supply signals
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    sky130_fd_sc_hd__ha base (
+        .COUT(COUT),
+        .SUM(SUM),
+        .A(A),
+        .B(B)
+    );
+endmodule
+
+module sky130_fd_sc_hd__a21o_2 (
+    X ,
+    A1,
+    A2,
+    B1
+);
+
+    output X ;
+    input  A1;
+    input  A2;
+    input  B1;
+
+    // Voltage supply signals
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    sky130_fd_sc_hd__a21o base (
+        .X(X),
+        .A1(A1),
+        .A2(A2),
+        .B1(B1)
+    );
+
+endmodule
+
+module sky130_fd_sc_hd__a21o_4 (
+    X ,
+    A1,
+    A2,
+    B1
+);
+
+    output X ;
+    input  A1;
+    input  A2;
+    input  B1;
+
+    // Voltage supply signals
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    sky130_fd_sc_hd__a21o base (
+        .X(X),
+        .A1(A1),
+        .A2(A2),
+        .B1(B1)
+    );
+
+endmodule
+
+module sky130_fd_sc_hd__a22o_2 (
+    X ,
+    A1,
+    A2,
+    B1,
+    B2
+);
+
+    output X ;
+    input  A1;
+    input  A2;
+    input  B1;
+    input  B2;
+
+    // Voltage supply signals
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    sky130_fd_sc_hd__a22o base (
+        .X(X),
+        .A1(A1),
+        .A2(A2),
+        .B1(B1),
+        .B2(B2)
+    );
+
+endmodule
+
+module sky130_fd_sc_hd__a22o_4 (
+    X ,
+    A1,
+    A2,
+    B1,
+    B2
+);
+
+    output X ;
+    input  A1;
+    input  A2;
+    input  B1;
+    input  B2;
+
+    // Voltage supply signals
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    sky130_fd_sc_hd__a22o base (
+        .X(X),
+        .A1(A1),
+        .A2(A2),
+        .B1(B1),
+        .B2(B2)
+    );
+
+endmodule
+
+module sky130_fd_sc_hd__a32o_2 (
+    X ,
+    A1,
+    A2,
+    A3,
+    B1,
+    B2
+);
+
+    output X ;
+    input  A1;
+    input  A2;
+    input  A3;
+    input  B1;
+    input  B2;
+
+    // Voltage supply signals
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    sky130_fd_sc_hd__a32o base (
+        .X(X),
+        .A1(A1),
+        .A2(A2),
+        .A3(A3),
+        .B1(B1),
+        .B2(B2)
+    );
+
+endmodule
+
+module sky130_fd_sc_hd__a32o_4 (
+    X ,
+    A1,
+    A2,
+    A3,
+    B1,
+    B2
+);
+
+    output X ;
+    input  A1;
+    input  A2;
+    input  A3;
+    input  B1;
+    input  B2;
+
+    // Voltage supply signals
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    sky130_fd_sc_hd__a32o base (
+        .X(X),
+        .A1(A1),
+        .A2(A2),
+        .A3(A3),
+        .B1(B1),
+        .B2(B2)
+    );
+
+endmodule
+
+module sky130_fd_sc_hd__buf (
+    X,
+    A
+);
+
+    // Module ports
+    output X;
+    input  A;
+
+    // Module supplies
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    // Local signals
+    wire buf0_out_X;
+
+    //  Name  Output      Other arguments
+    buf buf0 (buf0_out_X, A              );
+    buf buf1 (X         , buf0_out_X     );
+
+endmodule
+
+module sky130_fd_sc_hd__buf_1 (
+    X,
+    A
+);
+
+    output X;
+    input  A;
+
+    // Voltage supply signals
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    sky130_fd_sc_hd__buf base (
+        .X(X),
+        .A(A)
+    );
+
+endmodule
+
+module sky130_fd_sc_hd__buf_2 (
+    X,
+    A
+);
+
+    output X;
+    input  A;
+
+    // Voltage supply signals
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    sky130_fd_sc_hd__buf base (
+        .X(X),
+        .A(A)
+    );
+
+endmodule
+
+module sky130_fd_sc_hd__buf_4 (
+    X,
+    A
+);
+
+    output X;
+    input  A;
+
+    // Voltage supply signals
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    sky130_fd_sc_hd__buf base (
+        .X(X),
+        .A(A)
+    );
+
+endmodule
+
+module sky130_fd_sc_hd__buf_8 (
+    X,
+    A
+);
+
+    output X;
+    input  A;
+
+    // Voltage supply signals
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    sky130_fd_sc_hd__buf base (
+        .X(X),
+        .A(A)
+    );
+
+endmodule
+
+module sky130_fd_sc_hd__or2 (
+    X,
+    A,
+    B
+);
+
+    // Module ports
+    output X;
+    input  A;
+    input  B;
+
+    // Module supplies
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    // Local signals
+    wire or0_out_X;
+
+    //  Name  Output      Other arguments
+    or  or0  (or0_out_X , B, A           );
+    buf buf0 (X         , or0_out_X      );
+
+endmodule
+
+module sky130_fd_sc_hd__or2_1 (
+    X,
+    A,
+    B
+);
+
+    output X;
+    input  A;
+    input  B;
+
+    // Voltage supply signals
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    sky130_fd_sc_hd__or2 base (
+        .X(X),
+        .A(A),
+        .B(B)
+    );
+
+endmodule
+
+module sky130_fd_sc_hd__or2_2 (
+    X,
+    A,
+    B
+);
+
+    output X;
+    input  A;
+    input  B;
+
+    // Voltage supply signals
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    sky130_fd_sc_hd__or2 base (
+        .X(X),
+        .A(A),
+        .B(B)
+    );
+
+endmodule
+
+module sky130_fd_sc_hd__or2_4 (
+    X,
+    A,
+    B
+);
+
+    output X;
+    input  A;
+    input  B;
+
+    // Voltage supply signals
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    sky130_fd_sc_hd__or2 base (
+        .X(X),
+        .A(A),
+        .B(B)
+    );
+
+endmodule
+
+module sky130_fd_sc_hd__nand2 (
+    Y,
+    A,
+    B
+);
+
+    // Module ports
+    output Y;
+    input  A;
+    input  B;
+
+    // Module supplies
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    // Local signals
+    wire nand0_out_Y;
+
+    //  Name  Output      Other arguments
+    nand nand0 (nand0_out_Y, B, A           );
+    buf  buf0  (Y          , nand0_out_Y    );
+
+endmodule
+
+module sky130_fd_sc_hd__nand2_1 (
+    Y,
+    A,
+    B
+);
+
+    output Y;
+    input  A;
+    input  B;
+
+    // Voltage supply signals
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    sky130_fd_sc_hd__nand2 base (
+        .Y(Y),
+        .A(A),
+        .B(B)
+    );
+
+endmodule
+
+module sky130_fd_sc_hd__nand2_2 (
+    Y,
+    A,
+    B
+);
+
+    output Y;
+    input  A;
+    input  B;
+
+    // Voltage supply signals
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    sky130_fd_sc_hd__nand2 base (
+        .Y(Y),
+        .A(A),
+        .B(B)
+    );
+
+endmodule
+
+module sky130_fd_sc_hd__nand2_4 (
+    Y,
+    A,
+    B
+);
+
+    output Y;
+    input  A;
+    input  B;
+
+    // Voltage supply signals
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    sky130_fd_sc_hd__nand2 base (
+        .Y(Y),
+        .A(A),
+        .B(B)
+    );
+
+endmodule
+
+module sky130_fd_sc_hd__nor2 (
+    Y,
+    A,
+    B
+);
+
+    // Module ports
+    output Y;
+    input  A;
+    input  B;
+
+    // Module supplies
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    // Local signals
+    wire nor0_out_Y;
+
+    //  Name  Output      Other arguments
+    nor nor0 (nor0_out_Y , A, B           );
+    buf buf0 (Y          , nor0_out_Y     );
+
+endmodule
+
+module sky130_fd_sc_hd__nor2_1 (
+    Y,
+    A,
+    B
+);
+
+    output Y;
+    input  A;
+    input  B;
+
+    // Voltage supply signals
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    sky130_fd_sc_hd__nor2 base (
+        .Y(Y),
+        .A(A),
+        .B(B)
+    );
+
+endmodule
+
+module sky130_fd_sc_hd__nor2_2 (
+    Y,
+    A,
+    B
+);
+
+    output Y;
+    input  A;
+    input  B;
+
+    // Voltage supply signals
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    sky130_fd_sc_hd__nor2 base (
+        .Y(Y),
+        .A(A),
+        .B(B)
+    );
+
+endmodule
+
+module sky130_fd_sc_hd__nor2_4 (
+    Y,
+    A,
+    B
+);
+
+    output Y;
+    input  A;
+    input  B;
+
+    // Voltage supply signals
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    sky130_fd_sc_hd__nor2 base (
+        .Y(Y),
+        .A(A),
+        .B(B)
+    );
+
+endmodule
+
+module sky130_fd_sc_hd__a21oi (
+    Y,
+    A1,
+    A2,
+    B1
+);
+
+    // Module ports
+    output Y;
+    input  A1;
+    input  A2;
+    input  B1;
+
+    // Module supplies
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    // Local signals
+    wire and0_out;
+    wire nor0_out_Y;
+
+    //  Name  Output      Other arguments
+    and and0 (and0_out  , A1, A2         );
+    nor nor0 (nor0_out_Y, B1, and0_out   );
+    buf buf0 (Y         , nor0_out_Y     );
+
+endmodule
+
+module sky130_fd_sc_hd__a21oi_1 (
+    Y,
+    A1,
+    A2,
+    B1
+);
+
+    output Y;
+    input  A1;
+    input  A2;
+    input  B1;
+
+    // Voltage supply signals
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    sky130_fd_sc_hd__a21oi base (
+        .Y(Y),
+        .A1(A1),
+        .A2(A2),
+        .B1(B1)
+    );
+
+endmodule
+
+module sky130_fd_sc_hd__a21oi_2 (
+    Y,
+    A1,
+    A2,
+    B1
+);
+
+    output Y;
+    input  A1;
+    input  A2;
+    input  B1;
+
+    // Voltage supply signals
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    sky130_fd_sc_hd__a21oi base (
+        .Y(Y),
+        .A1(A1),
+        .A2(A2),
+        .B1(B1)
+    );
+
+endmodule
+
+module sky130_fd_sc_hd__a21oi_4 (
+    Y,
+    A1,
+    A2,
+    B1
+);
+
+    output Y;
+    input  A1;
+    input  A2;
+    input  B1;
+
+    // Voltage supply signals
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    sky130_fd_sc_hd__a21oi base (
+        .Y(Y),
+        .A1(A1),
+        .A2(A2),
+        .B1(B1)
+    );
+
+endmodule
+
+module sky130_fd_sc_hd__o21ai (
+    Y,
+    A1,
+    A2,
+    B1
+);
+
+    // Module ports
+    output Y;
+    input  A1;
+    input  A2;
+    input  B1;
+
+    // Module supplies
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    // Local signals
+    wire or0_out;
+    wire nand0_out_Y;
+
+    //  Name  Output      Other arguments
+    or   or0   (or0_out    , A2, A1         );
+    nand nand0 (nand0_out_Y, B1, or0_out    );
+    buf  buf0  (Y          , nand0_out_Y    );
+
+endmodule
+
+module sky130_fd_sc_hd__o21ai_1 (
+    Y,
+    A1,
+    A2,
+    B1
+);
+
+    output Y;
+    input  A1;
+    input  A2;
+    input  B1;
+
+    // Voltage supply signals
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    sky130_fd_sc_hd__o21ai base (
+        .Y(Y),
+        .A1(A1),
+        .A2(A2),
+        .B1(B1)
+    );
+
+endmodule
+
+module sky130_fd_sc_hd__o21ai_2 (
+    Y,
+    A1,
+    A2,
+    B1
+);
+
+    output Y;
+    input  A1;
+    input  A2;
+    input  B1;
+
+    // Voltage supply signals
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    sky130_fd_sc_hd__o21ai base (
+        .Y(Y),
+        .A1(A1),
+        .A2(A2),
+        .B1(B1)
+    );
+
+endmodule
+
+module sky130_fd_sc_hd__o21ai_4 (
+    Y,
+    A1,
+    A2,
+    B1
+);
+
+    output Y;
+    input  A1;
+    input  A2;
+    input  B1;
+
+    // Voltage supply signals
+    supply1 VPWR;
+    supply0 VGND;
+    supply1 VPB ;
+    supply0 VNB ;
+
+    sky130_fd_sc_hd__o21ai base (
+        .Y(Y),
+        .A1(A1),
+        .A2(A2),
+        .B1(B1)
+    );
+
+endmodule
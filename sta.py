@@ -0,0 +1,226 @@
+import sys
+import argparse
+
+from netlist import Netlist
+from liberty import Library
+import adder
+import multiplier
+
+
+TRANSITIONS = ("rise", "fall")
+
+
+class StaticTiming:
+    # Static timing analysis of a design built for a standard cell process,
+    # using the NLDM tables of its Liberty cells. Arrival times and slews
+    # are propagated separately for rising and falling transitions from the
+    # inputs (and register outputs) to the outputs (and register inputs).
+    # Times are in ns and capacitances in pF.
+    def __init__(self, elaboratable, library, outputs, input_slew=0.05, output_load=0.005):
+        if isinstance(elaboratable, Netlist):
+            netlist = elaboratable
+        else:
+            netlist = Netlist.from_elaboratable(elaboratable)
+        self.netlist = netlist
+        self.library = library
+        self.outputs = outputs
+
+        self._index = {id(cell): i for (i, cell) in enumerate(netlist.cells)}
+        self._root = root = [netlist.resolve(net) for net in range(len(netlist.net_names))]
+
+        cells = []
+        self._registers = []
+        for cell in netlist.cells:
+            if cell.kind == "dff":
+                self._registers.append(cell)
+            elif cell.kind in library.cells:
+                cells.append(cell)
+            else:
+                raise ValueError("No Liberty model for cell %s" % cell.kind)
+
+        # The load on each net is the capacitance of the pins it drives
+        self._load = load = {}
+        for cell in cells:
+            capacitance = library.cells[cell.kind].capacitance
+            for (pin, net) in cell.inputs.items():
+                if pin in capacitance:
+                    load[root[net]] = load.get(root[net], 0.0) + capacitance[pin]
+        for signal in outputs:
+            for net in netlist.signal_nets(signal):
+                load[root[net]] = load.get(root[net], 0.0) + output_load
+
+        self._input_slew = input_slew
+        self._arrival = {}
+        self._slew = {}
+        self._from = {}
+        for cell in netlist.topological_order(cells):
+            self._propagate(cell)
+
+    def _start(self, net):
+        # Nets nothing drives are timing start points
+        if net not in self._arrival:
+            self._arrival[net] = {"rise": 0.0, "fall": 0.0}
+            self._slew[net] = {"rise": self._input_slew, "fall": self._input_slew}
+            self._from[net] = {"rise": None, "fall": None}
+
+    def _propagate(self, cell):
+        libcell = self.library.cells[cell.kind]
+        for (pin, arcs) in libcell.arcs.items():
+            if pin not in cell.outputs:
+                continue
+            out = self._root[cell.outputs[pin]]
+            load = self._load.get(out, 0.0)
+            arrival = {"rise": None, "fall": None}
+            slew = {"rise": 0.0, "fall": 0.0}
+            source = {"rise": None, "fall": None}
+
+            for arc in arcs:
+                net = cell.inputs.get(arc.related_pin)
+                if net is None:
+                    continue
+                net = self._root[net]
+                if net in (Netlist.CONST0, Netlist.CONST1):
+                    continue
+                self._start(net)
+
+                for t in TRANSITIONS:
+                    if arc.sense == "positive_unate":
+                        inputs = (t,)
+                    elif arc.sense == "negative_unate":
+                        inputs = ("fall" if t == "rise" else "rise",)
+                    else:
+                        inputs = TRANSITIONS
+                    for t_in in inputs:
+                        s_in = self._slew[net][t_in]
+                        a = self._arrival[net][t_in] + arc.delay[t].lookup(s_in, load)
+                        if arrival[t] is None or a > arrival[t]:
+                            arrival[t] = a
+                            if arc.slew[t] is not None:
+                                slew[t] = arc.slew[t].lookup(s_in, load)
+                            source[t] = (cell, arc.related_pin, net, t_in)
+
+            if arrival["rise"] is None:
+                continue
+            self._arrival[out] = arrival
+            self._slew[out] = slew
+            self._from[out] = source
+
+    def _instance_name(self, cell):
+        return "/".join(cell.path + (cell.name or "U%d" % self._index[id(cell)],))
+
+    def net_arrival(self, net):
+        # Worst arrival of a net and the transition it happens on
+        arrival = self._arrival.get(self._root[net])
+        if arrival is None:
+            return 0.0, None
+        t = max(TRANSITIONS, key=lambda t: arrival[t])
+        return arrival[t], t
+
+    def arrival(self, signal):
+        # Worst arrival time of each bit of a signal, LSB first
+        return [self.net_arrival(net)[0] for net in self.netlist.signal_nets(signal)]
+
+    def endpoints(self):
+        # (name, net) of every output bit and register input
+        for signal in self.outputs:
+            nets = self.netlist.signal_nets(signal)
+            for (i, net) in enumerate(nets):
+                yield (signal.name if len(nets) == 1 else "%s[%d]" % (signal.name, i)), net
+        for cell in self._registers:
+            yield self.netlist.net_names[cell.outputs["q"]] + "$D", cell.inputs["d"]
+
+    def critical_path(self):
+        # The path to the latest endpoint, as a list of (instance, cell,
+        # pin, net, transition, arrival) from the start point
+        endpoints = list(self.endpoints())
+        if not endpoints:
+            return []
+        name, net = max(endpoints, key=lambda e: self.net_arrival(e[1])[0])
+        net = self._root[net]
+        arrival, t = self.net_arrival(net)
+
+        path = []
+        while t is not None and self._from[net][t] is not None:
+            cell, pin, prev, t_prev = self._from[net][t]
+            out = next(p for (p, n) in cell.outputs.items() if self._root[n] == net)
+            path.append((self._instance_name(cell), cell.kind, out, self.netlist.net_names[net], t,
+                         self._arrival[net][t]))
+            net, t = prev, t_prev
+        path.append((None, None, None, self.netlist.net_names[net], t, 0.0))
+        path.reverse()
+        return path
+
+    def report(self, f):
+        path = self.critical_path()
+        delay = path[-1][5] if path else 0.0
+        f.write("Critical path: %.3f ns\n" % delay)
+        f.write("\n")
+        f.write("%10s %-6s %-32s %-24s %s\n" % ("Arrival", "Edge", "Cell", "Pin", "Net"))
+        for (instance, kind, pin, net, t, arrival) in path:
+            if kind is None:
+                f.write("%10.3f %-6s %-32s %-24s %s\n" % (arrival, t or "", "(input)", "", net))
+            else:
+                f.write("%10.3f %-6s %-32s %-24s %s\n" % (arrival, t, kind, instance + "/" + pin, net))
+        f.write("\n")
+        for signal in self.outputs:
+            f.write("Output arrival times for %s:\n" % signal.name)
+            for (i, arrival) in enumerate(self.arrival(signal)):
+                f.write("  %s[%d] %.3f\n" % (signal.name, i, arrival))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Static timing report of an adder or multiplier')
+
+    parser.add_argument('--liberty', action='append', required=True,
+                        help='Liberty file with the cells of the process (may be given more than once)')
+
+    parser.add_argument('--input-slew', type=float, default=0.05,
+                        help='Slew of the inputs in ns')
+
+    parser.add_argument('--output-load', type=float, default=0.005,
+                        help='Load on each output in pF')
+
+    parser.add_argument('--output', type=argparse.FileType('w'), default=sys.stdout,
+                        help='Write the report to this file')
+
+    subparsers = parser.add_subparsers(dest='generator', required=True)
+
+    # The design options are the ones adder.py and multiplier.py take
+    p = subparsers.add_parser('adder')
+    adder.add_arguments(p)
+    p.add_argument('--stages', type=int,
+                   help='Pipeline the adder into this many stages of balanced delay')
+    multiplier.add_arguments(subparsers.add_parser('multiplier'))
+
+    args = parser.parse_args()
+
+    config = {k: v for (k, v) in vars(args).items()
+              if k not in ('liberty', 'input_slew', 'output_load', 'output', 'generator')}
+    stages = config.pop('stages')
+    max_fanout = config.pop('max_fanout')
+
+    try:
+        if args.process in (None, 'none'):
+            raise ValueError("Static timing needs a standard cell process")
+        if args.generator == 'adder':
+            design, ports = adder.build_adder(**config)
+            netlist = adder.transform_netlist(design, stages, max_fanout)
+        else:
+            design, ports, name = multiplier.build_multiplier(**config)
+            netlist = multiplier.transform_netlist(design, stages, max_fanout)
+        outputs = [design.o]
+    except ValueError as e:
+        print(e)
+        exit(1)
+
+    # Only parse the cells the design uses
+    library = Library.load(args.liberty, set(c.kind for c in netlist.cells))
+
+    try:
+        sta = StaticTiming(netlist, library, outputs, input_slew=args.input_slew,
+                           output_load=args.output_load)
+    except ValueError as e:
+        print(e)
+        exit(1)
+
+    sta.report(args.output)
@@ -0,0 +1,330 @@
+import io
+import re
+
+from amaranth.back import verilog
+
+from netlist import Netlist
+
+
+# Verilog for the generic gates of netlist.GATES, used when a design isn't
+# built for a standard cell process
+EXPRESSIONS = {
+    "and": ("{o}", "{a} & {b}"),
+    "or": ("{o}", "{a} | {b}"),
+    "nand": ("{o}", "~({a} & {b})"),
+    "nor": ("{o}", "~({a} | {b})"),
+    "xor": ("{o}", "{a} ^ {b}"),
+    "inv": ("{o}", "~{a}"),
+    "full_adder": ("{{{carry_out}, {sum_out}}}", "{a} + {b} + {carry_in}"),
+    "half_adder": ("{{{carry_out}, {sum_out}}}", "{a} + {b}"),
+    "ao21": ("{o}", "({a1} & {a2}) | {b1}"),
+    "aoi21": ("{o}", "~(({a1} & {a2}) | {b1})"),
+    "oai21": ("{o}", "~(({a1} | {a2}) & {b1})"),
+    "ao22": ("{o}", "({a1} & {a2}) | ({b1} & {b2})"),
+    "ao32": ("{o}", "({a1} & {a2} & {a3}) | ({b1} & {b2})"),
+    "ao33": ("{o}", "({a1} & {a2} & {a3}) | ({b1} & {b2} & {b3})"),
+    "oai33": ("{o}", "~(({a1} | {a2} | {a3}) & ({b1} | {b2} | {b3}))"),
+}
+
+
+def _identifier(name):
+    name = re.sub(r'[^A-Za-z0-9_]', '_', name)
+    if not name or name[0].isdigit():
+        name = '_' + name
+    return name
+
+
+class StructuralWriter:
+    # Write structural Verilog straight from the cells of an elaborated
+    # design, without going through amaranth's RTLIL and yosys. Cells are
+    # streamed to the output as they are visited. With hierarchical=True
+    # each submodule becomes its own Verilog module, otherwise the design
+    # is flattened into a single module. elaboratable can also be a Netlist
+    # that has been transformed, eg by sizing.py.
+    def __init__(self, elaboratable, ports, name):
+        self.name = name
+        if isinstance(elaboratable, Netlist):
+            netlist = elaboratable
+        else:
+            netlist = Netlist.from_elaboratable(elaboratable)
+        self.netlist = netlist
+        self.ports = ports
+
+        self._root = [netlist.resolve(net) for net in range(len(netlist.net_names))]
+
+        self._driven = set()
+        for cell in netlist.cells:
+            for net in cell.outputs.values():
+                self._driven.add(self._root[net])
+
+        self._has_registers = any(cell.kind == "dff" for cell in netlist.cells)
+
+        # Name every port, then every net that needs a wire of its own
+        self._used = used = set()
+        self._suffix = {}
+        self._port_names = []
+        self._port_outputs = []
+        self._input_bits = {}
+        for port in ports:
+            port_name = _identifier(port.name)
+            used.add(port_name)
+            self._port_names.append(port_name)
+            nets = netlist.signal_nets(port)
+            is_output = any(net in netlist.aliases or net in self._driven for net in nets)
+            self._port_outputs.append(is_output)
+            if not is_output:
+                for (i, net) in enumerate(nets):
+                    if len(port) == 1:
+                        self._input_bits[net] = port_name
+                    else:
+                        self._input_bits[net] = "%s[%d]" % (port_name, i)
+        if self._has_registers:
+            used.update(("clk", "rst"))
+
+        self._names = {}
+        for (net, name) in enumerate(netlist.net_names):
+            if net in (Netlist.CONST0, Netlist.CONST1) or self._root[net] != net:
+                continue
+            self._names[net] = self._unique(name)
+
+    def _unique(self, name):
+        name = _identifier(name)
+        unique = name
+        while unique in self._used:
+            self._suffix[name] = self._suffix.get(name, 0) + 1
+            unique = "%s_%d" % (name, self._suffix[name])
+        self._used.add(unique)
+        return unique
+
+    def _init_bit(self, net):
+        signal, bit = self.netlist.net_bits.get(net, (None, 0))
+        if signal is None:
+            return 0
+        init = getattr(signal, "init", None)
+        if init is None:
+            init = signal.reset
+        return (init >> bit) & 1
+
+    def _ref(self, net, top=True):
+        net = self._root[net]
+        if net == Netlist.CONST0:
+            return "1'b0"
+        if net == Netlist.CONST1:
+            return "1'b1"
+        if net in self._input_bits:
+            return self._input_bits[net] if top else self._names[net]
+        if net not in self._driven:
+            # Undriven signals hold their initial value
+            return "1'b%d" % self._init_bit(net)
+        return self._names[net]
+
+    def _cell_nets(self, cell):
+        nets = []
+        for net in list(cell.inputs.values()) + list(cell.outputs.values()):
+            net = self._root[net]
+            if net in self._names and (net in self._driven or net in self._input_bits):
+                nets.append(net)
+        return nets
+
+    def _write_cells(self, f, cells, top):
+        registers = []
+        instance = 0
+        for cell in cells:
+            if cell.kind == "dff":
+                registers.append(cell)
+            elif cell.kind in EXPRESSIONS:
+                lhs, rhs = EXPRESSIONS[cell.kind]
+                pins = {pin: self._ref(net, top) for (pin, net) in cell.inputs.items()}
+                pins.update({pin: self._ref(net, top) for (pin, net) in cell.outputs.items()})
+                f.write("  assign %s = %s;\n" % (lhs.format(**pins), rhs.format(**pins)))
+            else:
+                name = cell.name or "U%d" % instance
+                instance += 1
+                if top:
+                    name = "_".join(cell.path + (name,))
+                connections = ", ".join(".%s(%s)" % (pin, self._ref(net, top))
+                                        for (pin, net) in list(cell.inputs.items()) + list(cell.outputs.items()))
+                f.write("  %s %s (%s);\n" % (cell.kind, self._unique(name), connections))
+
+        if registers:
+            f.write("  always @(posedge clk) begin\n")
+            for cell in registers:
+                q = self._ref(cell.outputs["q"], top)
+                d = self._ref(cell.inputs["d"], top)
+                # Registers added to the netlist (eg by pipeline.py) have no
+                # signal, and no reset
+                signal, bit = self.netlist.net_bits.get(cell.outputs["q"], (None, 0))
+                if signal is None or signal.reset_less:
+                    f.write("    %s <= %s;\n" % (q, d))
+                else:
+                    f.write("    %s <= rst ? 1'b%d : %s;\n" % (q, self._init_bit(cell.outputs["q"]), d))
+            f.write("  end\n")
+
+    def _declare_nets(self, f, nets, registers):
+        for net in sorted(nets):
+            if net in self._input_bits:
+                continue
+            f.write("  %s %s;\n" % ("reg" if net in registers else "wire", self._names[net]))
+
+    def _write_top_header(self, f):
+        port_names = list(self._port_names)
+        if self._has_registers:
+            port_names = ["clk", "rst"] + port_names
+        f.write("module %s(%s);\n" % (self.name, ", ".join(port_names)))
+        if self._has_registers:
+            f.write("  input clk;\n")
+            f.write("  input rst;\n")
+        for (port, port_name, is_output) in zip(self.ports, self._port_names, self._port_outputs):
+            width = "" if len(port) == 1 else "[%d:0] " % (len(port) - 1)
+            f.write("  %s %s%s;\n" % ("output" if is_output else "input", width, port_name))
+
+    def _write_outputs(self, f):
+        for (port, port_name, is_output) in zip(self.ports, self._port_names, self._port_outputs):
+            if not is_output:
+                continue
+            for (i, net) in enumerate(self.netlist.signal_nets(port)):
+                target = port_name if len(port) == 1 else "%s[%d]" % (port_name, i)
+                f.write("  assign %s = %s;\n" % (target, self._ref(net)))
+
+    def _write_flat(self, f, cells):
+        self._write_top_header(f)
+
+        nets = set()
+        for cell in cells:
+            nets.update(self._cell_nets(cell))
+        registers = set(self._root[c.outputs["q"]] for c in cells if c.kind == "dff")
+        self._declare_nets(f, nets, registers)
+
+        self._write_cells(f, cells, True)
+        self._write_outputs(f)
+        f.write("endmodule\n")
+
+    def _write_hierarchical(self, f, cells):
+        # Group cells by the submodule they belong to
+        children = {(): []}
+        local = {(): []}
+        for cell in cells:
+            for depth in range(len(cell.path)):
+                child = cell.path[:depth + 1]
+                if child not in children:
+                    children[child] = []
+                    local[child] = []
+                    children[cell.path[:depth]].append(child)
+            local[cell.path].append(cell)
+
+        # Which submodules use each net, and which one drives it. Nets read
+        # by the top level output ports are used by the top level.
+        users = {}
+        drivers = {}
+        for cell in cells:
+            for net in self._cell_nets(cell):
+                users.setdefault(net, set()).add(cell.path)
+            for net in cell.outputs.values():
+                drivers[self._root[net]] = cell.path
+        for (port, is_output) in zip(self.ports, self._port_outputs):
+            if is_output:
+                for net in self.netlist.signal_nets(port):
+                    users.setdefault(self._root[net], set()).add(())
+
+        def inside(path, scope):
+            return path[:len(scope)] == scope
+
+        ports = {}
+        for scope in children:
+            if scope == ():
+                continue
+            # A net crosses the boundary of scope if it is used both inside
+            # and outside it, or if it is one of the top level inputs
+            ports[scope] = []
+            for (net, paths) in sorted(users.items()):
+                if not any(inside(p, scope) for p in paths):
+                    continue
+                if net in self._input_bits or not all(inside(p, scope) for p in paths):
+                    ports[scope].append(net)
+
+        clocked = {}
+
+        def has_registers(scope):
+            if scope not in clocked:
+                clocked[scope] = any(c.kind == "dff" for c in local[scope]) or \
+                    any(has_registers(c) for c in children[scope])
+            return clocked[scope]
+
+        def module_name(scope):
+            return "_".join((self.name,) + tuple(_identifier(s) for s in scope))
+
+        def write_body(scope, top):
+            nets = set()
+            for cell in local[scope]:
+                nets.update(self._cell_nets(cell))
+            for child in children[scope]:
+                nets.update(ports[child])
+            if not top:
+                nets -= set(ports[scope])
+            registers = set(self._root[c.outputs["q"]] for c in local[scope] if c.kind == "dff")
+            self._declare_nets(f, nets, registers)
+
+            for child in children[scope]:
+                connections = [".%s(%s)" % (self._names[n], self._ref(n, top)) for n in ports[child]]
+                if has_registers(child):
+                    connections = [".clk(clk)", ".rst(rst)"] + connections
+                f.write("  %s %s (%s);\n" % (module_name(child), _identifier(child[-1]),
+                                             ", ".join(connections)))
+
+            self._write_cells(f, local[scope], top)
+
+        def write_module(scope):
+            for child in children[scope]:
+                write_module(child)
+
+            names = [self._names[n] for n in ports[scope]]
+            if has_registers(scope):
+                names = ["clk", "rst"] + names
+            f.write("module %s(%s);\n" % (module_name(scope), ", ".join(names)))
+            if has_registers(scope):
+                f.write("  input clk;\n")
+                f.write("  input rst;\n")
+            for net in ports[scope]:
+                if net in drivers and inside(drivers[net], scope):
+                    is_register = any(c.kind == "dff" and self._root[c.outputs["q"]] == net
+                                      for c in local[scope])
+                    f.write("  output %s%s;\n" % ("reg " if is_register else "", self._names[net]))
+                else:
+                    f.write("  input %s;\n" % self._names[net])
+
+            write_body(scope, False)
+            f.write("endmodule\n\n")
+
+        for child in children[()]:
+            write_module(child)
+
+        self._write_top_header(f)
+        write_body((), True)
+        self._write_outputs(f)
+        f.write("endmodule\n")
+
+    def write(self, f, hierarchical=False):
+        if hierarchical:
+            self._write_hierarchical(f, self.netlist.cells)
+        else:
+            self._write_flat(f, self.netlist.cells)
+
+
+def write_verilog(f, elaboratable, ports, name, backend='amaranth'):
+    # Write Verilog for a design using one of the backends: amaranth (via
+    # RTLIL and yosys), structural (a flat netlist) or hierarchical (a
+    # netlist with a module per submodule).
+    if backend == 'amaranth':
+        if isinstance(elaboratable, Netlist):
+            raise ValueError("A netlist needs the structural or hierarchical backend")
+        f.write(verilog.convert(elaboratable, ports=ports, name=name, strip_internal_attrs=True))
+    elif backend in ('structural', 'hierarchical'):
+        StructuralWriter(elaboratable, ports, name).write(f, hierarchical=(backend == 'hierarchical'))
+    else:
+        raise ValueError("Unknown backend")
+
+
+def convert(elaboratable, ports, name, backend='amaranth'):
+    f = io.StringIO()
+    write_verilog(f, elaboratable, ports, name, backend)
+    return f.getvalue()
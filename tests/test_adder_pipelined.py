@@ -0,0 +1,48 @@
+import unittest
+import random
+import numpy as np
+
+from adder import build_adder
+from simulator import NetlistSimulator
+from qor import design_report
+
+
+class TestCaseAdderPipelined(unittest.TestCase):
+    def check(self, bits, algorithm, register_levels, **kwargs):
+        adder, ports = build_adder(bits=bits, algorithm=algorithm, register_levels=register_levels, **kwargs)
+        latency = len(set(register_levels)) + kwargs.get('register_input', False) + \
+            kwargs.get('register_output', False)
+
+        a = np.array([random.getrandbits(bits) for i in range(300)] + [2**bits - 1], dtype=object)
+        b = np.array([random.getrandbits(bits) for i in range(300)] + [1], dtype=object)
+        o, = NetlistSimulator(adder).evaluate([(adder.a, a), (adder.b, b)], [adder.o], cycles=latency)
+        self.assertTrue(all(o == (a + b) % 2**bits))
+        return adder
+
+    def test_random(self):
+        for algorithm in ('brentkung', 'koggestone', 'hancarlson', 'sklansky', 'ladnerfischer', 'knowles'):
+            for register_levels in ([0], [3], [2, 4], [1, 3, 5, 20]):
+                with self.subTest(algorithm=algorithm, register_levels=register_levels):
+                    self.check(128, algorithm, register_levels)
+
+    def test_registers(self):
+        self.check(64, 'koggestone', [3], register_input=True, register_output=True)
+
+    def test_depth(self):
+        # A register stage in the middle of a Kogge-Stone tree splits its
+        # logic depth in two
+        adder, ports = build_adder(bits=128, algorithm='koggestone')
+        depth = design_report(adder, [adder.o])["depth"]
+        pipelined = self.check(128, 'koggestone', [3])
+        self.assertLess(design_report(pipelined, [pipelined.o])["depth"] * 3, depth * 2)
+
+    def test_invalid(self):
+        for (algorithm, register_levels) in (('brentkung', [-1]), ('sparsetree', [2]), ('ling_koggestone', [2]),
+                                             ('inverting_brentkung', [2]), ('inferred', [2])):
+            with self.subTest(algorithm=algorithm, register_levels=register_levels):
+                with self.assertRaises(ValueError):
+                    build_adder(bits=32, algorithm=algorithm, register_levels=register_levels)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+
+from batch import expand
+from adder import build_adder, BrentKung, KoggeStone
+from multiplier import build_multiplier
+from sky130hd.process import SKY130HDProcess
+from none.process import NoneProcess
+
+
+class TestCaseBatch(unittest.TestCase):
+    def test_expand(self):
+        spec = [{
+            "generator": "multiplier",
+            "output": "multiply_adder_{process}_{algorithm}.v",
+            "options": {"bits": 4, "multiply_add": True},
+            "matrix": {
+                "process": ["sky130hd", "asap7", "gf180mcu"],
+                "algorithm": ["brentkung", "koggestone"],
+            },
+        }, {
+            "generator": "adder",
+            "matrix": {"bits": [8, 16]},
+        }]
+
+        points = expand(spec)
+        self.assertEqual(len(points), 8)
+        self.assertEqual(points[0], ("multiplier",
+                                     {"bits": 4, "multiply_add": True, "process": "sky130hd",
+                                      "algorithm": "brentkung"},
+                                     "multiply_adder_sky130hd_brentkung.v"))
+        self.assertEqual(points[-1], ("adder", {"bits": 16}, "adder_16.v"))
+
+    def test_duplicate_output(self):
+        spec = [{
+            "generator": "adder",
+            "output": "adder.v",
+            "matrix": {"bits": [8, 16]},
+        }]
+        with self.assertRaises(ValueError):
+            expand(spec)
+
+    def test_build(self):
+        adder, ports = build_adder(bits=8, process='sky130hd', algorithm='koggestone')
+        self.assertIsInstance(adder, KoggeStone)
+        self.assertIsInstance(adder, SKY130HDProcess)
+        self.assertEqual(len(ports), 3)
+
+        multiplier, ports, name = build_multiplier(bits=8, multiply_add=True, powered=True)
+        self.assertIsInstance(multiplier, NoneProcess)
+        self.assertEqual(name, 'multiply_adder')
+        self.assertEqual(len(ports), 6)
+        self.assertTrue(issubclass(multiplier._adder, BrentKung))
+
+        with self.assertRaises(ValueError):
+            build_adder(process='tsmc')
+
+
+if __name__ == '__main__':
+    unittest.main()
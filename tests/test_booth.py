@@ -0,0 +1,94 @@
+import unittest
+import random
+import numpy as np
+
+from adder import BrentKung, get_algorithm
+from multiplier import Multiplier, BoothRadix4, BoothRadix8, BoothRadix16, Dadda, get_booth
+from none.process import RecordingProcess
+from simulator import NetlistSimulator
+
+
+class TestAdder(BrentKung, RecordingProcess):
+    pass
+
+
+def to_signed(value, bits):
+    return value - (1 << bits) if (value >> (bits - 1)) & 1 else value
+
+
+class TestCaseBooth(unittest.TestCase):
+    def test_random(self):
+        for booth in (BoothRadix8, BoothRadix16):
+            class TestMultiplier(Multiplier, booth, Dadda, RecordingProcess):
+                pass
+
+            for bits in (2, 3, 5, 8, 13, 16, 32, 64):
+                for multiply_add in (False, True):
+                    with self.subTest(booth=booth.__name__, bits=bits, multiply_add=multiply_add):
+                        dut = TestMultiplier(adder=TestAdder, bits=bits, multiply_add=multiply_add)
+                        sim = NetlistSimulator(dut)
+                        # Include the largest inputs, which exercise the top multiples
+                        a = np.array([random.getrandbits(bits) for i in range(200)] + [2**bits - 1],
+                                     dtype=object)
+                        b = np.array([random.getrandbits(bits) for i in range(200)] + [2**bits - 1],
+                                     dtype=object)
+                        inputs = [(dut.a, a), (dut.b, b)]
+                        expected = a * b
+                        if multiply_add:
+                            c = np.array([random.getrandbits(bits * 2) for i in range(201)], dtype=object)
+                            inputs.append((dut.c, c))
+                            expected = (expected + c) % 2**(bits * 2)
+                        o, = sim.evaluate(inputs, [dut.o])
+                        self.assertTrue(all(o == expected))
+
+    def test_algorithms(self):
+        # The adders for the odd multiples are as wide as b plus a few
+        # bits, so usually not a power of 2. They and the final adder must
+        # work with every algorithm.
+        algorithms = ('brentkung', 'koggestone', 'hancarlson', 'inferred', 'sklansky', 'ladnerfischer', 'knowles',
+                      'sparsetree', 'ling_brentkung', 'ling_koggestone', 'ling_hancarlson', 'inverting_brentkung',
+                      'inverting_koggestone', 'inverting_hancarlson')
+        for booth in (BoothRadix8, BoothRadix16):
+            for name in algorithms:
+                class TestMultiplier(Multiplier, booth, Dadda, RecordingProcess):
+                    pass
+
+                class TestAlgorithmAdder(get_algorithm(name), RecordingProcess):
+                    pass
+
+                for bits in (5, 8, 12, 32):
+                    for signed in (False, True):
+                        with self.subTest(booth=booth.__name__, algorithm=name, bits=bits, signed=signed):
+                            dut = TestMultiplier(adder=TestAlgorithmAdder, bits=bits, signed=signed)
+                            a = np.array([random.getrandbits(bits) for i in range(500)] + [2**bits - 1],
+                                         dtype=object)
+                            b = np.array([random.getrandbits(bits) for i in range(500)] + [2**bits - 1],
+                                         dtype=object)
+                            f = to_signed if signed else (lambda value, bits: value)
+                            expected = [(f(x, bits) * f(y, bits)) % 2**(2 * bits) for (x, y) in zip(a, b)]
+                            o, = NetlistSimulator(dut).evaluate([(dut.a, a), (dut.b, b)], [dut.o])
+                            self.assertEqual([int(x) for x in o], expected)
+
+    def test_rows(self):
+        # Higher radices need fewer partial product rows
+        def rows(booth):
+            class TestMultiplier(Multiplier, booth, Dadda, RecordingProcess):
+                pass
+
+            dut = TestMultiplier(adder=TestAdder, bits=64)
+            dut.elaborate(None)
+            return max(len(column) for column in dut._partial_products)
+
+        self.assertLess(rows(BoothRadix8), rows(BoothRadix4))
+        self.assertLess(rows(BoothRadix16), rows(BoothRadix8))
+
+    def test_get_booth(self):
+        self.assertIs(get_booth(), BoothRadix4)
+        self.assertIs(get_booth(8), BoothRadix8)
+        self.assertIs(get_booth(16), BoothRadix16)
+        with self.assertRaises(ValueError):
+            get_booth(32)
+
+
+if __name__ == '__main__':
+    unittest.main()
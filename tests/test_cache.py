@@ -0,0 +1,53 @@
+import os
+import time
+import unittest
+import tempfile
+
+from cache import VerilogCache
+
+
+class TestCaseCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = VerilogCache(self.tmp.name)
+        self.calls = 0
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def generate(self):
+        self.calls += 1
+        return "module adder(); // %d\nendmodule\n" % self.calls
+
+    def test_hit(self):
+        config = {'generator': 'adder', 'bits': 64, 'algorithm': 'koggestone'}
+        first = self.cache.get_or_generate(config, self.generate)
+        second = self.cache.get_or_generate(dict(reversed(config.items())), self.generate)
+        self.assertEqual(first, second)
+        self.assertEqual(self.calls, 1)
+
+    def test_miss(self):
+        self.cache.get_or_generate({'generator': 'adder', 'bits': 64}, self.generate)
+        self.cache.get_or_generate({'generator': 'adder', 'bits': 32}, self.generate)
+        self.assertEqual(self.calls, 2)
+
+    def test_evict(self):
+        entry_size = len(self.generate())
+        self.cache.max_size = 2 * entry_size
+
+        keys = []
+        for bits in (8, 16, 32):
+            config = {'generator': 'adder', 'bits': bits}
+            keys.append(self.cache.key(config))
+            self.cache.get_or_generate(config, self.generate)
+            # Make sure each entry gets a distinct modification time
+            t = time.time() - 10 + bits
+            os.utime(os.path.join(self.tmp.name, keys[-1] + '.v'), (t, t))
+
+        self.cache.evict()
+        self.assertIsNone(self.cache.get(keys[0]))
+        self.assertIsNotNone(self.cache.get(keys[2]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+import random
+import numpy as np
+
+from adder import BrentKung
+from multiplier import Multiplier, BoothRadix4, LongMultiplication, Dadda
+from none.process import RecordingProcess
+from simulator import NetlistSimulator
+from compressor import Columns
+
+
+class TestAdder(BrentKung, RecordingProcess):
+    pass
+
+
+class TestMultiplier(Multiplier, BoothRadix4, Dadda, RecordingProcess):
+    pass
+
+
+class TestLongMultiplier(Multiplier, LongMultiplication, Dadda, RecordingProcess):
+    pass
+
+
+class TestCaseColumns(unittest.TestCase):
+    def test_heights(self):
+        columns = Columns([[1, 2, 3], [4], [], [5, 6]])
+        self.assertEqual(columns.max_height(), 3)
+
+        self.assertEqual(columns.pop(0, 2), [1, 2])
+        self.assertEqual(columns.max_height(), 2)
+
+        columns.push(2, 7)
+        columns.push(2, 8)
+        columns.push(2, 9)
+        self.assertEqual(columns.max_height(), 3)
+        self.assertEqual(list(columns[2]), [7, 8, 9])
+
+        # Pushing past the last column is ignored
+        columns.push(4, 10)
+        self.assertEqual(len(columns), 4)
+
+        columns.pad(3, 0)
+        self.assertEqual([columns.height(i) for i in range(4)], [3, 3, 3, 3])
+        self.assertEqual(list(columns[0]), [3, 0, 0])
+
+    def test_key(self):
+        columns = Columns([[5, 1, 4, 1, 3]], key=lambda bit: bit)
+        self.assertEqual(columns.pop(0, 3), [1, 1, 3])
+        self.assertEqual(list(columns[0]), [5, 4])
+        self.assertEqual(columns.max_height(), 2)
+
+
+class TestCaseTimingDriven(unittest.TestCase):
+    def arrival(self, cls, bits, timing_driven):
+        dut = cls(adder=TestAdder, bits=bits, timing_driven=timing_driven)
+        dut.elaborate(None)
+        return max(dut._arrival.values())
+
+    def test_random(self):
+        bits = 32
+        for cls in (TestMultiplier, TestLongMultiplier):
+            dut = cls(adder=TestAdder, bits=bits, multiply_add=True, timing_driven=True)
+            sim = NetlistSimulator(dut)
+            a = np.array([random.getrandbits(bits) for i in range(1000)], dtype=object)
+            b = np.array([random.getrandbits(bits) for i in range(1000)], dtype=object)
+            c = np.array([random.getrandbits(bits * 2) for i in range(1000)], dtype=object)
+            o, = sim.evaluate([(dut.a, a), (dut.b, b), (dut.c, c)], [dut.o])
+            self.assertTrue(all(o == (a * b + c) % 2**(bits * 2)))
+
+    def test_arrival(self):
+        # Never slower than taking the oldest bits, and faster on wide trees
+        for cls in (TestMultiplier, TestLongMultiplier):
+            for bits in (8, 16, 32):
+                self.assertLessEqual(self.arrival(cls, bits, True), self.arrival(cls, bits, False))
+        self.assertLess(self.arrival(TestMultiplier, 64, True), self.arrival(TestMultiplier, 64, False))
+
+
+class TestCaseWide(unittest.TestCase):
+    def test_random(self):
+        bits = 128
+        dut = TestMultiplier(adder=TestAdder, bits=bits)
+        sim = NetlistSimulator(dut)
+        a = np.array([random.getrandbits(bits) for i in range(1000)], dtype=object)
+        b = np.array([random.getrandbits(bits) for i in range(1000)], dtype=object)
+        o, = sim.evaluate([(dut.a, a), (dut.b, b)], [dut.o])
+        self.assertTrue(all(o == a * b))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+import random
+import numpy as np
+
+from amaranth import Module, Signal, Const
+
+from adder import BrentKung
+from multiplier import (Multiplier, DotProduct, BoothRadix4, BoothRadix8, LongMultiplication, Dadda, Wallace,
+                        Compressor42, generate_report)
+from none.process import RecordingProcess
+from simulator import NetlistSimulator
+from qor import design_report
+
+
+class TestAdder(BrentKung, RecordingProcess):
+    pass
+
+
+def to_signed(value, bits):
+    return value - (1 << bits) if (value >> (bits - 1)) & 1 else value
+
+
+def random_vectors(bits, n):
+    return np.array([random.getrandbits(bits) for i in range(n)], dtype=object)
+
+
+class TestCaseConstantFolding(unittest.TestCase):
+    def multiplier(self, partial_products, reduction, bits, base=Multiplier, **kwargs):
+        class TestMultiplier(base, partial_products, reduction, RecordingProcess):
+            pass
+
+        return TestMultiplier(adder=TestAdder, bits=bits, **kwargs)
+
+    def test_random(self):
+        for partial_products in (BoothRadix4, BoothRadix8, LongMultiplication):
+            for reduction in (Dadda, Wallace, Compressor42):
+                for (bits, signed, multiply_add) in ((4, False, False), (16, True, False), (33, False, True)):
+                    with self.subTest(partial_products=partial_products.__name__, reduction=reduction.__name__,
+                                      bits=bits, signed=signed, multiply_add=multiply_add):
+                        dut = self.multiplier(partial_products, reduction, bits, signed=signed,
+                                              multiply_add=multiply_add)
+                        a = random_vectors(bits, 500)
+                        b = random_vectors(bits, 500)
+                        a[0], b[0] = 2**bits - 1, 2**bits - 1
+                        inputs = [(dut.a, a), (dut.b, b)]
+                        f = to_signed if signed else (lambda value, bits: value)
+                        expected = [f(x, bits) * f(y, bits) for (x, y) in zip(a, b)]
+                        if multiply_add:
+                            c = random_vectors(2 * bits, 500)
+                            inputs.append((dut.c, c))
+                            expected = [e + z for (e, z) in zip(expected, c)]
+                        o, = NetlistSimulator(dut).evaluate(inputs, [dut.o])
+                        self.assertTrue(all(int(x) == y % 2**(2 * bits) for (x, y) in zip(o, expected)))
+
+    def test_same_result(self):
+        # Truncated multipliers and dot products give exactly what they
+        # would without folding
+        for (base, kwargs) in ((Multiplier, dict(truncate=20)), (Multiplier, dict(truncate=20, signed=True)),
+                               (DotProduct, dict(terms=3))):
+            with self.subTest(base=base.__name__, **kwargs):
+                duts = [self.multiplier(BoothRadix4, Dadda, 32, base=base, fold_constants=fold, **kwargs)
+                        for fold in (True, False)]
+                a = random_vectors(len(duts[0].a), 500)
+                b = random_vectors(len(duts[0].b), 500)
+                folded, unfolded = [NetlistSimulator(dut).evaluate([(dut.a, a), (dut.b, b)], [dut.o])[0]
+                                    for dut in duts]
+                self.assertTrue(all(folded == unfolded))
+
+    def test_size(self):
+        # Folding never costs cells, and saves them where constants from
+        # different rows meet. Booth radix 8, signed radix 4 and signed long
+        # multiplication already generate a single constant, so they are
+        # the same size.
+        for (partial_products, reduction, bits, kwargs, smaller) in (
+                (BoothRadix4, Dadda, 32, {}, True), (BoothRadix4, Wallace, 32, {}, True),
+                (BoothRadix4, Dadda, 8, dict(terms=4), True), (LongMultiplication, Dadda, 32, dict(signed=True), False),
+                (BoothRadix4, Dadda, 32, dict(signed=True), False), (BoothRadix8, Dadda, 32, {}, False)):
+            with self.subTest(partial_products=partial_products.__name__, reduction=reduction.__name__, bits=bits,
+                              **kwargs):
+                base = DotProduct if kwargs.get('terms') else Multiplier
+
+                def cells(fold):
+                    dut = self.multiplier(partial_products, reduction, bits, base=base, fold_constants=fold,
+                                          **kwargs)
+                    return design_report(dut, [dut.o])["cells"]
+
+                if smaller:
+                    self.assertLess(cells(True), cells(False))
+                else:
+                    self.assertLessEqual(cells(True), cells(False))
+
+    def test_adders(self):
+        # A constant one in a half adder becomes an inverter, with the other
+        # bit itself as the carry
+        dut = self.multiplier(BoothRadix4, Dadda, 8)
+        dut.m = Module()
+        a = Signal()
+        s, c = dut._reduce_adder("half_adder", [Const(1), a], "ha")
+        self.assertIs(c, a)
+        self.assertEqual([gate[0] for gate in dut._recorded_gates], ["inv"])
+
+        # ...so no half adder in a folded reduction has a constant input
+        for reduction in (Dadda, Wallace, Compressor42):
+            with self.subTest(reduction=reduction.__name__):
+                dut = self.multiplier(BoothRadix4, reduction, 32)
+                dut.elaborate(None)
+                self.assertFalse(any(isinstance(bit, Const) for gate in dut._recorded_gates
+                                     if gate[0] == "half_adder" for bit in gate[1].values()))
+
+    def test_report(self):
+        report = generate_report({'bits': 16, 'process': 'none'})
+        self.assertGreater(report['constant_folding']['cells_removed'], 0)
+        report = generate_report({'bits': 16, 'process': 'none', 'fold_constants': False})
+        self.assertNotIn('constant_folding', report)
+
+
+if __name__ == '__main__':
+    unittest.main()
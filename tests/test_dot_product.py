@@ -0,0 +1,88 @@
+import unittest
+import random
+import numpy as np
+
+from adder import BrentKung
+from multiplier import DotProduct, Multiplier, BoothRadix4, BoothRadix8, LongMultiplication, Dadda, Wallace
+from none.process import RecordingProcess
+from simulator import NetlistSimulator
+from qor import design_report
+
+
+class TestAdder(BrentKung, RecordingProcess):
+    pass
+
+
+def signed(value, bits):
+    return value - 2**bits if value >> (bits - 1) else value
+
+
+def pack(values, bits):
+    return sum(value << (bits * i) for (i, value) in enumerate(values))
+
+
+class TestCaseDotProduct(unittest.TestCase):
+    def dot_product(self, partial_products, reduction, terms, bits, **kwargs):
+        class TestDotProduct(DotProduct, partial_products, reduction, RecordingProcess):
+            pass
+
+        return TestDotProduct(adder=TestAdder, terms=terms, bits=bits, **kwargs)
+
+    def check(self, partial_products, reduction, terms, bits, b_bits=None, signed_=False, multiply_add=False,
+              n=300):
+        b_bits = b_bits or bits
+        dut = self.dot_product(partial_products, reduction, terms, bits, b_bits=b_bits, signed=signed_,
+                               multiply_add=multiply_add)
+        width = len(dut.o)
+        self.assertEqual(width, bits + b_bits + (terms - 1).bit_length())
+
+        a = [[random.getrandbits(bits) for t in range(terms)] for i in range(n)]
+        b = [[random.getrandbits(b_bits) for t in range(terms)] for i in range(n)]
+        c = [random.getrandbits(width) if multiply_add else 0 for i in range(n)]
+        inputs = [(dut.a, np.array([pack(x, bits) for x in a], dtype=object)),
+                  (dut.b, np.array([pack(y, b_bits) for y in b], dtype=object))]
+        if multiply_add:
+            inputs.append((dut.c, np.array(c, dtype=object)))
+        o, = NetlistSimulator(dut).evaluate(inputs, [dut.o])
+
+        f = signed if signed_ else (lambda value, bits: value)
+        for i in range(n):
+            expected = sum(f(x, bits) * f(y, b_bits) for (x, y) in zip(a[i], b[i])) + c[i]
+            self.assertEqual(int(o[i]), expected % 2**width)
+
+    def test_random(self):
+        for partial_products in (BoothRadix4, BoothRadix8, LongMultiplication):
+            for reduction in (Dadda, Wallace):
+                for (terms, bits, b_bits, signed_, multiply_add) in ((1, 8, 8, False, False),
+                                                                     (2, 8, 8, False, False),
+                                                                     (3, 7, 5, False, True),
+                                                                     (4, 16, 16, True, True),
+                                                                     (5, 9, 12, True, False)):
+                    with self.subTest(partial_products=partial_products.__name__, reduction=reduction.__name__,
+                                      terms=terms, bits=bits, b_bits=b_bits, signed=signed_,
+                                      multiply_add=multiply_add):
+                        self.check(partial_products, reduction, terms, bits, b_bits, signed_, multiply_add)
+
+    def test_size(self):
+        # One reduction and final adder is smaller than a multiplier per
+        # term and an adder tree to sum them
+        class TestMultiplier(Multiplier, BoothRadix4, Dadda, RecordingProcess):
+            pass
+
+        terms, bits = 4, 16
+        width = 2 * bits + 2
+        multiplier = TestMultiplier(adder=TestAdder, bits=bits)
+        adder = TestAdder(bits=width)
+        separate = terms * design_report(multiplier, [multiplier.o])["cells"] + \
+            (terms - 1) * design_report(adder, [adder.o])["cells"]
+
+        dut = self.dot_product(BoothRadix4, Dadda, terms, bits)
+        self.assertLess(design_report(dut, [dut.o])["cells"], separate)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            self.dot_product(BoothRadix4, Dadda, 0, 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
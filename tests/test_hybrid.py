@@ -0,0 +1,88 @@
+import unittest
+import random
+import numpy as np
+
+from adder import HybridAdder, BrentKung, KoggeStone
+from multiplier import Multiplier, BoothRadix4, LongMultiplication, Dadda, Wallace
+from none.process import RecordingProcess
+from simulator import NetlistSimulator
+from qor import design_report
+
+
+class TestHybridAdder(HybridAdder, RecordingProcess):
+    pass
+
+
+def random_vectors(bits, n):
+    return np.array([random.getrandbits(bits) for i in range(n)], dtype=object)
+
+
+class TestCaseHybrid(unittest.TestCase):
+    def test_adder(self):
+        for bits in (1, 2, 7, 16, 64, 128):
+            a = random_vectors(bits, 1000)
+            b = random_vectors(bits, 1000)
+            a[0], b[0] = 2**bits - 1, 1
+            profiles = [None, [random.randrange(12) for i in range(bits)], [min(i, bits - i) for i in range(bits)]]
+            for arrival in profiles:
+                with self.subTest(bits=bits, arrival=arrival):
+                    dut = TestHybridAdder(bits=bits, arrival=arrival)
+                    o, = NetlistSimulator(dut).evaluate([(dut.a, a), (dut.b, b)], [dut.o])
+                    self.assertTrue(all(o == (a + b) % 2**bits))
+
+    def test_ripple(self):
+        # Bits that arrive one gate after each other ripple
+        dut = TestHybridAdder(bits=32, arrival=list(range(32)))
+        self.assertEqual(len(dut._combines), 31)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            TestHybridAdder(bits=16, arrival=[0] * 15)
+
+    def multiplier(self, partial_products, reduction, bits, adder=BrentKung, **kwargs):
+        class TestMultiplier(Multiplier, partial_products, reduction, RecordingProcess):
+            pass
+
+        class TestAdder(adder, RecordingProcess):
+            pass
+
+        return TestMultiplier(adder=TestAdder, bits=bits, **kwargs)
+
+    def test_multiplier(self):
+        for partial_products in (BoothRadix4, LongMultiplication):
+            for reduction in (Dadda, Wallace):
+                for (bits, kwargs) in ((8, {}), (32, {}), (53, dict(multiply_add=True)), (32, dict(truncate=20))):
+                    with self.subTest(partial_products=partial_products.__name__, reduction=reduction.__name__,
+                                      bits=bits, **kwargs):
+                        dut = self.multiplier(partial_products, reduction, bits, final_adder=TestHybridAdder,
+                                              **kwargs)
+                        a = random_vectors(bits, 500)
+                        b = random_vectors(bits, 500)
+                        inputs = [(dut.a, a), (dut.b, b)]
+                        expected = a * b
+                        if kwargs.get('multiply_add'):
+                            c = random_vectors(2 * bits, 500)
+                            inputs.append((dut.c, c))
+                            expected = expected + c
+                        o, = NetlistSimulator(dut).evaluate(inputs, [dut.o])
+                        if kwargs.get('truncate'):
+                            # The same as with any other final adder
+                            reference = self.multiplier(partial_products, reduction, bits, **kwargs)
+                            reference_o, = NetlistSimulator(reference).evaluate(
+                                [(reference.a, a), (reference.b, b)], [reference.o])
+                            expected = np.array(reference_o, dtype=object)
+                        self.assertTrue(all(o == expected % 2**(2 * bits)))
+
+    def test_size(self):
+        # Faster than a Brent-Kung final adder, smaller than a Kogge-Stone
+        def report(**kwargs):
+            dut = self.multiplier(BoothRadix4, Dadda, 64, **kwargs)
+            return design_report(dut, [dut.o])
+
+        hybrid = report(final_adder=TestHybridAdder)
+        self.assertLess(hybrid["depth"], report(adder=BrentKung)["depth"])
+        self.assertLess(hybrid["cells"], report(adder=KoggeStone)["cells"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+import random
+import numpy as np
+
+from adder import Inverting, SparseTree, get_algorithm
+from none.process import RecordingProcess
+from simulator import NetlistSimulator
+from netlist import Netlist
+
+
+def build(algorithm, bits):
+    class TestAdder(algorithm, RecordingProcess):
+        pass
+    return TestAdder(bits)
+
+
+def random_vectors(bits, n):
+    return np.array([random.getrandbits(bits) for i in range(n)], dtype=object)
+
+
+class TestCaseInverting(unittest.TestCase):
+    def test_random(self):
+        for bits in (4, 16, 64):
+            a = random_vectors(bits, 2000)
+            b = random_vectors(bits, 2000)
+            a[0], b[0] = 2**bits - 1, 1
+            for name in ('brentkung', 'koggestone', 'hancarlson', 'sklansky', 'knowles'):
+                with self.subTest(bits=bits, algorithm=name):
+                    dut = build(get_algorithm('inverting_' + name), bits)
+                    o, = NetlistSimulator(dut).evaluate([(dut.a, a), (dut.b, b)], [dut.o])
+                    self.assertTrue(all(o == (a + b) % pow(2, bits)))
+
+    def test_cells(self):
+        # Only inverting cells in the tree, and no deeper than the tree of
+        # ao21s it replaces
+        for name in ('brentkung', 'koggestone', 'hancarlson', 'sklansky'):
+            with self.subTest(algorithm=name):
+                netlist = Netlist.from_elaboratable(build(get_algorithm('inverting_' + name), 64))
+                kinds = set(cell.kind for cell in netlist.cells)
+                self.assertEqual(kinds, {'half_adder', 'aoi21', 'oai21', 'nand', 'nor', 'inv', 'xor'})
+
+                def depth(netlist):
+                    root = [netlist.resolve(net) for net in range(len(netlist.net_names))]
+                    d = {}
+                    for cell in netlist.topological_order(netlist.cells):
+                        t = max((d.get(root[net], 0) for net in cell.inputs.values()), default=0) + 1
+                        for net in cell.outputs.values():
+                            d[root[net]] = t
+                    return max(d.values())
+
+                plain = Netlist.from_elaboratable(build(get_algorithm(name), 64))
+                self.assertEqual(depth(netlist), depth(plain))
+
+    def test_polarity(self):
+        # The polarity recorded for each signal matches its simulated value:
+        # each carry out of the tree and each inverter added to flip one
+        bits = 16
+        a = random_vectors(bits, 2000)
+        b = random_vectors(bits, 2000)
+        for name in ('brentkung', 'koggestone', 'hancarlson', 'sklansky'):
+            class TestAdder(get_algorithm('inverting_' + name), RecordingProcess):
+                def _polarity(self, s, inverted):
+                    o = super()._polarity(s, inverted)
+                    self.flipped.append((s, o))
+                    return o
+
+            with self.subTest(algorithm=name):
+                dut = TestAdder(bits)
+                dut.flipped = []
+                sim = NetlistSimulator(dut)
+                sim.evaluate([(dut.a, a), (dut.b, b)], [dut.o])
+
+                def value(s):
+                    v = sim.get(s).astype(object)
+                    return v ^ 1 if id(s) in dut._inverted else v
+
+                for i in range(bits):
+                    mask = 2**(i + 1) - 1
+                    self.assertTrue(all(value(dut._g[i + 1]) == ((a & mask) + (b & mask)) >> (i + 1)))
+                for (s, o) in dut.flipped:
+                    if o is not s:
+                        self.assertTrue(all(value(o) == value(s)))
+
+    def test_topology(self):
+        with self.assertRaises(ValueError):
+            Inverting.with_topology(SparseTree)
+        with self.assertRaises(ValueError):
+            get_algorithm('inverting_ling_koggestone')
+        with self.assertRaises(ValueError):
+            get_algorithm('ling_inverting_koggestone')
+
+
+if __name__ == '__main__':
+    unittest.main()
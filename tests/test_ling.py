@@ -0,0 +1,65 @@
+import unittest
+import random
+import numpy as np
+
+from adder import Ling, SparseTree, get_algorithm
+from none.process import RecordingProcess
+from simulator import NetlistSimulator
+from netlist import Netlist
+
+
+def build(algorithm, bits):
+    class TestAdder(algorithm, RecordingProcess):
+        pass
+    return TestAdder(bits)
+
+
+def random_vectors(bits, n):
+    return np.array([random.getrandbits(bits) for i in range(n)], dtype=object)
+
+
+class TestCaseLing(unittest.TestCase):
+    def test_random(self):
+        for bits in (4, 16, 64):
+            a = random_vectors(bits, 2000)
+            b = random_vectors(bits, 2000)
+            a[0], b[0] = 2**bits - 1, 1
+            for name in ('brentkung', 'koggestone', 'hancarlson', 'sklansky', 'knowles'):
+                with self.subTest(bits=bits, algorithm=name):
+                    dut = build(get_algorithm('ling_' + name), bits)
+                    o, = NetlistSimulator(dut).evaluate([(dut.a, a), (dut.b, b)], [dut.o])
+                    self.assertTrue(all(o == (a + b) % pow(2, bits)))
+
+    def test_first_level(self):
+        # The first level of pseudo carries comes straight from the inputs,
+        # and there are no ands after the tree
+        for name in ('brentkung', 'koggestone', 'hancarlson'):
+            with self.subTest(algorithm=name):
+                netlist = Netlist.from_elaboratable(build(get_algorithm('ling_' + name), 64))
+                plain = Netlist.from_elaboratable(build(get_algorithm(name), 64))
+                count = lambda n, kind: sum(cell.kind == kind for cell in n.cells)  # noqa: E731
+                self.assertGreaterEqual(count(netlist, 'ao22'), 32)
+                self.assertEqual(count(netlist, 'and'), count(plain, 'and'))
+
+    def test_broken_process(self):
+        # An error inside a process's ao32 isn't mistaken for a process
+        # without one
+        class BrokenProcess(RecordingProcess):
+            def _generate_ao32(self, a1, a2, a3, b1, b2, o):
+                raise AttributeError("broken")
+
+        class TestAdder(get_algorithm('ling_brentkung'), BrokenProcess):
+            pass
+
+        with self.assertRaises(AttributeError):
+            Netlist.from_elaboratable(TestAdder(16))
+
+    def test_topology(self):
+        with self.assertRaises(ValueError):
+            Ling.with_topology(SparseTree)
+        with self.assertRaises(ValueError):
+            get_algorithm('ling_inferred')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+import random
+import numpy as np
+
+from adder import BrentKung
+from multiplier import MultiplyAccumulator, BoothRadix4, BoothRadix8, LongMultiplication, Dadda, Wallace
+from none.process import RecordingProcess
+from simulator import NetlistSimulator
+
+
+class TestAdder(BrentKung, RecordingProcess):
+    pass
+
+
+def to_signed(value, bits):
+    return value - (1 << bits) if (value >> (bits - 1)) & 1 else value
+
+
+class TestCaseMultiplyAccumulator(unittest.TestCase):
+    def check(self, partial_products, reduction, bits, signed=False, multiply_add=False, register_input=False,
+              cycles=8, n=100):
+        class TestMultiplyAccumulator(MultiplyAccumulator, partial_products, reduction, RecordingProcess):
+            pass
+
+        dut = TestMultiplyAccumulator(adder=TestAdder, bits=bits, signed=signed, multiply_add=multiply_add,
+                                      register_input=register_input)
+        sim = NetlistSimulator(dut)
+        product_bits = 2 * bits
+        f = to_signed if signed else (lambda value, bits: value)
+
+        # The sums after each cycle. Registered inputs take a cycle longer
+        # to reach the accumulator.
+        sums = []
+        expected = [0] * n
+        for cycle in range(cycles):
+            # Start a new sum every few cycles, and on the first one
+            a = [random.getrandbits(bits) for i in range(n)]
+            b = [random.getrandbits(bits) for i in range(n)]
+            c = [random.getrandbits(product_bits) if multiply_add else 0 for i in range(n)]
+            clear = [int(cycle == 0 or random.random() < 0.2) for i in range(n)]
+
+            inputs = [(dut.a, a), (dut.b, b), (dut.clear, clear)]
+            if multiply_add:
+                inputs.append((dut.c, c))
+            for (signal, values) in inputs:
+                sim.set(signal, np.array(values, dtype=object))
+            sim.tick()
+
+            expected = [(0 if clear[i] else expected[i]) + f(a[i], bits) * f(b[i], bits) + c[i]
+                        for i in range(n)]
+            sums.append(expected)
+
+            if cycle >= register_input:
+                o = sim.get(dut.o)
+                with self.subTest(cycle=cycle):
+                    self.assertTrue(all(int(x) == y % 2**product_bits
+                                        for (x, y) in zip(o, sums[cycle - register_input])))
+
+    def test_random(self):
+        for partial_products in (BoothRadix4, BoothRadix8, LongMultiplication):
+            for reduction in (Dadda, Wallace):
+                for (bits, signed) in ((8, False), (16, True), (33, False)):
+                    with self.subTest(partial_products=partial_products.__name__, reduction=reduction.__name__,
+                                      bits=bits, signed=signed):
+                        self.check(partial_products, reduction, bits, signed)
+
+    def test_multiply_add(self):
+        self.check(BoothRadix4, Dadda, 16, multiply_add=True)
+
+    def test_register_input(self):
+        self.check(BoothRadix4, Dadda, 16, register_input=True)
+
+    def test_invalid(self):
+        class TestMultiplyAccumulator(MultiplyAccumulator, BoothRadix4, Dadda, RecordingProcess):
+            pass
+
+        for kwargs in (dict(truncate=8), dict(lanes=2)):
+            with self.subTest(**kwargs):
+                with self.assertRaises(ValueError):
+                    TestMultiplyAccumulator(adder=TestAdder, bits=16, **kwargs)
+
+
+if __name__ == '__main__':
+    unittest.main()
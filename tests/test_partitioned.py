@@ -0,0 +1,90 @@
+import unittest
+import random
+import numpy as np
+
+from adder import BrentKung
+from multiplier import Multiplier, BoothRadix4, BoothRadix8, LongMultiplication, Dadda, Wallace
+from none.process import RecordingProcess
+from simulator import NetlistSimulator
+from qor import design_report
+
+
+class TestAdder(BrentKung, RecordingProcess):
+    pass
+
+
+def lane_products(a, b, bits, lanes):
+    width = bits // lanes
+    mask = 2**width - 1
+    return sum(((a >> (width * i)) & mask) * ((b >> (width * i)) & mask) << (2 * width * i)
+               for i in range(lanes))
+
+
+class TestCasePartitioned(unittest.TestCase):
+    def multiplier(self, partial_products, reduction, bits, lanes, **kwargs):
+        class TestMultiplier(Multiplier, partial_products, reduction, RecordingProcess):
+            pass
+
+        return TestMultiplier(adder=TestAdder, bits=bits, lanes=lanes, **kwargs)
+
+    def check(self, partial_products, reduction, bits, lanes, n=200):
+        dut = self.multiplier(partial_products, reduction, bits, lanes)
+        sim = NetlistSimulator(dut)
+        self.assertEqual(len(dut.o), 2 * bits)
+
+        # Modes above the number of lanes select the most lanes
+        levels = lanes.bit_length() - 1
+        for mode in range(2**len(dut.mode)):
+            a = [random.getrandbits(bits) for i in range(n)] + [2**bits - 1, 2**bits - 1, 0]
+            b = [random.getrandbits(bits) for i in range(n)] + [2**bits - 1, 0, 2**bits - 1]
+            inputs = [(dut.a, np.array(a, dtype=object)),
+                      (dut.b, np.array(b, dtype=object)),
+                      (dut.mode, np.array([mode] * len(a), dtype=object))]
+            o, = sim.evaluate(inputs, [dut.o])
+
+            with self.subTest(mode=mode):
+                for (x, y, p) in zip(a, b, o):
+                    self.assertEqual(int(p), lane_products(x, y, bits, 2**min(mode, levels)))
+
+    def test_random(self):
+        for partial_products in (BoothRadix4, LongMultiplication):
+            for reduction in (Dadda, Wallace):
+                for (bits, lanes) in ((4, 2), (12, 2), (16, 4), (32, 8), (64, 4)):
+                    with self.subTest(partial_products=partial_products.__name__, reduction=reduction.__name__,
+                                      bits=bits, lanes=lanes):
+                        self.check(partial_products, reduction, bits, lanes)
+
+    def test_register_input(self):
+        dut = self.multiplier(BoothRadix4, Dadda, 16, 4, register_input=True)
+        a = np.array([random.getrandbits(16) for i in range(50)], dtype=object)
+        b = np.array([random.getrandbits(16) for i in range(50)], dtype=object)
+        mode = np.array([random.randrange(3) for i in range(50)], dtype=object)
+        o, = NetlistSimulator(dut).evaluate([(dut.a, a), (dut.b, b), (dut.mode, mode)], [dut.o], cycles=1)
+        for (x, y, m, p) in zip(a, b, mode, o):
+            self.assertEqual(int(p), lane_products(x, y, 16, 2**m))
+
+    def test_size(self):
+        # One partitioned array is a little bigger than a plain multiplier,
+        # and much smaller than a multiplier for each lane width
+        def cells(bits, lanes=1):
+            dut = self.multiplier(BoothRadix4, Dadda, bits, lanes)
+            return design_report(dut, [dut.o])["cells"]
+
+        separate = cells(64) + 2 * cells(32) + 4 * cells(16)
+        self.assertLess(cells(64, 4), 1.2 * cells(64))
+        self.assertLess(cells(64, 4), 0.75 * separate)
+
+    def test_invalid(self):
+        for kwargs in (dict(lanes=3), dict(lanes=4, bits=12), dict(lanes=2, signed=True),
+                       dict(lanes=2, b_bits=8), dict(lanes=2, multiply_add=True), dict(lanes=2, truncate=4)):
+            with self.subTest(**kwargs):
+                with self.assertRaises(ValueError):
+                    self.multiplier(BoothRadix4, Dadda, **dict(dict(bits=16), **kwargs))
+
+        dut = self.multiplier(BoothRadix8, Dadda, 16, 2)
+        with self.assertRaises(ValueError):
+            NetlistSimulator(dut)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import io
+import math
+import random
+import unittest
+import numpy as np
+
+from multiplier import build_multiplier, transform_netlist, generate
+from adder import build_adder
+from netlist import Netlist
+from pipeline import pipeline_netlist
+from simulator import NetlistSimulator
+from structural import convert
+from qor import design_report
+
+
+class TestCasePipeline(unittest.TestCase):
+    def check(self, bits, stages, **kwargs):
+        m, ports, name = build_multiplier(bits=bits, multiply_add=True, **kwargs)
+        netlist = transform_netlist(m, stages)
+        latency = stages - 1 + kwargs.get('register_input', False) + kwargs.get('register_output', False)
+
+        a = np.array([random.getrandbits(bits) for i in range(300)], dtype=object)
+        b = np.array([random.getrandbits(bits) for i in range(300)], dtype=object)
+        c = np.array([random.getrandbits(2 * bits) for i in range(300)], dtype=object)
+        o, = NetlistSimulator(netlist).evaluate([(m.a, a), (m.b, b), (m.c, c)], [m.o], cycles=latency)
+        self.assertTrue(all(o == (a * b + c) % 2**(2 * bits)))
+        return m, netlist
+
+    def test_multiply_add(self):
+        for stages in (1, 2, 3, 5):
+            for registers in ({}, {'register_input': True, 'register_output': True}):
+                with self.subTest(stages=stages, **registers):
+                    self.check(16, stages, **registers)
+
+    def test_balance(self):
+        # The logic depth of each stage is about the depth of the whole
+        # multiplier divided by the number of stages
+        m, ports, name = build_multiplier(bits=32, multiply_add=True)
+        depth = design_report(m, [m.o])["depth"]
+        for stages in (2, 3, 4, 6):
+            with self.subTest(stages=stages):
+                m, netlist = self.check(32, stages)
+                self.assertLessEqual(design_report(netlist, [m.o])["depth"], math.ceil(depth / stages) + 1)
+
+    def test_process(self):
+        m, ports, name = build_multiplier(bits=8, process='sky130hd', powered=True)
+        netlist = transform_netlist(m, 3)
+        registers = [cell for cell in netlist.cells if cell.kind == "dff"]
+        self.assertGreater(len(registers), 0)
+
+        # Power pins aren't pipelined
+        power = set(netlist.resolve(net) for net in netlist.signal_nets(m.VPWR) + netlist.signal_nets(m.VGND))
+        self.assertFalse(any(netlist.resolve(cell.inputs["d"]) in power for cell in registers))
+
+        verilog = convert(netlist, ports, name, backend='structural')
+        self.assertIn("input clk;", verilog)
+        self.assertIn("always @(posedge clk)", verilog)
+
+    def test_adder(self):
+        adder, ports = build_adder(bits=32)
+        netlist = Netlist.from_elaboratable(adder)
+        pipeline_netlist(netlist, adder, [adder.o], 3)
+        a = np.array([random.getrandbits(32) for i in range(300)], dtype=np.uint64)
+        b = np.array([random.getrandbits(32) for i in range(300)], dtype=np.uint64)
+        o, = NetlistSimulator(netlist).evaluate([(adder.a, a), (adder.b, b)], [adder.o], cycles=2)
+        self.assertTrue(all(o == (a + b) % 2**32))
+
+    def test_invalid(self):
+        m, ports, name = build_multiplier(bits=8)
+        with self.assertRaises(ValueError):
+            pipeline_netlist(Netlist.from_elaboratable(m), m, [m.o], 0)
+
+        # Pipelining through the API checks the configuration like the
+        # command line does
+        for config in (dict(stages=0, backend='structural'), dict(stages=2),
+                       dict(stages=3, backend='structural', register_middle=True),
+                       dict(stages=3, backend='structural', accumulate=True)):
+            with self.subTest(**config):
+                with self.assertRaises(ValueError):
+                    generate(dict(config, bits=8), io.StringIO())
+
+
+if __name__ == '__main__':
+    unittest.main()
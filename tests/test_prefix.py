@@ -0,0 +1,74 @@
+import unittest
+import random
+import numpy as np
+
+from adder import ParallelPrefix, get_algorithm
+from none.process import RecordingProcess
+from simulator import NetlistSimulator
+from netlist import Netlist
+
+
+def build(algorithm, bits):
+    class TestAdder(algorithm, RecordingProcess):
+        pass
+    return TestAdder(bits)
+
+
+def random_vectors(bits, n):
+    return np.array([random.getrandbits(bits) for i in range(n)], dtype=object)
+
+
+class TestCaseParallelPrefix(unittest.TestCase):
+    def test_random(self):
+        # Every point of the taxonomy, including widths that aren't a power of 2
+        for bits in (16, 24, 64):
+            levels = (bits - 1).bit_length()
+            a = random_vectors(bits, 2000)
+            b = random_vectors(bits, 2000)
+            a[0], b[0] = 2**bits - 1, 1
+            for sparsity in range(levels):
+                for fanout in range(levels - sparsity):
+                    tracks = levels - 1 - sparsity - fanout
+                    with self.subTest(bits=bits, lft=(sparsity, fanout, tracks)):
+                        dut = build(ParallelPrefix.with_parameters(sparsity, fanout, tracks), bits)
+                        o, = NetlistSimulator(dut).evaluate([(dut.a, a), (dut.b, b)], [dut.o])
+                        self.assertTrue(all(o == (a + b) % pow(2, bits)))
+
+    def test_widths(self):
+        # The fixed topologies at widths that aren't a power of 2
+        for bits in range(1, 34):
+            a = random_vectors(bits, 500)
+            b = random_vectors(bits, 500)
+            a[0], b[0] = 2**bits - 1, 1
+            for name in ('brentkung', 'koggestone', 'hancarlson', 'ling_koggestone', 'inverting_hancarlson'):
+                with self.subTest(bits=bits, algorithm=name):
+                    dut = build(get_algorithm(name), bits)
+                    o, = NetlistSimulator(dut).evaluate([(dut.a, a), (dut.b, b)], [dut.o])
+                    self.assertTrue(all(o == (a + b) % pow(2, bits)))
+
+    def test_cells(self):
+        # The number of prefix cells (ao21) of the classic networks for 64 bits
+        expected = {
+            'sklansky': 32 * 6,
+            'koggestone': 64 * 6 - 63,
+            'brentkung': 2 * 64 - 6 - 2,
+            'prefix_5_0_0': 2 * 64 - 6 - 2,
+            'prefix_0_0_5': 64 * 6 - 63,
+        }
+        for (name, cells) in expected.items():
+            with self.subTest(algorithm=name):
+                netlist = Netlist.from_elaboratable(build(get_algorithm(name), 64))
+                self.assertEqual(sum(cell.kind == 'ao21' for cell in netlist.cells), cells)
+
+    def test_parameters(self):
+        with self.assertRaises(ValueError):
+            build(get_algorithm('prefix_1_1_1'), 64)
+        with self.assertRaises(ValueError):
+            get_algorithm('prefix_1_x')
+        # Named adders fit any width
+        for bits in (8, 32, 128):
+            build(get_algorithm('knowles'), bits)
+
+
+if __name__ == '__main__':
+    unittest.main()
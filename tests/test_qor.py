@@ -0,0 +1,54 @@
+import os
+import tempfile
+import unittest
+
+from adder import generate_report as adder_report
+from multiplier import generate_report as multiplier_report
+from tests.test_sta import liberty
+
+
+class TestCaseQoR(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.lib = os.path.join(self.tmp.name, 'test.lib')
+        with open(self.lib, 'w') as f:
+            f.write(liberty())
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_adder(self):
+        report = adder_report({'bits': 16, 'process': 'sky130hd', 'algorithm': 'koggestone'},
+                              [self.lib])
+
+        self.assertEqual(list(report['stages']), ['adder'])
+        self.assertEqual(report['cells'], sum(report['cell_counts'].values()))
+        # Every cell in the test library has an area of 5
+        self.assertEqual(report['area'], 5.0 * report['cells'])
+        self.assertEqual(len(report['outputs']['o']), 16)
+        self.assertEqual(report['depth'], max(report['outputs']['o']))
+        # Half adder, 4 levels of Kogge-Stone prefix and the sum xor
+        self.assertEqual(report['depth'], 6)
+
+    def test_multiplier(self):
+        report = multiplier_report({'bits': 8, 'process': 'sky130hd'}, [self.lib])
+
+        stages = report['stages']
+        self.assertEqual(set(stages), {'partial_products', 'dadda', 'final_adder'})
+        self.assertEqual(sum(s['cells'] for s in stages.values()), report['cells'])
+        self.assertLessEqual(max(s['depth'] for s in stages.values()), report['depth'])
+
+        # The test library doesn't have the full adder
+        self.assertIsNone(report['area'])
+        self.assertIn('sky130_fd_sc_hd__fa_1', report['missing_cells'])
+        self.assertEqual(stages['final_adder']['area'], 5.0 * stages['final_adder']['cells'])
+
+    def test_no_library(self):
+        report = multiplier_report({'bits': 4, 'process': 'asap7', 'register_middle': True})
+        self.assertIsNone(report['area'])
+        self.assertIn('dff', report['cell_counts'])
+        self.assertIn('dadda', report['stages'])
+
+
+if __name__ == '__main__':
+    unittest.main()
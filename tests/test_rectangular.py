@@ -0,0 +1,92 @@
+import unittest
+import random
+import itertools
+import numpy as np
+
+from adder import BrentKung, KoggeStone, HanCarlson
+from multiplier import Multiplier, BoothRadix4, BoothRadix8, BoothRadix16, LongMultiplication, Dadda
+from none.process import RecordingProcess
+from simulator import NetlistSimulator
+from qor import design_report
+
+
+class TestAdder(BrentKung, RecordingProcess):
+    pass
+
+
+def to_signed(value, bits):
+    return value - (1 << bits) if (value >> (bits - 1)) & 1 else value
+
+
+class TestCaseRectangular(unittest.TestCase):
+    def check(self, partial_products, a_bits, b_bits, signed=False, multiply_add=False, adder=TestAdder):
+        class TestMultiplier(Multiplier, partial_products, Dadda, RecordingProcess):
+            pass
+
+        dut = TestMultiplier(adder=adder, bits=a_bits, b_bits=b_bits, multiply_add=multiply_add,
+                             signed=signed)
+        sim = NetlistSimulator(dut)
+        product_bits = a_bits + b_bits
+        self.assertEqual(len(dut.o), product_bits)
+
+        if product_bits <= 10:
+            pairs = list(itertools.product(range(2**a_bits), range(2**b_bits)))
+        else:
+            pairs = [(random.getrandbits(a_bits), random.getrandbits(b_bits)) for i in range(200)]
+            pairs += [(2**a_bits - 1, 2**b_bits - 1), (1 << (a_bits - 1), 1 << (b_bits - 1))]
+
+        a = np.array([p[0] for p in pairs], dtype=object)
+        b = np.array([p[1] for p in pairs], dtype=object)
+        inputs = [(dut.a, a), (dut.b, b)]
+        if signed:
+            products = [to_signed(x, a_bits) * to_signed(y, b_bits) for (x, y) in pairs]
+        else:
+            products = [x * y for (x, y) in pairs]
+        expected = np.array([p % 2**product_bits for p in products], dtype=object)
+        if multiply_add:
+            c = np.array([random.getrandbits(product_bits) for p in pairs], dtype=object)
+            inputs.append((dut.c, c))
+            expected = (expected + c) % 2**product_bits
+
+        o, = sim.evaluate(inputs, [dut.o])
+        self.assertTrue(all(o == expected))
+
+    def test_random(self):
+        for partial_products in (BoothRadix4, BoothRadix8, BoothRadix16, LongMultiplication):
+            for (a_bits, b_bits) in ((1, 5), (5, 1), (3, 7), (7, 3), (24, 8), (8, 24), (53, 53), (64, 16)):
+                for signed in (False, True):
+                    with self.subTest(partial_products=partial_products.__name__, a_bits=a_bits, b_bits=b_bits,
+                                      signed=signed):
+                        self.check(partial_products, a_bits, b_bits, signed)
+
+    def test_multiply_add(self):
+        for partial_products in (BoothRadix4, LongMultiplication):
+            with self.subTest(partial_products=partial_products.__name__):
+                self.check(partial_products, 16, 9, multiply_add=True)
+
+    def test_adders(self):
+        # Final adders that aren't a power of 2 wide
+        for adder in (BrentKung, KoggeStone, HanCarlson):
+            class TestFinalAdder(adder, RecordingProcess):
+                pass
+
+            for (a_bits, b_bits) in ((8, 5), (5, 8), (12, 8), (8, 11)):
+                for multiply_add in (False, True):
+                    with self.subTest(adder=adder.__name__, a_bits=a_bits, b_bits=b_bits, multiply_add=multiply_add):
+                        self.check(BoothRadix4, a_bits, b_bits, multiply_add=multiply_add, adder=TestFinalAdder)
+
+    def test_size(self):
+        # A 64x16 multiplier is much smaller than a 64x64 one
+        class TestMultiplier(Multiplier, BoothRadix4, Dadda, RecordingProcess):
+            pass
+
+        def cells(a_bits, b_bits):
+            dut = TestMultiplier(adder=TestAdder, bits=a_bits, b_bits=b_bits)
+            return design_report(dut, [dut.o])["cells"]
+
+        self.assertEqual(cells(64, 16), cells(16, 64))
+        self.assertLess(cells(64, 16) * 3, cells(64, 64))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+import random
+import numpy as np
+
+from amaranth import Signal
+
+from adder import BrentKung
+from multiplier import Multiplier, BoothRadix4, LongMultiplication, Dadda, Wallace, Compressor42, get_reduction
+from none.process import RecordingProcess
+from simulator import NetlistSimulator
+
+
+class TestAdder(BrentKung, RecordingProcess):
+    pass
+
+
+class TestCompressorProcess(RecordingProcess):
+    # A process with a 4:2 compressor cell, built from two full adders
+    def _generate_compressor42(self, a, b, c, d, carry_in, sum_out, carry_out, cout, name=None):
+        self.compressors = getattr(self, "compressors", 0) + 1
+        t = Signal()
+        self._generate_full_adder(a, b, c, t, cout)
+        self._generate_full_adder(t, d, carry_in, sum_out, carry_out)
+
+
+class TestCaseReduction(unittest.TestCase):
+    def check(self, cls, bits, multiply_add=False, timing_driven=False):
+        dut = cls(adder=TestAdder, bits=bits, multiply_add=multiply_add, timing_driven=timing_driven)
+        sim = NetlistSimulator(dut)
+        a = np.array([random.getrandbits(bits) for i in range(200)], dtype=object)
+        b = np.array([random.getrandbits(bits) for i in range(200)], dtype=object)
+        inputs = [(dut.a, a), (dut.b, b)]
+        expected = a * b
+        if multiply_add:
+            c = np.array([random.getrandbits(bits * 2) for i in range(200)], dtype=object)
+            inputs.append((dut.c, c))
+            expected = (expected + c) % 2**(bits * 2)
+        o, = sim.evaluate(inputs, [dut.o])
+        self.assertTrue(all(o == expected))
+        return dut
+
+    def test_random(self):
+        for reduction in (Wallace, Compressor42):
+            for partial_products in (BoothRadix4, LongMultiplication):
+                class TestMultiplier(Multiplier, partial_products, reduction, RecordingProcess):
+                    pass
+
+                for bits in (4, 8, 14, 32, 64):
+                    for multiply_add in (False, True):
+                        for timing_driven in (False, True):
+                            with self.subTest(reduction=reduction.__name__,
+                                              partial_products=partial_products.__name__, bits=bits,
+                                              multiply_add=multiply_add, timing_driven=timing_driven):
+                                self.check(TestMultiplier, bits, multiply_add, timing_driven)
+
+    def test_compressor_cell(self):
+        class TestMultiplier(Multiplier, BoothRadix4, Compressor42, TestCompressorProcess):
+            pass
+
+        dut = self.check(TestMultiplier, 32)
+        self.assertGreater(dut.compressors, 0)
+
+    def test_compressor_hook(self):
+        # Processes without a compressor cell get two full adders from the
+        # reduction, and errors inside the hook aren't mistaken for a
+        # process that doesn't have one
+        class TestMultiplier(Multiplier, BoothRadix4, Compressor42, RecordingProcess):
+            pass
+
+        dut = self.check(TestMultiplier, 16)
+        names = [gate[3] for gate in dut._recorded_gates if gate[0] == "full_adder"]
+        self.assertTrue(any(name.startswith("compressor42_") and name.endswith("_1") for name in names))
+
+        class BrokenProcess(RecordingProcess):
+            def _generate_compressor42(self, a, b, c, d, carry_in, sum_out, carry_out, cout, name=None):
+                raise AttributeError("broken")
+
+        class BrokenMultiplier(Multiplier, BoothRadix4, Compressor42, BrokenProcess):
+            pass
+
+        with self.assertRaises(AttributeError):
+            BrokenMultiplier(adder=TestAdder, bits=16).elaborate(None)
+
+    def test_stages(self):
+        # Wallace has as many stages as Dadda, 4:2 compressors need fewer
+        def stages(reduction, bits):
+            class TestMultiplier(Multiplier, LongMultiplication, reduction, RecordingProcess):
+                pass
+
+            dut = TestMultiplier(adder=TestAdder, bits=bits)
+            dut.elaborate(None)
+            # The first number in the name of each adder is its stage
+            prefix = reduction.__name__.lower() + "_"
+            return len(set(next(t for t in gate[3][len(prefix):].split("_") if t.isdigit())
+                           for gate in dut._recorded_gates if gate[3] and gate[3].startswith(prefix)))
+
+        for bits in (8, 16, 32):
+            self.assertEqual(stages(Wallace, bits), stages(Dadda, bits))
+            self.assertLess(stages(Compressor42, bits), stages(Dadda, bits))
+
+    def test_get_reduction(self):
+        self.assertIs(get_reduction(), Dadda)
+        self.assertIs(get_reduction('wallace'), Wallace)
+        self.assertIs(get_reduction('compressor42'), Compressor42)
+        with self.assertRaises(ValueError):
+            get_reduction('foo')
+
+
+if __name__ == '__main__':
+    unittest.main()
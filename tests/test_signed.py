@@ -0,0 +1,73 @@
+import unittest
+import random
+import itertools
+import numpy as np
+
+from adder import BrentKung
+from multiplier import Multiplier, BoothRadix4, BoothRadix8, BoothRadix16, LongMultiplication, Dadda
+from none.process import RecordingProcess
+from simulator import NetlistSimulator
+
+
+class TestAdder(BrentKung, RecordingProcess):
+    pass
+
+
+def to_signed(value, bits):
+    return value - (1 << bits) if (value >> (bits - 1)) & 1 else value
+
+
+class TestCaseSigned(unittest.TestCase):
+    def check(self, partial_products, bits, multiply_add=False):
+        class TestMultiplier(Multiplier, partial_products, Dadda, RecordingProcess):
+            pass
+
+        dut = TestMultiplier(adder=TestAdder, bits=bits, multiply_add=multiply_add, signed=True)
+        sim = NetlistSimulator(dut)
+
+        if bits <= 5:
+            pairs = list(itertools.product(range(2**bits), repeat=2))
+        else:
+            # Random values plus the most negative ones
+            top = 1 << (bits - 1)
+            pairs = [(random.getrandbits(bits), random.getrandbits(bits)) for i in range(200)]
+            pairs += [(top, top), (top, 2**bits - 1), (2**bits - 1, top)]
+
+        a = np.array([p[0] for p in pairs], dtype=object)
+        b = np.array([p[1] for p in pairs], dtype=object)
+        inputs = [(dut.a, a), (dut.b, b)]
+        expected = np.array([(to_signed(x, bits) * to_signed(y, bits)) % 2**(bits * 2) for (x, y) in pairs],
+                            dtype=object)
+        if multiply_add:
+            c = np.array([random.getrandbits(bits * 2) for p in pairs], dtype=object)
+            inputs.append((dut.c, c))
+            expected = (expected + c) % 2**(bits * 2)
+
+        o, = sim.evaluate(inputs, [dut.o])
+        self.assertTrue(all(o == expected))
+        return dut
+
+    def test_multiplier(self):
+        for partial_products in (BoothRadix4, BoothRadix8, BoothRadix16, LongMultiplication):
+            for bits in (2, 3, 4, 5, 8, 13, 32, 64):
+                for multiply_add in (False, True):
+                    with self.subTest(partial_products=partial_products.__name__, bits=bits,
+                                      multiply_add=multiply_add):
+                        self.check(partial_products, bits, multiply_add)
+
+    def test_rows(self):
+        # Signed booth doesn't need the extra row of unsigned booth
+        for signed in (False, True):
+            class TestMultiplier(Multiplier, BoothRadix4, Dadda, RecordingProcess):
+                pass
+
+            dut = TestMultiplier(adder=TestAdder, bits=32, signed=signed)
+            dut.elaborate(None)
+            # Each row has its bit 0 at booth_b<row>_m0
+            rows = sum(1 for column in dut._partial_products for bit in column
+                       if getattr(bit, "name", "").startswith("booth_b") and bit.name.endswith("_m0"))
+            self.assertEqual(rows, 16 if signed else 17)
+
+
+if __name__ == '__main__':
+    unittest.main()
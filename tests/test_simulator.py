@@ -0,0 +1,97 @@
+import unittest
+import random
+import numpy as np
+
+from adder import BrentKung, KoggeStone, HanCarlson
+from multiplier import Multiplier, BoothRadix4, Dadda
+from none.process import NoneProcess, RecordingProcess
+from simulator import NetlistSimulator
+
+
+class TestBrentKungAdder(BrentKung, RecordingProcess):
+    pass
+
+
+class TestKoggeStoneAdder(KoggeStone, RecordingProcess):
+    pass
+
+
+class TestHanCarlsonAdder(HanCarlson, RecordingProcess):
+    pass
+
+
+class TestMultiplier(Multiplier, BoothRadix4, Dadda, RecordingProcess):
+    pass
+
+
+class TestNoneAdder(BrentKung, NoneProcess):
+    pass
+
+
+class TestNoneMultiplier(Multiplier, BoothRadix4, Dadda, NoneProcess):
+    pass
+
+
+def random_vectors(bits, n):
+    return np.array([random.getrandbits(bits) for i in range(n)], dtype=object)
+
+
+class TestCaseAdders(unittest.TestCase):
+    def test_random(self):
+        bits = 64
+        a = random_vectors(bits, 100000)
+        b = random_vectors(bits, 100000)
+        for adder in (TestBrentKungAdder, TestKoggeStoneAdder, TestHanCarlsonAdder):
+            with self.subTest(adder=adder.__name__):
+                dut = adder(bits)
+                sim = NetlistSimulator(dut)
+                o, = sim.evaluate([(dut.a, a), (dut.b, b)], [dut.o])
+                self.assertTrue(all(o == (a + b) % pow(2, bits)))
+
+
+class TestCaseMultiplier(unittest.TestCase):
+    def test_exhaustive(self):
+        bits = 8
+        a = np.repeat(np.arange(pow(2, bits), dtype=np.uint64), pow(2, bits))
+        b = np.tile(np.arange(pow(2, bits), dtype=np.uint64), pow(2, bits))
+        for (multiplier, adder) in ((TestMultiplier, TestBrentKungAdder),
+                                    (TestNoneMultiplier, TestNoneAdder)):
+            with self.subTest(multiplier=multiplier.__name__):
+                dut = multiplier(adder=adder, bits=bits)
+                sim = NetlistSimulator(dut)
+                o, = sim.evaluate([(dut.a, a), (dut.b, b)], [dut.o])
+                self.assertTrue(np.array_equal(o, a * b))
+
+    def test_random(self):
+        bits = 64
+        dut = TestMultiplier(adder=TestBrentKungAdder, bits=bits)
+        sim = NetlistSimulator(dut)
+        a = random_vectors(bits, 100000)
+        b = random_vectors(bits, 100000)
+        o, = sim.evaluate([(dut.a, a), (dut.b, b)], [dut.o])
+        self.assertTrue(all(o == a * b))
+
+    def test_pipelined(self):
+        bits = 64
+        dut = TestMultiplier(adder=TestBrentKungAdder, bits=bits, multiply_add=True,
+                             register_input=True, register_middle=True,
+                             register_output=True)
+        sim = NetlistSimulator(dut)
+        a = random_vectors(bits, 10000)
+        b = random_vectors(bits, 10000)
+        c = random_vectors(bits * 2, 10000)
+        o, = sim.evaluate([(dut.a, a), (dut.b, b), (dut.c, c)], [dut.o], cycles=3)
+        self.assertTrue(all(o == (a * b + c) % pow(2, bits * 2)))
+
+        # The result isn't there until the pipeline has filled
+        sim.reset(len(a))
+        sim.set(dut.a, a)
+        sim.set(dut.b, b)
+        sim.set(dut.c, c)
+        sim.tick()
+        sim.tick()
+        self.assertFalse(all(sim.get(dut.o) == (a * b + c) % pow(2, bits * 2)))
+
+
+if __name__ == '__main__':
+    unittest.main()
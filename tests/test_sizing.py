@@ -0,0 +1,60 @@
+import re
+import unittest
+from collections import Counter
+
+from adder import build_adder
+from multiplier import build_multiplier
+from netlist import Netlist
+from sizing import size_netlist
+
+
+def max_fanout(netlist, power_pins):
+    root = [netlist.resolve(net) for net in range(len(netlist.net_names))]
+    fanout = Counter()
+    for cell in netlist.cells:
+        for (pin, net) in cell.inputs.items():
+            if root[net] not in (Netlist.CONST0, Netlist.CONST1) and pin not in power_pins:
+                fanout[root[net]] += 1
+    return max(fanout.values())
+
+
+class TestCaseSizing(unittest.TestCase):
+    def test_fanout(self):
+        for process in ('sky130hd', 'asap7', 'gf180mcu'):
+            with self.subTest(process=process):
+                m, ports, name = build_multiplier(bits=16, process=process, powered=True)
+                netlist = Netlist.from_elaboratable(m)
+                self.assertGreater(max_fanout(netlist, m._power_pins), 8)
+
+                size_netlist(netlist, m, [m.o], 8)
+                self.assertLessEqual(max_fanout(netlist, m._power_pins), 8)
+
+                # Every size we pick has a model for the formal checks
+                with open('%s/%s.v' % (process, process)) as f:
+                    models = set(re.findall(r'^module (\w+)', f.read(), re.M))
+                kinds = set(cell.kind for cell in netlist.cells)
+                self.assertLessEqual(kinds, models)
+
+                # Buffers are powered like the other cells
+                buffers = [cell for cell in netlist.cells if cell.kind in dict(m._buffers)]
+                self.assertGreater(len(buffers), 0)
+                for cell in buffers:
+                    self.assertLessEqual(set(m._power_pins), set(cell.inputs))
+
+    def test_upsize(self):
+        # With a high fanout limit, cells are upsized rather than buffered
+        adder, ports = build_adder(bits=64, process='sky130hd', algorithm='brentkung')
+        netlist = Netlist.from_elaboratable(adder)
+        cells = len(netlist.cells)
+        size_netlist(netlist, adder, [adder.o], 64)
+        self.assertEqual(len(netlist.cells), cells)
+        self.assertIn('sky130_fd_sc_hd__a21o_2', set(cell.kind for cell in netlist.cells))
+
+    def test_unsupported(self):
+        adder, ports = build_adder(bits=8)
+        with self.assertRaises(ValueError):
+            size_netlist(Netlist.from_elaboratable(adder), adder, [adder.o], 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+import random
+import numpy as np
+
+from adder import SparseTree, get_algorithm
+from none.process import RecordingProcess
+from simulator import NetlistSimulator
+from netlist import Netlist
+
+
+def build(algorithm, bits):
+    class TestAdder(algorithm, RecordingProcess):
+        pass
+    return TestAdder(bits)
+
+
+def random_vectors(bits, n):
+    return np.array([random.getrandbits(bits) for i in range(n)], dtype=object)
+
+
+class TestCaseSparseTree(unittest.TestCase):
+    def test_random(self):
+        # Including widths that aren't a multiple of the sparsity
+        for bits in (13, 16, 64, 70):
+            a = random_vectors(bits, 2000)
+            b = random_vectors(bits, 2000)
+            a[0], b[0] = 2**bits - 1, 1
+            for sparsity in (2, 4, 8):
+                with self.subTest(bits=bits, sparsity=sparsity):
+                    dut = build(SparseTree.with_sparsity(sparsity), bits)
+                    o, = NetlistSimulator(dut).evaluate([(dut.a, a), (dut.b, b)], [dut.o])
+                    self.assertTrue(all(o == (a + b) % pow(2, bits)))
+
+    def test_cells(self):
+        # Only every 4th carry goes through the Kogge-Stone tree
+        def prefix_cells(name):
+            netlist = Netlist.from_elaboratable(build(get_algorithm(name), 64))
+            return sum(cell.kind == 'ao21' for cell in netlist.cells)
+        self.assertLess(prefix_cells('sparsetree'), prefix_cells('koggestone'))
+
+    def test_parameters(self):
+        with self.assertRaises(ValueError):
+            build(get_algorithm('sparsetree_3'), 64)
+        with self.assertRaises(ValueError):
+            get_algorithm('sparsetree_x')
+
+
+if __name__ == '__main__':
+    unittest.main()
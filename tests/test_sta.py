@@ -0,0 +1,105 @@
+import io
+import unittest
+
+from liberty import Library, parse
+from sta import StaticTiming
+from adder import build_adder
+
+
+# A made up library in ps and fF, where every arc has a delay of 100ps plus
+# 1ps per fF of load
+CELLS = {
+    "sky130_fd_sc_hd__and2_1": (["A", "B"], {"X": "positive_unate"}),
+    "sky130_fd_sc_hd__xor2_1": (["A", "B"], {"X": "non_unate"}),
+    "sky130_fd_sc_hd__a21o_1": (["A1", "A2", "B1"], {"X": "positive_unate"}),
+    "sky130_fd_sc_hd__ha_1": (["A", "B"], {"COUT": "positive_unate", "SUM": "non_unate"}),
+}
+
+
+def liberty():
+    lib = """
+    /* Test library */
+    library (test) {
+      time_unit : "1ps";
+      capacitive_load_unit (1, ff);
+      lu_table_template (delay) {
+        variable_1 : input_net_transition;
+        variable_2 : total_output_net_capacitance;
+        index_1 ("10, 100");
+        index_2 ("1, 11");
+      }
+    """
+    for (name, (inputs, outputs)) in CELLS.items():
+        lib += "cell (%s) {\n area : 5.0;\n" % name
+        for pin in inputs:
+            lib += "pin (%s) { direction : input; capacitance : 2.0; }\n" % pin
+        for (pin, sense) in outputs.items():
+            lib += "pin (%s) {\n direction : output;\n" % pin
+            for related in inputs:
+                lib += """timing () {
+                  related_pin : "%s";
+                  timing_sense : %s;
+                  cell_rise (delay) { values ("101, 111", \\
+                                              "101, 111"); }
+                  cell_fall (delay) { values ("101, 111", "101, 111"); }
+                  rise_transition (delay) { values ("20, 40", "20, 40"); }
+                  fall_transition (delay) { values ("20, 40", "20, 40"); }
+                }
+                """ % (related, sense)
+            lib += "}\n"
+        lib += "}\n"
+    return lib + "}\n"
+
+
+class TestCaseSTA(unittest.TestCase):
+    def setUp(self):
+        self.library = Library()
+        self.library.add(liberty())
+
+    def test_parse(self):
+        groups = parse(liberty(), cells={"sky130_fd_sc_hd__ha_1"})
+        self.assertEqual(groups[0].attributes["time_unit"], "1ps")
+        self.assertEqual([c.args[0] for c in groups[0].find("cell")], ["sky130_fd_sc_hd__ha_1"])
+
+        cell = self.library.cells["sky130_fd_sc_hd__ha_1"]
+        self.assertEqual(cell.area, 5.0)
+        self.assertAlmostEqual(cell.capacitance["A"], 0.002)
+        self.assertEqual(len(cell.arcs["SUM"]), 2)
+
+    def test_table(self):
+        table = self.library.cells["sky130_fd_sc_hd__and2_1"].arcs["X"][0].delay["rise"]
+        self.assertAlmostEqual(table.lookup(0.05, 0.001), 0.101)
+        self.assertAlmostEqual(table.lookup(0.05, 0.006), 0.106)
+        # Extrapolated beyond the table
+        self.assertAlmostEqual(table.lookup(0.2, 0.021), 0.121)
+
+    def test_adder(self):
+        delays = {}
+        for algorithm in ("brentkung", "koggestone"):
+            adder, ports = build_adder(bits=16, process='sky130hd', algorithm=algorithm)
+            sta = StaticTiming(adder, self.library, [adder.o], output_load=0.001)
+            arrival = sta.arrival(adder.o)
+            self.assertEqual(len(arrival), 16)
+
+            path = sta.critical_path()
+            self.assertAlmostEqual(path[-1][5], max(arrival))
+            self.assertIsNone(path[0][1])
+            delays[algorithm] = max(arrival)
+
+            f = io.StringIO()
+            sta.report(f)
+            self.assertIn("Critical path", f.getvalue())
+
+        # Each stage is a little over 100ps, Kogge-Stone has 6 of them
+        self.assertGreater(delays["koggestone"], 0.6)
+        self.assertLess(delays["koggestone"], 0.7)
+        self.assertLess(delays["koggestone"], delays["brentkung"])
+
+    def test_missing_cell(self):
+        adder, ports = build_adder(bits=8, process='asap7')
+        with self.assertRaises(ValueError):
+            StaticTiming(adder, self.library, [adder.o])
+
+
+if __name__ == '__main__':
+    unittest.main()
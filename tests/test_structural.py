@@ -0,0 +1,46 @@
+import re
+import unittest
+
+from adder import build_adder
+from multiplier import build_multiplier
+from structural import convert
+
+
+class TestCaseStructural(unittest.TestCase):
+    def test_flat(self):
+        adder, ports = build_adder(bits=16, process='sky130hd', algorithm='koggestone')
+        v = convert(adder, ports, 'adder', backend='structural')
+
+        self.assertEqual(len(re.findall(r'^module ', v, re.M)), 1)
+        self.assertIn('input [15:0] a;', v)
+        self.assertIn('output [15:0] o;', v)
+        self.assertIn('sky130_fd_sc_hd__', v)
+
+        # Every instance name is unique
+        names = re.findall(r'^  sky130_fd_sc_hd__\w+ (\w+) \(', v, re.M)
+        self.assertEqual(len(names), len(set(names)))
+
+    def test_hierarchical(self):
+        m, ports, name = build_multiplier(bits=4, multiply_add=True, register_input=True,
+                                          register_output=True, process='asap7')
+        v = convert(m, ports, name, backend='hierarchical')
+
+        self.assertGreater(len(re.findall(r'^module ', v, re.M)), 1)
+        self.assertIn('always @(posedge clk)', v)
+        self.assertTrue(v.rstrip().endswith('endmodule'))
+
+    def test_generic(self):
+        m, ports, name = build_multiplier(bits=4, process='none')
+        v = convert(m, ports, name, backend='structural')
+
+        self.assertIn('assign ', v)
+        self.assertNotIn('always', v)
+
+    def test_unknown_backend(self):
+        adder, ports = build_adder(bits=4)
+        with self.assertRaises(ValueError):
+            convert(adder, ports, 'adder', backend='bogus')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+import random
+import numpy as np
+
+from adder import BrentKung
+from multiplier import Multiplier, BoothRadix4, BoothRadix8, LongMultiplication, Dadda, generate_report
+from none.process import RecordingProcess
+from simulator import NetlistSimulator
+from qor import design_report
+
+
+class TestAdder(BrentKung, RecordingProcess):
+    pass
+
+
+class TestCaseTruncated(unittest.TestCase):
+    def multiplier(self, partial_products, bits, **kwargs):
+        class TestMultiplier(Multiplier, partial_products, Dadda, RecordingProcess):
+            pass
+
+        return TestMultiplier(adder=TestAdder, bits=bits, **kwargs)
+
+    def errors(self, partial_products, bits, truncate, compensation, n=2000):
+        # Error of the truncated product against the full one, in units of
+        # the lowest column we keep
+        random.seed(1)
+        dut = self.multiplier(partial_products, bits, truncate=truncate, compensation=compensation)
+        a = np.array([random.getrandbits(bits) for i in range(n)], dtype=object)
+        b = np.array([random.getrandbits(bits) for i in range(n)], dtype=object)
+        o, = NetlistSimulator(dut).evaluate([(dut.a, a), (dut.b, b)], [dut.o])
+
+        product_bits = 2 * bits
+        errors = []
+        for (x, y) in zip(o, a * b):
+            self.assertEqual(x % 2**truncate, 0)
+            # The products wrap, so take the error modulo 2**product_bits
+            error = (int(x) - int(y) + 2**(product_bits - 1)) % 2**product_bits - 2**(product_bits - 1)
+            errors.append(error / 2**truncate)
+        return np.array(errors, dtype=float)
+
+    def test_compensation(self):
+        for partial_products in (BoothRadix4, BoothRadix8, LongMultiplication):
+            for (bits, truncate) in ((8, 8), (16, 14), (16, 16)):
+                with self.subTest(partial_products=partial_products.__name__, bits=bits, truncate=truncate):
+                    none = self.errors(partial_products, bits, truncate, "none")
+                    constant = self.errors(partial_products, bits, truncate, "constant")
+                    variable = self.errors(partial_products, bits, truncate, "variable")
+
+                    # Dropping bits without compensation always errs low
+                    self.assertLess(none.mean(), -1)
+                    self.assertLessEqual(none.max(), 0)
+
+                    # Both compensations are close to unbiased, and the
+                    # variable one has a smaller worst case error
+                    self.assertLess(abs(constant.mean()), 0.5)
+                    self.assertLess(abs(variable.mean()), 0.5)
+                    self.assertLess(abs(constant).max(), bits)
+                    self.assertLessEqual(abs(variable).max(), abs(constant).max())
+
+    def test_size(self):
+        for partial_products in (BoothRadix4, LongMultiplication):
+            with self.subTest(partial_products=partial_products.__name__):
+                full = self.multiplier(partial_products, 16)
+                truncated = self.multiplier(partial_products, 16, truncate=16)
+                self.assertLess(design_report(truncated, [truncated.o])["cells"] * 5,
+                                design_report(full, [full.o])["cells"] * 4)
+
+    def test_report(self):
+        # The report has the max and mean error of the truncated
+        # multiplier, in units of the lowest column it keeps
+        errors = {}
+        for compensation in ("none", "constant", "variable"):
+            report = generate_report({'bits': 16, 'truncate': 16, 'compensation': compensation})
+            errors[compensation] = report['truncation_error']
+        self.assertLess(errors["none"]["mean"], -1)
+        self.assertLess(abs(errors["constant"]["mean"]), 0.5)
+        self.assertLessEqual(errors["variable"]["max"], errors["constant"]["max"])
+        self.assertLess(errors["constant"]["max"], errors["none"]["max"])
+        self.assertNotIn('truncation_error', generate_report({'bits': 16}))
+
+    def test_no_truncation(self):
+        # truncate=0 builds the same multiplier whatever the compensation
+        cells = set()
+        for compensation in ("none", "constant", "variable"):
+            dut = self.multiplier(BoothRadix4, 16, compensation=compensation)
+            cells.add(design_report(dut, [dut.o])["cells"])
+        self.assertEqual(len(cells), 1)
+
+    def test_invalid(self):
+        for kwargs in ({"truncate": -1}, {"truncate": 32}, {"truncate": 8, "compensation": "magic"}):
+            with self.subTest(**kwargs):
+                with self.assertRaises(ValueError):
+                    self.multiplier(BoothRadix4, 16, **kwargs)
+
+
+if __name__ == '__main__':
+    unittest.main()
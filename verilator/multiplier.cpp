@@ -2,6 +2,17 @@
 #include <iostream>
 #include "Vmultiply_adder.h"
 
+// Widths of a and b, build with -DA_BITS=... -DB_BITS=...
+#ifndef A_BITS
+#define A_BITS 8
+#endif
+#ifndef B_BITS
+#define B_BITS A_BITS
+#endif
+
+#define PRODUCT_MASK ((1UL << (A_BITS + B_BITS)) - 1)
+#define C_LIMIT (A_BITS + B_BITS < 8 ? PRODUCT_MASK : 0xFF)
+
 vluint64_t main_time = 0;
 
 double sc_time_stamp()
@@ -24,16 +35,16 @@ void tick(Vmultiply_adder *m)
 
 int main(int argc, char** argv)
 {
-	int32_t pipeline[PIPELINE_DEPTH+1];
+	uint64_t pipeline[PIPELINE_DEPTH+1];
 	Vmultiply_adder *m;
 
 	Verilated::commandArgs(argc, argv);
 
 	m = new Vmultiply_adder;
 
-	for (unsigned long a = 0; a < 0xFF; a++) {
-		for (unsigned long b = 0; b < 0xFF; b++) {
-			for (unsigned long c = 0; c < 0xFF; c++) {
+	for (unsigned long a = 0; a < (1UL << A_BITS) - 1; a++) {
+		for (unsigned long b = 0; b < (1UL << B_BITS) - 1; b++) {
+			for (unsigned long c = 0; c < C_LIMIT; c++) {
 				m->a = a;
 				m->b = b;
 				m->c = c;
@@ -43,7 +54,7 @@ int main(int argc, char** argv)
 				for (unsigned long i = PIPELINE_DEPTH; i > 0; i--)
 					pipeline[i] = pipeline[i-1];
 
-				pipeline[0] = a * b + c;
+				pipeline[0] = (a * b + c) & PRODUCT_MASK;
 
 				if ((!PIPELINE_DEPTH || (main_time > 6)) && (pipeline[PIPELINE_DEPTH] != m->o))
 					std::cout << "ERROR: " << a << " * " << b << " + " << c <<